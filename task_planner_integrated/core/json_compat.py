@@ -0,0 +1,62 @@
+"""JSON compatibility layer for task and NFC persistence.
+
+Uses orjson (a compiled encoder/decoder) when it is installed, falling back
+to the stdlib json module otherwise. Both paths work on bytes so callers can
+read and write files in binary mode regardless of which backend is active.
+``dumps`` produces indented output for the main data files; ``dumps_compact``
+produces a single line, suitable for JSON-Lines logs. ``dump_atomic`` writes
+a whole data file via a temporary file and ``os.replace`` so readers never
+see a partially written file.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+try:  # pragma: no cover - simple import guard
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except Exception:  # ModuleNotFoundError or other import failure
+    orjson = None
+    HAS_ORJSON = False
+
+
+if HAS_ORJSON:
+    _DUMPS_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+    def dumps_compact(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+else:
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def dumps_compact(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dump_atomic(path: Path, obj: Any) -> bytes:
+    """Write ``obj`` as indented JSON to ``path``, replacing it atomically.
+
+    Returns the bytes written. No fsync is done: a crash may lose the
+    latest write but never leaves a truncated file behind.
+    """
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    data = dumps(obj)
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return data
+
+__all__ = ["loads", "dumps", "dumps_compact", "dump_atomic", "HAS_ORJSON"]
@@ -1,52 +1,128 @@
 """NFC integration system for task management with enhanced logging and mapping."""
 
-import json
+import atexit
+import collections
+import contextlib
+import itertools
 import logging
-from datetime import datetime
+import queue
+import sys
+import threading
+import types
 from pathlib import Path
-from typing import Dict, Optional, List, Any
+from typing import Deque, Dict, Optional, List, Any, Iterator, Mapping, Tuple
+
+from .json_compat import loads, dumps_compact, dump_atomic
+from .task_manager import TASK_TEMPLATE
+from .timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Number of pings kept after the log is rotated
+MAX_PINGS = 1000
+# Rotate the append-only ping log once it holds this many records
+PINGS_ROTATE_THRESHOLD = 5000
+# Rough upper bound on the size of one ping record, used to size tail reads
+PING_LINE_ESTIMATE = 256
+# Ping logs up to this size are read whole instead of tail-seeking
+PINGS_SMALL_FILE_BYTES = 64 * 1024
+# Most pings the writer thread joins into a single write
+PING_FLUSH_BATCH = 64
+# Seconds flush_pings() waits between checks that the writer thread is alive
+PING_FLUSH_TIMEOUT = 0.5
+# Pings allowed to wait for the writer thread; beyond this, new pings are
+# left out of the log (they are telemetry) rather than growing memory
+MAX_QUEUED_PINGS = 10_000
+# Recent pings kept in memory with sequence ids for get_pings_since
+RECENT_PINGS_BUFFER = 200
+
 class NFCManager:
     """Enhanced NFC manager with better mapping and event logging."""
     
+    # Normalized mappings per file as JSON bytes, keyed by (st_mtime_ns, st_size); a hit
+    # re-parses them, skipping the file read and normalization
+    _cache: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
+    
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.mappings_file = self.data_dir / "nfc_mappings.json"
-        self.pings_file = self.data_dir / "nfc_pings.json"
+        self.pings_file = self.data_dir / "nfc_pings.jsonl"
+        self._legacy_pings_file = self.data_dir / "nfc_pings.json"
+        self._pings_fh = None
         
         # mappings: nfc_tag_id -> task_dict (same shape as tasks.json entries)
         self.mappings: Dict[str, Dict] = {}
+        # reverse index: lowercased task title -> tag ids mapped to it
+        self._title_index: Dict[str, List[str]] = collections.defaultdict(list)
+        # cached get_mapping_stats() result, invalidated by mutations and pings
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_dirty = True
+        self._pings_dirty = True
+        # inside batched(): mapping saves are deferred until the block exits
+        self._defer_saves = False
+        self._save_pending = False
+        # Bumped on every mapping change / logged ping, for cheap change detection
+        self.mappings_version = 0
+        self.pings_version = 0
         self.load_mappings()
         
+        # pings: append-only JSON-Lines log, one record per line
+        self._migrate_legacy_pings()
+        self._ping_lines = self._count_ping_lines()
+        
+        # Reader threads only enqueue pings; a writer thread drains the queue
+        # and appends them to the log in batches. None stops the writer and a
+        # threading.Event is a flush marker it sets once earlier pings are written.
+        self._ping_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._ping_lock = threading.Lock()
+        self._closed = False
+        self.dropped_pings = 0
+        self._flush_thread = threading.Thread(target=self._ping_consumer, name='NFCPingWriter', daemon=True)
+        self._flush_thread.start()
+        atexit.register(self.close)
+        
+        # In-memory ring of (id, ping) for incremental polling. Ids count up
+        # from 1 per process, starting with the tail of the existing log.
+        self._recent_lock = threading.Lock()
+        self._recent_pings: Deque[Tuple[int, Dict[str, Any]]] = collections.deque(maxlen=RECENT_PINGS_BUFFER)
+        for ping in self.get_recent_pings(RECENT_PINGS_BUFFER):
+            self._recent_pings.append((len(self._recent_pings) + 1, ping))
+        self._ping_seq = len(self._recent_pings)
+        
     def load_mappings(self) -> None:
         """Load NFC mappings from JSON file."""
+        self._stats_dirty = True
+        self.mappings_version += 1
         try:
             if self.mappings_file.exists():
-                with open(self.mappings_file, 'r', encoding='utf-8') as f:
-                    raw = json.load(f)
+                st = self.mappings_file.stat()
+                key = (st.st_mtime_ns, st.st_size)
+                cached = NFCManager._cache.get(self.mappings_file)
+                if cached is not None and cached[0] == key:
+                    self.mappings = loads(cached[1])
+                    self._rebuild_title_index()
+                    logger.info(f"Loaded {len(self.mappings)} NFC mappings (cached)")
+                    return
+                with open(self.mappings_file, 'rb') as f:
+                    raw = loads(f.read())
                 # Normalize mappings: allow older string-based mappings and convert
                 norm = {}
+                timestamp = now_iso()
                 for tag_id, val in (raw or {}).items():
                     if isinstance(val, str):
                         # older format: task title only -> create minimal task dict
                         norm[tag_id] = {
-                            "id": None,
+                            **TASK_TEMPLATE,
                             "title": val,
-                            "status": 0,
-                            "priority": 0,
-                            "effort": 0,
-                            "due_date": None,
-                            "created_at": datetime.now().isoformat(),
-                            "updated_at": datetime.now().isoformat(),
-                            "has_subtasks": False,
+                            "created_at": timestamp,
+                            "updated_at": timestamp,
                             "subtasks": []
                         }
                     elif isinstance(val, dict):
-                        # accept as-is but ensure title exists
-                        task = val.copy()
+                        # accept as-is but ensure title exists; intern keys so every
+                        # mapping shares the same key objects
+                        task = {sys.intern(k): v for k, v in val.items()}
                         if 'title' not in task:
                             task['title'] = task.get('task', 'Untitled')
                         norm[tag_id] = task
@@ -54,23 +130,194 @@ class NFCManager:
                         # unknown format - skip
                         continue
                 self.mappings = norm
+                NFCManager._cache[self.mappings_file] = (key, dumps_compact(norm))
+                self._rebuild_title_index()
                 logger.info(f"Loaded {len(self.mappings)} NFC mappings (as task objects)")
             else:
                 self.mappings = {}
+                self._title_index.clear()
                 logger.info("No NFC mappings file found, starting empty")
         except Exception as e:
             logger.error(f"Failed to load NFC mappings: {e}")
             self.mappings = {}
+            self._title_index.clear()
             
+    def _rebuild_title_index(self) -> None:
+        """Rebuild the title -> tag ids index from the current mappings."""
+        self._title_index.clear()
+        for tag_id, task in self.mappings.items():
+            self._index_tag(tag_id, task)
+
+    def _index_tag(self, tag_id: str, task: Any) -> None:
+        """Add a tag to the title index."""
+        if isinstance(task, dict):
+            self._title_index[(task.get('title') or '').lower()].append(tag_id)
+
+    def _unindex_tag(self, tag_id: str, task: Any) -> None:
+        """Remove a tag from the title index."""
+        if not isinstance(task, dict):
+            return
+        key = (task.get('title') or '').lower()
+        tags = self._title_index.get(key)
+        if tags and tag_id in tags:
+            tags.remove(tag_id)
+            if not tags:
+                del self._title_index[key]
+
     def save_mappings(self) -> None:
         """Save NFC mappings to JSON file."""
         try:
-            with open(self.mappings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.mappings, f, indent=2, ensure_ascii=False)
+            data = dump_atomic(self.mappings_file, self.mappings)
+            st = self.mappings_file.stat()
+            NFCManager._cache[self.mappings_file] = ((st.st_mtime_ns, st.st_size), data)
             logger.info(f"Saved {len(self.mappings)} NFC mappings (task objects)")
         except Exception as e:
             logger.error(f"Failed to save NFC mappings: {e}")
             
+    def _persist_mappings(self, save: bool = True) -> None:
+        """Save mappings now, or record that a save is due when inside batched()."""
+        self.mappings_version += 1
+        if not save:
+            return
+        if self._defer_saves:
+            self._save_pending = True
+        else:
+            self.save_mappings()
+            
+    @contextlib.contextmanager
+    def batched(self) -> Iterator["NFCManager"]:
+        """Defer mapping saves inside the block and save once on exit."""
+        if self._defer_saves:
+            # nested batch: the outermost block does the save
+            yield self
+            return
+        self._defer_saves = True
+        try:
+            yield self
+        finally:
+            self._defer_saves = False
+            if self._save_pending:
+                self._save_pending = False
+                self.save_mappings()
+                
+    def _migrate_legacy_pings(self) -> None:
+        """Convert the old JSON-array ping log into the JSON-Lines format."""
+        if self.pings_file.exists() or not self._legacy_pings_file.exists():
+            return
+        try:
+            with open(self._legacy_pings_file, 'rb') as f:
+                pings = loads(f.read()) or []
+            with open(self.pings_file, 'wb') as f:
+                f.write(b''.join(dumps_compact(p) + b'\n' for p in pings[-MAX_PINGS:]))
+            logger.info(f"Migrated {len(pings[-MAX_PINGS:])} NFC pings to {self.pings_file}")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy NFC pings: {e}")
+
+    def _count_ping_lines(self) -> int:
+        """Count the records currently stored in the ping log."""
+        try:
+            with open(self.pings_file, 'rb') as f:
+                return f.read().count(b'\n')
+        except FileNotFoundError:
+            return 0
+
+    def _rotate_pings(self) -> None:
+        """Trim the ping log down to the most recent MAX_PINGS records."""
+        if self._pings_fh is not None:
+            self._pings_fh.close()
+            self._pings_fh = None
+        with open(self.pings_file, 'rb') as f:
+            lines = f.read().splitlines(keepends=True)
+        with open(self.pings_file, 'wb') as f:
+            f.write(b''.join(lines[-MAX_PINGS:]))
+        self._ping_lines = min(len(lines), MAX_PINGS)
+        logger.info(f"Rotated NFC ping log to {self._ping_lines} entries")
+
+    def _ping_consumer(self) -> None:
+        """Writer thread: block on the queue and write whatever has piled up."""
+        while True:
+            item = self._ping_queue.get()
+            batch = []
+            markers = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                    if len(batch) >= PING_FLUSH_BATCH:
+                        break
+                try:
+                    item = self._ping_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_pings(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _write_pings(self, batch: List[Dict[str, Any]]) -> None:
+        """Append a batch of pings to the log in one write."""
+        with self._ping_lock:
+            try:
+                if self._pings_fh is None:
+                    self._pings_fh = open(self.pings_file, 'ab', buffering=0)
+                self._pings_fh.write(b''.join(dumps_compact(p) + b'\n' for p in batch))
+                self._ping_lines += len(batch)
+                
+                # Rotate occasionally to prevent the file from growing too large
+                if self._ping_lines > PINGS_ROTATE_THRESHOLD:
+                    self._rotate_pings()
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} NFC pings: {e}")
+
+    def _drain_pings(self) -> None:
+        """Write queued pings from the calling thread (writer thread stopped)."""
+        batch = []
+        while True:
+            try:
+                item = self._ping_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not None:
+                batch.append(item)
+        if batch:
+            self._write_pings(batch)
+
+    def flush_pings(self) -> None:
+        """Block until every ping logged so far has been written to the log."""
+        if self._closed or not self._flush_thread.is_alive():
+            self._drain_pings()
+            return
+        marker = threading.Event()
+        self._ping_queue.put(marker)
+        while not marker.wait(PING_FLUSH_TIMEOUT):
+            if not self._flush_thread.is_alive():
+                self._drain_pings()
+                return
+
+    def close(self) -> None:
+        """Flush queued pings, stop the writer thread and close the log."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._ping_queue.put(None)
+        if self._flush_thread.is_alive() and self._flush_thread is not threading.current_thread():
+            self._flush_thread.join()
+        self._drain_pings()
+        with self._ping_lock:
+            if self._pings_fh is not None:
+                self._pings_fh.close()
+                self._pings_fh = None
+
     def log_ping(self, tag_id: str, action: str, task_title: str = None,
                  task_index: int = None, new_status: int = None,
                  reader: str = "unknown", additional_data: Dict[str, Any] = None) -> None:
@@ -83,32 +330,30 @@ class NFCManager:
                 "task_index": task_index,
                 "new_status": new_status,
                 "reader": reader,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
             
             # Add any additional data
             if additional_data:
                 ping_data.update(additional_data)
             
-            # Load existing pings
-            pings = []
-            if self.pings_file.exists():
-                try:
-                    with open(self.pings_file, 'r', encoding='utf-8') as f:
-                        pings = json.load(f)
-                except Exception:
-                    pings = []
-                    
-            # Add new ping
-            pings.append(ping_data)
+            # Checked first so a dropped ping is neither in the ring nor counted
+            if self._ping_queue.qsize() >= MAX_QUEUED_PINGS:
+                self.dropped_pings += 1
+                if self.dropped_pings == 1 or self.dropped_pings % 1000 == 0:
+                    logger.warning(f"Ping writer backlogged; {self.dropped_pings} NFC pings not logged")
+                return
             
-            # Keep only last 1000 pings to prevent file from growing too large
-            if len(pings) > 1000:
-                pings = pings[-1000:]
-                
-            # Save pings
-            with open(self.pings_file, 'w', encoding='utf-8') as f:
-                json.dump(pings, f, indent=2, ensure_ascii=False)
+            with self._recent_lock:
+                self._ping_seq += 1
+                self._recent_pings.append((self._ping_seq, ping_data))
+            
+            # Hand off to the writer thread; the caller never waits on disk I/O
+            self._ping_queue.put(ping_data)
+            self._pings_dirty = True
+            self.pings_version += 1
+            if self._closed:
+                self._drain_pings()
                 
             logger.info(f"Logged NFC ping: {tag_id} -> {action}")
             
@@ -117,30 +362,100 @@ class NFCManager:
             
     def get_recent_pings(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent NFC ping events."""
+        self.flush_pings()
+        if limit <= 0:
+            return []
         try:
-            if self.pings_file.exists():
-                with open(self.pings_file, 'r', encoding='utf-8') as f:
-                    pings = json.load(f)
-                return pings[-limit:] if pings else []
+            size = self.pings_file.stat().st_size
+        except FileNotFoundError:
+            return []
+        try:
+            if size <= PINGS_SMALL_FILE_BYTES:
+                # Small log: one read of the whole file is cheaper than seeking
+                with open(self.pings_file, 'rb') as f:
+                    lines = [line for line in f.read().split(b'\n') if line.strip()]
+            else:
+                lines = self._read_ping_tail(size, limit)
+            pings = self._parse_ping_lines(lines[-limit:])
+            if pings is None:
+                # Corrupt line in the tail: fall back to scanning the whole log
+                with open(self.pings_file, 'rb') as f:
+                    lines = [line for line in f.read().split(b'\n') if line.strip()]
+                pings = [p for p in (self._parse_ping_line(line) for line in lines) if p is not None][-limit:]
+            return pings
         except Exception as e:
             logger.error(f"Failed to load ping history: {e}")
         return []
+        
+    @property
+    def last_ping_id(self) -> int:
+        """Sequence id of the newest ping; pass it to get_pings_since later."""
+        return self._ping_seq
+        
+    def get_pings_since(self, since_id: int, limit: int = 50) -> Tuple[List[Dict[str, Any]], int]:
+        """Return pings logged after ``since_id`` (at most the newest ``limit``) and the newest id.
+
+        Served from the in-memory ring without touching the log. An id the
+        ring cannot continue from (too old, or from before a restart) gets
+        the newest ``limit`` pings, like get_recent_pings.
+        """
+        with self._recent_lock:
+            last_id = self._ping_seq
+            recent = self._recent_pings
+            first_id = recent[0][0] if recent else last_id + 1
+            if since_id > last_id or since_id < first_id - 1:
+                count = len(recent)
+            else:
+                count = last_id - since_id
+            count = min(count, max(limit, 0))
+            pings = [ping for _, ping in itertools.islice(reversed(recent), count)]
+        pings.reverse()
+        return pings, last_id
+        
+    def _read_ping_tail(self, size: int, limit: int) -> List[bytes]:
+        """Read at least ``limit`` complete lines from the end of the ping log."""
+        # Widen the window until it contains enough complete lines
+        window = PING_LINE_ESTIMATE * limit
+        with open(self.pings_file, 'rb') as f:
+            while True:
+                start = max(size - window, 0)
+                f.seek(start)
+                lines = f.read().split(b'\n')
+                if start > 0:
+                    lines = lines[1:]  # first line may be partial
+                lines = [line for line in lines if line.strip()]
+                if len(lines) >= limit or start == 0:
+                    return lines
+                window *= 2
+                
+    @staticmethod
+    def _parse_ping_line(line: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            return loads(line)
+        except Exception:
+            return None
             
-    def map_tag_to_task(self, tag_id: str, task_title: str) -> None:
-        """Map an NFC tag to a task title."""
+    def _parse_ping_lines(self, lines: List[bytes]) -> Optional[List[Dict[str, Any]]]:
+        """Parse ping lines, returning None if any of them fails to decode."""
+        pings = []
+        for line in lines:
+            ping = self._parse_ping_line(line)
+            if ping is None:
+                return None
+            pings.append(ping)
+        return pings
+            
+    def map_tag_to_task(self, tag_id: str, task_title: str, save: bool = True) -> None:
+        """Map an NFC tag to a task title. Pass save=False to skip writing the file."""
         old_mapping = self.mappings.get(tag_id)
         # Accept either a task title (str) or a full task dict
         if isinstance(task_title, str):
+            timestamp = now_iso()
             task_obj = {
-                "id": None,
+                **TASK_TEMPLATE,
                 "title": task_title,
-                "status": 0,
-                "priority": 0,
-                "effort": 0,
-                "due_date": None,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "has_subtasks": False,
+                "created_at": timestamp,
+                "updated_at": timestamp,
                 "subtasks": []
             }
         elif isinstance(task_title, dict):
@@ -149,8 +464,11 @@ class NFCManager:
             logger.error(f"Unsupported task mapping type for tag {tag_id}: {type(task_title)}")
             return
 
+        self._unindex_tag(tag_id, old_mapping)
         self.mappings[tag_id] = task_obj
-        self.save_mappings()
+        self._index_tag(tag_id, task_obj)
+        self._stats_dirty = True
+        self._persist_mappings(save)
         if old_mapping:
             logger.info(f"Remapped NFC tag {tag_id} from '{old_mapping.get('title') if isinstance(old_mapping, dict) else old_mapping}' to '{task_obj.get('title')}'")
         else:
@@ -160,53 +478,64 @@ class NFCManager:
         """Get the task object mapped to an NFC tag."""
         return self.mappings.get(tag_id)
         
-    def remove_mapping(self, tag_id: str) -> bool:
-        """Remove an NFC tag mapping."""
+    def remove_mapping(self, tag_id: str, save: bool = True) -> bool:
+        """Remove an NFC tag mapping. Pass save=False to skip writing the file."""
         if tag_id in self.mappings:
             task_obj = self.mappings.pop(tag_id)
-            self.save_mappings()
+            self._unindex_tag(tag_id, task_obj)
+            self._stats_dirty = True
+            self._persist_mappings(save)
             logger.info(f"Removed mapping for NFC tag {tag_id} (was: '{task_obj.get('title') if isinstance(task_obj, dict) else task_obj}')")
             return True
         return False
         
     def get_all_mappings(self) -> Dict[str, str]:
-        """Get all NFC tag mappings."""
+        """Get all NFC tag mappings as copies safe to modify.
+        
+        Read-only callers should prefer get_all_mappings_readonly(), which avoids the copies.
+        """
         # Return a shallow copy; values are task objects
         return {k: v.copy() if isinstance(v, dict) else v for k, v in self.mappings.items()}
         
+    def get_all_mappings_readonly(self) -> Mapping[str, Dict]:
+        """Get a live read-only view of all NFC tag mappings; do not mutate the task dicts."""
+        return types.MappingProxyType(self.mappings)
+        
+    def iter_mappings(self) -> Iterator[Tuple[str, Dict]]:
+        """Iterate over (tag_id, task) pairs without building a container; do not mutate the task dicts."""
+        yield from self.mappings.items()
+        
     def get_tags_for_task(self, task_title: str) -> List[str]:
         """Get all NFC tags mapped to a specific task."""
-        return [tag_id for tag_id, task in self.mappings.items()
-                if isinstance(task, dict) and task.get('title', '').lower() == task_title.lower()]
+        return list(self._title_index.get(task_title.lower(), ()))
                 
     def bulk_import_mappings(self, mappings: Dict[str, str]) -> int:
         """Import multiple mappings at once. Returns count of imported mappings."""
         count = 0
+        timestamp = now_iso()
         for tag_id, task_title in mappings.items():
             if tag_id and task_title:
                 # accept either title string or full dict
                 if isinstance(task_title, str):
                     task_obj = {
-                        "id": None,
+                        **TASK_TEMPLATE,
                         "title": task_title,
-                        "status": 0,
-                        "priority": 0,
-                        "effort": 0,
-                        "due_date": None,
-                        "created_at": datetime.now().isoformat(),
-                        "updated_at": datetime.now().isoformat(),
-                        "has_subtasks": False,
+                        "created_at": timestamp,
+                        "updated_at": timestamp,
                         "subtasks": []
                     }
                 elif isinstance(task_title, dict):
                     task_obj = task_title.copy()
                 else:
                     continue
+                self._unindex_tag(tag_id, self.mappings.get(tag_id))
                 self.mappings[tag_id] = task_obj
+                self._index_tag(tag_id, task_obj)
                 count += 1
                 
         if count > 0:
-            self.save_mappings()
+            self._stats_dirty = True
+            self._persist_mappings()
             logger.info(f"Bulk imported {count} NFC mappings")
             
         return count
@@ -219,20 +548,26 @@ class NFCManager:
         """Clear all NFC mappings. Returns count of cleared mappings."""
         count = len(self.mappings)
         self.mappings.clear()
-        self.save_mappings()
+        self._title_index.clear()
+        self._stats_dirty = True
+        self._persist_mappings()
         logger.info(f"Cleared {count} NFC mappings")
         return count
         
     def get_mapping_stats(self) -> Dict[str, Any]:
         """Get statistics about NFC mappings and usage."""
+        # Reuse the last result until mappings or pings change
+        if self._stats_cache is not None and not self._stats_dirty and not self._pings_dirty:
+            return dict(self._stats_cache)
+            
+        recent_pings = self.get_recent_pings(100)
         stats = {
             "total_mappings": len(self.mappings),
-            "unique_tasks": len(set([v.get('title') if isinstance(v, dict) else v for v in self.mappings.values()])),
-            "recent_pings": len(self.get_recent_pings(100))
+            "unique_tasks": len({v.get('title') if isinstance(v, dict) else v for v in self.mappings.values()}),
+            "recent_pings": len(recent_pings)
         }
         
         # Analyze recent pings for popular tags
-        recent_pings = self.get_recent_pings(100)
         tag_usage = {}
         for ping in recent_pings:
             tag_id = ping.get("tag_id")
@@ -247,4 +582,7 @@ class NFCManager:
                 "mapped_task": (self.mappings.get(most_used_tag, {}).get('title') if isinstance(self.mappings.get(most_used_tag), dict) else self.mappings.get(most_used_tag, 'Unmapped'))
             }
         
-        return stats
\ No newline at end of file
+        self._stats_cache = stats
+        self._stats_dirty = False
+        self._pings_dirty = False
+        return dict(stats)
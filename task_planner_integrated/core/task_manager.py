@@ -1,31 +1,160 @@
 """Core task management system with JSON persistence and enhanced features."""
 
-import json
+import collections
+import functools
+import io
 import logging
+import operator
+import os
+import sys
+import threading
 from datetime import datetime, date
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Mapping, Optional, TextIO, Tuple, Union
+
+from .json_compat import loads, dumps_compact, dump_atomic
+from .timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only template for new task dicts; callers fill in the timestamps and
+# a fresh subtasks list ({**TASK_TEMPLATE, "title": ..., "subtasks": []})
+TASK_TEMPLATE: Mapping[str, Any] = MappingProxyType({
+    "id": None,
+    "title": "",
+    "status": 0,  # 0=not started, 1=in progress, 2=completed
+    "priority": 0,  # 0=low, higher numbers = higher priority
+    "effort": 0,    # effort level estimate
+    "due_date": None,
+    "created_at": None,
+    "updated_at": None,
+    "has_subtasks": False,
+    "subtasks": (),
+})
+_INT_FIELDS = ("status", "priority", "effort")
+# Status names indexed by status code, for API responses and console output
+STATUS_NAMES = ("Not Started", "In Progress", "Completed")
+_STATUS_LABELS = ("not started", "in progress", "completed")
+# Task field names, interned so dicts built from parsed JSON share the key objects
+_REQUIRED_KEYS = tuple(sys.intern(k) for k in TASK_TEMPLATE)
+# Past this size the change journal is folded into a full tasks.json rewrite
+JOURNAL_COMPACT_BYTES = 64 * 1024
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_due_date(value: Optional[str]) -> date:
+    """Parse a due date string, returning date.max for missing or invalid values."""
+    if not value:
+        return date.max
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # Also accept full timestamps such as '2024-05-01T09:00'
+        return datetime.fromisoformat(value).date()
+    except (TypeError, ValueError):
+        return date.max
+
+
+def _due_sort_key(task: Dict[str, Any]) -> str:
+    """Sort key for due dates: ISO strings collate chronologically, so compare them as-is.
+    
+    Tasks without a due date, or with one not in YYYY-MM-DD form, sort last.
+    """
+    due = task.get('due_date')
+    if isinstance(due, str) and due[:4].isdigit() and due[4:5] == '-' and due[7:8] == '-':
+        return due
+    return '\uffff'
+
+
+def _title_sort_key(task: Dict[str, Any]) -> str:
+    return task["title"].lower()
+
+
+# sort_by -> (key function, reverse). Every loaded or added task carries the
+# template fields, so the numeric ones can use C-level itemgetters.
+_SORT_KEYS = {
+    "priority": (operator.itemgetter("priority"), True),
+    "due_date": (_due_sort_key, False),
+    "effort": (operator.itemgetter("effort"), False),
+    "status": (operator.itemgetter("status"), False),
+    "title": (_title_sort_key, False),
+}
+
+
+def _normalize_fields(task: Any, timestamp: str) -> Dict[str, Any]:
+    """Normalize a single task's own fields; its subtasks are left raw."""
+    if isinstance(task, dict):
+        # Merging into the template keeps its interned key objects for every known
+        # field; only keys the template lacks need interning here
+        normalized = {**TASK_TEMPLATE, "created_at": timestamp, "updated_at": timestamp, **task}
+        if len(normalized) > len(TASK_TEMPLATE):
+            normalized = {sys.intern(k) if isinstance(k, str) else k: v for k, v in normalized.items()}
+        # Handle legacy formats: 'task' for title, 'want' for priority
+        legacy_title = normalized.pop("task", "")
+        legacy_priority = normalized.pop("want", 0)
+        if "title" not in task:
+            normalized["title"] = legacy_title
+        if "priority" not in task:
+            normalized["priority"] = legacy_priority
+        for field in _INT_FIELDS:
+            if type(normalized[field]) is not int:
+                normalized[field] = int(normalized[field])
+        if type(normalized["has_subtasks"]) is not bool:
+            normalized["has_subtasks"] = bool(normalized["has_subtasks"])
+        return normalized
+    if not isinstance(task, str):
+        task = str(task)
+    return {**TASK_TEMPLATE, "title": task, "created_at": timestamp, "updated_at": timestamp, "subtasks": []}
+
 class TaskManager:
     """Enhanced task manager with subtasks, priority, effort tracking and hardware integration."""
     
+    # Normalized tasks per file as JSON bytes, keyed by (st_mtime_ns, st_size); a hit
+    # re-parses them, skipping the file read and normalization (a deepcopy was slower)
+    _cache: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
+    
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.tasks_file = self.data_dir / "tasks.json"
+        # Single-field changes appended since tasks.json was last written; see journal_update
+        self.journal_file = self.data_dir / "tasks.journal.jsonl"
+        self._journal_lock = threading.Lock()
         self.tasks: List[Dict[str, Any]] = []
+        # lower/stripped title -> 0-based index of the first task with that title; None = rebuild
+        self._title_to_idx: Optional[Dict[str, int]] = None
+        # version the title index was last known to match; a miss rebuilds it when stale
+        self._title_index_version = -1
+        # Bumped on every load and persisted change; lets callers cheaply tell whether tasks changed
+        self.version = 0
+        # status -> tasks with that status, valid while _by_status_version == version
+        self._by_status: Dict[Any, List[Dict[str, Any]]] = {}
+        self._by_status_version = -1
         self.load_tasks()
         
     def load_tasks(self) -> None:
         """Load tasks from JSON file."""
+        self._title_to_idx = None
+        self.version += 1
         try:
             if self.tasks_file.exists():
-                with open(self.tasks_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tasks = [self._normalize_task(task) for task in data]
-                logger.info(f"Loaded {len(self.tasks)} tasks from {self.tasks_file}")
+                st = self.tasks_file.stat()
+                key = (st.st_mtime_ns, st.st_size)
+                cached = TaskManager._cache.get(self.tasks_file)
+                if cached is not None and cached[0] == key:
+                    self.tasks = loads(cached[1])
+                    logger.info(f"Loaded {len(self.tasks)} tasks from {self.tasks_file} (cached)")
+                else:
+                    with open(self.tasks_file, 'rb') as f:
+                        data = loads(f.read())
+                    timestamp = now_iso()
+                    self.tasks = [self._normalize_task(task, timestamp) for task in data]
+                    TaskManager._cache[self.tasks_file] = (key, dumps_compact(self.tasks))
+                    logger.info(f"Loaded {len(self.tasks)} tasks from {self.tasks_file}")
+                self._replay_journal(key)
             else:
                 self.tasks = []
                 logger.info("No tasks file found, starting with empty list")
@@ -36,47 +165,117 @@ class TaskManager:
     def save_tasks(self) -> None:
         """Save tasks to JSON file."""
         try:
-            with open(self.tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(self.tasks, f, indent=2, ensure_ascii=False)
+            with self._journal_lock:
+                self.version += 1
+                self._write_snapshot()
             logger.info(f"Saved {len(self.tasks)} tasks to {self.tasks_file}")
         except Exception as e:
             logger.error(f"Failed to save tasks: {e}")
+
+    def _write_snapshot(self) -> Tuple[int, int]:
+        """Rewrite tasks.json and drop the journal it supersedes; caller holds _journal_lock."""
+        data = dump_atomic(self.tasks_file, self.tasks)
+        st = self.tasks_file.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        TaskManager._cache[self.tasks_file] = (key, data)
+        try:
+            os.unlink(self.journal_file)
+        except FileNotFoundError:
+            pass
+        return key
+
+    def journal_update(self, path: Tuple[Any, ...], value: Any) -> bool:
+        """Set one field and record the change without rewriting tasks.json.
+
+        ``path`` starts with the 1-based task id followed by the keys/indexes
+        leading to the field, e.g. ``(3, 'subtasks', 0, 'status')``. The
+        change is applied to ``self.tasks`` and appended as one line to the
+        journal, which load_tasks replays over the snapshot. Returns True once
+        the journal has grown past JOURNAL_COMPACT_BYTES; the caller should
+        then schedule a save_tasks(), which folds it back into tasks.json.
+        """
+        with self._journal_lock:
+            self.version += 1
+            self._apply_path(path, value)
+            try:
+                size = self.journal_file.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size == 0:
+                # The first line ties the journal to the snapshot it applies to
+                st = self.tasks_file.stat() if self.tasks_file.exists() else None
+                base = [st.st_mtime_ns, st.st_size] if st else self._write_snapshot()
+                header = dumps_compact({"base": list(base)}) + b"\n"
+            else:
+                header = b""
+            line = dumps_compact({"path": list(path), "value": value}) + b"\n"
+            with open(self.journal_file, 'ab') as f:
+                f.write(header + line)
+            return size + len(header) + len(line) > JOURNAL_COMPACT_BYTES
+
+    def _apply_path(self, path: Tuple[Any, ...], value: Any) -> None:
+        """Set the field addressed by a journal path (see journal_update)."""
+        task_id, *keys, field = path
+        if not 1 <= task_id <= len(self.tasks):
+            raise IndexError(f"No task {task_id}")
+        target: Any = self.tasks[task_id - 1]
+        for k in keys:
+            target = target[k]
+        target[field] = value
+
+    def _replay_journal(self, snapshot_key: Tuple[int, int]) -> None:
+        """Apply journaled changes recorded against the tasks.json just loaded."""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        if not lines:
+            return
+        try:
+            base = tuple(loads(lines[0]).get("base") or ())
+        except Exception:
+            base = ()
+        if base != snapshot_key:
+            # tasks.json was rewritten after these changes; it already holds them
+            logger.info(f"Ignoring stale journal {self.journal_file}")
+            return
+        applied = 0
+        for line in lines[1:]:
+            try:
+                entry = loads(line)
+                self._apply_path(tuple(entry["path"]), entry["value"])
+                applied += 1
+            except Exception as e:
+                # A torn last line from a crash mid-append, or a path that no longer exists
+                logger.warning(f"Skipping journal entry {line[:80]!r}: {e}")
+        logger.info(f"Replayed {applied} journaled changes from {self.journal_file}")
             
-    def _normalize_task(self, task: Any) -> Dict[str, Any]:
+    def _normalize_task(self, task: Any, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Normalize task data to standard format with all required fields."""
-        if isinstance(task, str):
-            return {
-                "id": None,
-                "title": task,
-                "status": 0,  # 0=not started, 1=in progress, 2=completed
-                "priority": 0,  # 0=low, higher numbers = higher priority
-                "effort": 0,    # effort level estimate
-                "due_date": None,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "has_subtasks": False,
-                "subtasks": []
-            }
-        elif isinstance(task, dict):
-            # Handle legacy formats
-            normalized = {
-                "id": task.get("id"),
-                "title": task.get("title", task.get("task", "")),
-                "status": int(task.get("status", 0)),
-                "priority": int(task.get("priority", task.get("want", 0))),  # 'want' for legacy compatibility
-                "effort": int(task.get("effort", 0)),
-                "due_date": task.get("due_date"),
-                "created_at": task.get("created_at", datetime.now().isoformat()),
-                "updated_at": task.get("updated_at", datetime.now().isoformat()),
-                "has_subtasks": bool(task.get("has_subtasks", False)),
-                "subtasks": [self._normalize_task(st) for st in task.get("subtasks", [])]
-            }
+        if timestamp is None:
+            timestamp = now_iso()
+        root = _normalize_fields(task, timestamp)
+        # Walk the subtask tree with an explicit stack instead of recursing
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            subtasks = []
+            for st in node["subtasks"] or []:
+                if (isinstance(st, dict) and all(k in st for k in _REQUIRED_KEYS)
+                        and all(type(st[f]) is int for f in _INT_FIELDS)
+                        and type(st["has_subtasks"]) is bool):
+                    # Already well-formed: reuse the dict, but still walk its subtasks
+                    child = st
+                else:
+                    child = _normalize_fields(st, timestamp)
+                subtasks.append(child)
+                stack.append(child)
+            node["subtasks"] = subtasks
             # Auto-detect subtasks
-            if normalized["subtasks"] and not normalized["has_subtasks"]:
-                normalized["has_subtasks"] = True
-            return normalized
-        else:
-            return self._normalize_task(str(task))
+            if subtasks and not node["has_subtasks"]:
+                node["has_subtasks"] = True
+        return root
             
     def add_task(self, title: str, priority: int = 0, effort: int = 0, 
                  due_date: Union[str, date, None] = None, interactive: bool = False) -> int:
@@ -117,22 +316,7 @@ class TaskManager:
                     print("Invalid priority value, defaulting to 0.")
                     priority = 0
         
-        # Convert due_date to string if it's a date object
-        if isinstance(due_date, date):
-            due_date = due_date.isoformat()
-        
-        task = {
-            "id": len(self.tasks) + 1,
-            "title": title,
-            "status": 0,
-            "priority": priority,
-            "effort": effort,
-            "due_date": due_date,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "has_subtasks": False,
-            "subtasks": []
-        }
+        task = self._new_task(title, priority, effort, due_date, now_iso())
         
         # Check if effort is high and offer subtasks with Yes/No/Cancel
         if interactive and effort >= 5:
@@ -156,11 +340,60 @@ class TaskManager:
                     break
                 print("Please enter 'y', 'n', or 'c'.")
         
+        index_current = self._title_to_idx is not None and self._title_index_version == self.version
         self.tasks.append(task)
+        if self._title_to_idx is not None:
+            self._title_to_idx.setdefault(title.lower().strip(), len(self.tasks) - 1)
         self.save_tasks()
+        if index_current:
+            self._title_index_version = self.version
         logger.info(f"Added task: {title}")
         return len(self.tasks)
         
+    def add_tasks(self, tasks: Iterable[Union[str, Tuple[Any, ...]]]) -> List[int]:
+        """Add several tasks and save once. Returns their indices (1-based).
+        
+        Each item is a title or a (title, priority, effort, due_date) tuple;
+        trailing tuple fields may be omitted.
+        """
+        timestamp = now_iso()
+        indices = []
+        index_current = self._title_to_idx is not None and self._title_index_version == self.version
+        for item in tasks:
+            args = (item,) if isinstance(item, str) else tuple(item)
+            task = self._new_task(*args, timestamp=timestamp)
+            self.tasks.append(task)
+            if self._title_to_idx is not None:
+                self._title_to_idx.setdefault(task["title"].lower().strip(), len(self.tasks) - 1)
+            indices.append(len(self.tasks))
+            
+        if indices:
+            self.save_tasks()
+            if index_current:
+                self._title_index_version = self.version
+            logger.info(f"Added {len(indices)} tasks")
+        return indices
+        
+    def _new_task(self, title: str, priority: int = 0, effort: int = 0,
+                  due_date: Union[str, date, None] = None, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Build a new top-level task dict positioned at the end of the list."""
+        # Convert due_date to string if it's a date object
+        if isinstance(due_date, date):
+            due_date = due_date.isoformat()
+        if timestamp is None:
+            timestamp = now_iso()
+        return {
+            **TASK_TEMPLATE,
+            "id": len(self.tasks) + 1,
+            "title": title,
+            "priority": priority,
+            "effort": effort,
+            "due_date": due_date,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+            "subtasks": []
+        }
+        
     def _prompt_add_subtasks(self, parent_task: Dict[str, Any]) -> None:
         """Interactive subtask creation."""
         while True:
@@ -212,16 +445,15 @@ class TaskManager:
             print("Invalid priority value, defaulting to 0.")
             priority_val = 0
             
+        timestamp = now_iso()
         task = {
-            "id": None,  # Subtasks don't need IDs
+            **TASK_TEMPLATE,  # Subtasks don't need IDs
             "title": title,
-            "status": 0,
             "priority": priority_val,
             "effort": effort_val,
             "due_date": due_date,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "has_subtasks": False,
+            "created_at": timestamp,
+            "updated_at": timestamp,
             "subtasks": []
         }
         
@@ -237,14 +469,56 @@ class TaskManager:
         """Remove a task by index (1-based). Returns True if successful."""
         if 1 <= task_index <= len(self.tasks):
             removed = self.tasks.pop(task_index - 1)
-            # Update IDs for remaining tasks
-            for i, task in enumerate(self.tasks):
+            index = self._title_to_idx
+            if index is not None:
+                removed_key = removed.get("title", "").lower().strip()
+                if index.get(removed_key) == task_index - 1:
+                    del index[removed_key]
+            # Only tasks after the removed one change position; their title
+            # index entries shift down with them in the same pass
+            for i in range(task_index - 1, len(self.tasks)):
+                task = self.tasks[i]
                 task["id"] = i + 1
+                if index is not None:
+                    key = task.get("title", "").lower().strip()
+                    pos = index.get(key)
+                    if pos is None or pos == i + 1:
+                        index[key] = i
             self.save_tasks()
             logger.info(f"Removed task: {removed.get('title', 'Unknown')}")
             return True
         return False
         
+    def remove_tasks(self, task_indices: Iterable[int]) -> List[int]:
+        """Remove several tasks by index (1-based) and save once.
+
+        Indices refer to positions before any removal; out-of-range and
+        duplicate indices are ignored. Returns the removed indices, ascending.
+        """
+        count = len(self.tasks)
+        removed = sorted({i for i in task_indices if isinstance(i, int) and 1 <= i <= count})
+        if not removed:
+            return []
+        for i in reversed(removed):
+            del self.tasks[i - 1]
+        self._title_to_idx = None
+        # Only tasks after the first removed one change position
+        for i in range(removed[0] - 1, len(self.tasks)):
+            self.tasks[i]["id"] = i + 1
+        self.save_tasks()
+        logger.info(f"Removed {len(removed)} tasks")
+        return removed
+        
+    def replace_tasks(self, tasks: List[Dict[str, Any]]) -> None:
+        """Replace the whole task list (e.g. restoring a backup) and save it.
+
+        Derived indexes are dropped and ``version`` is bumped, as for any
+        persisted change.
+        """
+        self.tasks = list(tasks)
+        self._title_to_idx = None
+        self.save_tasks()
+        
     def get_task(self, task_index: int) -> Optional[Dict[str, Any]]:
         """Get a task by index (1-based)."""
         if 1 <= task_index <= len(self.tasks):
@@ -252,15 +526,21 @@ class TaskManager:
         return None
         
     def update_task_status(self, task_index: int, status: int = None) -> Optional[int]:
-        """Update task status. If status is None, cycle through 0->1->2->0."""
+        """Update task status. If status is None, cycle through 0->1->2->0.
+
+        Setting the status a task already has changes nothing and skips the save.
+        """
         task = self.get_task(task_index)
         if task:
             if status is None:
                 # Cycle through statuses
                 task["status"] = (task["status"] + 1) % 3
             else:
-                task["status"] = max(0, min(2, int(status)))
-            task["updated_at"] = datetime.now().isoformat()
+                status = max(0, min(2, int(status)))
+                if status == task["status"]:
+                    return status
+                task["status"] = status
+            task["updated_at"] = now_iso()
             self.save_tasks()
             logger.info(f"Updated task {task_index} status to {task['status']}")
             return task["status"]
@@ -273,50 +553,74 @@ class TaskManager:
     def find_task_by_title(self, title: str) -> Optional[int]:
         """Find task index by title (case-insensitive). Returns 1-based index."""
         title_lower = title.lower().strip()
+        if self._title_to_idx is None:
+            self._rebuild_title_index()
+        idx = self._title_to_idx.get(title_lower)
+        if idx is not None and (idx >= len(self.tasks) or self.tasks[idx].get("title", "").lower().strip() != title_lower):
+            # Title edited in place since the index was built
+            self._rebuild_title_index()
+            idx = self._title_to_idx.get(title_lower)
+        elif idx is None and self._title_index_version != self.version:
+            # Tasks changed since the index was built; a task may have been renamed to this title
+            self._rebuild_title_index()
+            idx = self._title_to_idx.get(title_lower)
+        return idx + 1 if idx is not None else None
+        
+    def _rebuild_title_index(self) -> None:
+        """Rebuild the title lookup used by find_task_by_title."""
+        index: Dict[str, int] = {}
         for i, task in enumerate(self.tasks):
-            if task.get("title", "").lower().strip() == title_lower:
-                return i + 1
-        return None
+            index.setdefault(task.get("title", "").lower().strip(), i)
+        self._title_to_idx = index
+        self._title_index_version = self.version
         
     def get_all_tasks(self) -> List[Dict[str, Any]]:
         """Get all tasks."""
         return self.tasks.copy()
         
+    def get_tasks_by_status(self, status: int) -> List[Dict[str, Any]]:
+        """Get the tasks with a given status, in list order.
+
+        The tasks are partitioned by status once per ``version`` (i.e. per
+        load or persisted change) and served from that partition until the
+        next change.
+        """
+        if self._by_status_version != self.version:
+            by_status: Dict[Any, List[Dict[str, Any]]] = {}
+            for task in self.tasks:
+                by_status.setdefault(task.get('status'), []).append(task)
+            self._by_status = by_status
+            self._by_status_version = self.version
+        return list(self._by_status.get(status, ()))
+        
     def get_task_count(self) -> int:
         """Get total number of tasks."""
         return len(self.tasks)
         
     def get_status_name(self, status: int) -> str:
         """Convert status number to human readable name."""
-        status_names = {0: "Not Started", 1: "In Progress", 2: "Completed"}
-        return status_names.get(status, "Unknown")
+        if isinstance(status, int) and 0 <= status < len(STATUS_NAMES):
+            return STATUS_NAMES[status]
+        return "Unknown"
         
     def sort_tasks(self, sort_by: str = "priority") -> None:
         """Sort tasks by various criteria."""
-        if sort_by == "priority":
-            self.tasks.sort(key=lambda x: x.get("priority", 0), reverse=True)
-        elif sort_by == "due_date":
-            def due_key(task):
-                d = task.get('due_date')
-                if not d:
-                    return datetime.max
-                try:
-                    return datetime.fromisoformat(d)
-                except Exception:
-                    return datetime.max
-            self.tasks.sort(key=due_key)
-        elif sort_by == "effort":
-            self.tasks.sort(key=lambda x: x.get("effort", 0))
-        elif sort_by == "status":
-            self.tasks.sort(key=lambda x: x.get("status", 0))
-        elif sort_by == "title":
-            self.tasks.sort(key=lambda x: x.get("title", "").lower())
-        else:
-            raise ValueError(f"Unknown sort criteria: {sort_by}")
+        try:
+            key, reverse = _SORT_KEYS[sort_by]
+        except KeyError:
+            raise ValueError(f"Unknown sort criteria: {sort_by}") from None
+        previous_order = [id(task) for task in self.tasks]
+        self.tasks.sort(key=key, reverse=reverse)
+            
+        # Nothing moved: IDs are still valid and the file is already up to date
+        if [id(task) for task in self.tasks] == previous_order:
+            logger.info(f"Tasks already sorted by {sort_by}")
+            return
             
         # Update IDs after sorting
         for i, task in enumerate(self.tasks):
             task["id"] = i + 1
+        self._title_to_idx = None
             
         self.save_tasks()
         logger.info(f"Tasks sorted by {sort_by}")
@@ -331,10 +635,13 @@ class TaskManager:
             print("No tasks available.")
             return
             
-        print("\n=== TASKS ===")
+        # Render everything into one buffer and write it out once
+        buf = io.StringIO()
+        buf.write("\n=== TASKS ===\n")
         for i, task in enumerate(self.tasks, 1):
-            self._print_task(task, prefix=str(i), show_subtasks=show_subtasks)
-        print()
+            self._print_task(task, prefix=str(i), show_subtasks=show_subtasks, out=buf)
+        buf.write("\n")
+        sys.stdout.write(buf.getvalue())
         
     def view_subtasks(self, parent_id: int) -> None:
         """Print only the subtasks for a given top-level task (1-based parent_id)."""
@@ -352,71 +659,56 @@ class TaskManager:
             print(f"Task {parent_id} ('{parent.get('title', '')}') has no subtasks.")
             return
             
-        print(f"\nSubtasks for Task {parent_id}: {parent.get('title', '')}")
+        buf = io.StringIO()
+        buf.write(f"\nSubtasks for Task {parent_id}: {parent.get('title', '')}\n")
         for idx, sub in enumerate(subs, 1):
             if isinstance(sub, dict):
-                self._print_task(sub, prefix=f"{idx}", indent=1)
+                self._print_task(sub, prefix=f"{idx}", indent=1, out=buf)
             else:
-                print(f"  {idx}. {str(sub)}")
-        print()
+                buf.write(f"  {idx}. {str(sub)}\n")
+        buf.write("\n")
+        sys.stdout.write(buf.getvalue())
         
-    def _print_task(self, task: Dict[str, Any], prefix: str = "", indent: int = 0, show_subtasks: bool = True) -> None:
-        """Print a single task with formatting."""
-        title = task.get("title", str(task))
-        
-        # Build metadata
-        meta = []
-        meta.append(f"priority:{task.get('priority', 0)}")
-        meta.append(f"effort:{task.get('effort', 0)}")
-        
-        status_map = {0: 'not started', 1: 'in progress', 2: 'completed'}
-        meta.append(f"status:{status_map.get(task.get('status', 0), 'unknown')}")
-        
-        if task.get('due_date'):
-            meta.append(f"due:{task.get('due_date')}")
+    def _print_task(self, task: Dict[str, Any], prefix: str = "", indent: int = 0, show_subtasks: bool = True,
+                    out: Optional[TextIO] = None) -> None:
+        """Print a single task with formatting, to ``out`` if given or else to stdout in one write."""
+        buf = out if out is not None else io.StringIO()
+        stack = [(task, prefix, indent)]
+        while stack:
+            node, node_prefix, node_indent = stack.pop()
+            title = node.get("title", str(node))
             
-        # Format output
-        pad = "  " * indent
-        label = f"{prefix} {title}".strip()
-        print(f"{pad}{label} [{', '.join(meta)}]")
-        
-        # Print subtasks if requested
-        if show_subtasks:
-            for idx, child in enumerate(task.get('subtasks', []), 1):
-                self._print_task(child, prefix=f"{prefix}.{idx}" if prefix else f"{idx}", indent=indent+1)
+            # Build metadata
+            status = node.get('status', 0)
+            status_label = _STATUS_LABELS[status] if isinstance(status, int) and 0 <= status < len(_STATUS_LABELS) else 'unknown'
+            due_date = node.get('due_date')
+            due = f", due:{due_date}" if due_date else ""
+                
+            # Format output
+            pad = "  " * node_indent
+            label = f"{node_prefix} {title}".strip()
+            buf.write(f"{pad}{label} [priority:{node.get('priority', 0)}, effort:{node.get('effort', 0)}, status:{status_label}{due}]\n")
+            
+            # Queue subtasks if requested; pushed in reverse so they print in order
+            if show_subtasks:
+                children = list(enumerate(node.get('subtasks', []), 1))
+                for idx, child in reversed(children):
+                    stack.append((child, f"{node_prefix}.{idx}" if node_prefix else f"{idx}", node_indent + 1))
+        if out is None:
+            sys.stdout.write(buf.getvalue())
                 
     def get_task_stats(self) -> Dict[str, int]:
         """Get statistics about tasks."""
-        stats = {
-            "total": len(self.tasks),
-            "not_started": 0,
-            "in_progress": 0,
-            "completed": 0,
-            "has_subtasks": 0,
-            "overdue": 0
-        }
-        
+        status_counts = collections.Counter(task.get("status", 0) for task in self.tasks)
         today = date.today()
         
-        for task in self.tasks:
-            status = task.get("status", 0)
-            if status == 0:
-                stats["not_started"] += 1
-            elif status == 1:
-                stats["in_progress"] += 1
-            elif status == 2:
-                stats["completed"] += 1
-                
-            if task.get("has_subtasks", False):
-                stats["has_subtasks"] += 1
-                
-            due_date = task.get("due_date")
-            if due_date and status != 2:  # Not completed
-                try:
-                    due = datetime.fromisoformat(due_date).date()
-                    if due < today:
-                        stats["overdue"] += 1
-                except Exception:
-                    pass
-                    
-        return stats
\ No newline at end of file
+        return {
+            "total": len(self.tasks),
+            "not_started": status_counts[0],
+            "in_progress": status_counts[1],
+            "completed": status_counts[2],
+            "has_subtasks": sum(1 for task in self.tasks if task.get("has_subtasks", False)),
+            "overdue": sum(1 for task in self.tasks
+                           if task.get("status", 0) != 2  # Not completed
+                           and _parse_due_date(task.get("due_date")) < today)
+        }
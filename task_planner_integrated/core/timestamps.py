@@ -0,0 +1,27 @@
+"""Cheap ISO-8601 timestamps for task and NFC records.
+
+Creating and formatting a ``datetime`` for every record adds up when many
+tasks are loaded or created in the same second. ``now_iso`` formats the
+current time once per second and reuses that string until the clock moves on.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+# (epoch second, formatted string); replaced as a whole so readers on other
+# threads never see a second paired with another second's string
+_cached = (-1, "")
+
+
+def now_iso() -> str:
+    """Return the current local time as an ISO-8601 string, second resolution."""
+    global _cached
+    sec = int(time.time())
+    cached_sec, cached_iso = _cached
+    if sec != cached_sec:
+        cached_iso = datetime.fromtimestamp(sec).isoformat()
+        _cached = (sec, cached_iso)
+    return cached_iso
+
+__all__ = ["now_iso"]
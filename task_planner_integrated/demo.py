@@ -2,16 +2,11 @@
 
 import sys
 from pathlib import Path
-import time
-
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from core.task_manager import TaskManager
-from core.nfc_manager import NFCManager
 
 def demo_task_management():
     """Demonstrate task management features."""
+    from core.task_manager import TaskManager
+    
     print("🎯 Task Management Demo")
     print("=" * 50)
     
@@ -28,8 +23,8 @@ def demo_task_management():
     ]
     
     print("\n📝 Adding demo tasks...")
+    task_manager.add_tasks(tasks_to_add)
     for title, priority, effort, due_date in tasks_to_add:
-        task_manager.add_task(title, priority, effort, due_date)
         print(f"   ✅ Added: {title}")
     
     # Display tasks
@@ -60,6 +55,8 @@ def demo_task_management():
 
 def demo_nfc_integration(task_manager):
     """Demonstrate NFC integration."""
+    from core.nfc_manager import NFCManager
+    
     print("\n📱 NFC Integration Demo")
     print("=" * 50)
     
@@ -109,7 +106,7 @@ def demo_nfc_integration(task_manager):
     
     # Show mappings
     print("\n🗺️ All NFC mappings:")
-    mappings = nfc_manager.get_all_mappings()
+    mappings = nfc_manager.get_all_mappings_readonly()
     for tag_id, task_title in mappings.items():
         print(f"   {tag_id} → {task_title}")
     
@@ -209,4 +206,6 @@ def main():
         print(f"\n❌ Demo error: {e}")
 
 if __name__ == "__main__":
+    # Add parent directory to path
+    sys.path.append(str(Path(__file__).parent.parent))
     main()
\ No newline at end of file
@@ -1,24 +1,109 @@
 """Button controller for task interaction.
 
 Provides an optional polling fallback (enabled via env var TASK_BUTTON_POLLING=1)
-for environments where GPIO edge-detection is unavailable or unreliable.
+for environments where GPIO edge-detection is unavailable or unreliable. On
+Linux with sysfs GPIO the fallback registers the pins' ``value`` files with a
+single module-wide epoll thread that only wakes on an edge; elsewhere (or in
+mock mode) each controller polls from its own thread.
+TASK_BUTTON_SYSFS_BASE offsets BCM numbers for kernels whose GPIO chip does
+not start at 0. With TASK_BUTTON_GPIOMEM=1 the sleep-poll loop samples all
+buttons from one /dev/gpiomem register read (see gpiomem.py).
 """
 
 import logging
 import os
+import select
 import threading
 import time
-from typing import Dict, Callable, Any
-from .gpio_compat import GPIO
+from typing import Dict, Callable, Any, Iterable, Optional, Tuple
+from .gpio_compat import GPIO, REAL_GPIO
+from .gpiomem import MAX_GPIOMEM_PIN, open_level_reader
+
+SYSFS_GPIO_ROOT = '/sys/class/gpio'
 
 logger = logging.getLogger(__name__)
 
+def _sleep_until(deadline_ns: int, interval_ns: int) -> int:
+    """Sleep until a monotonic deadline and return the next one.
+    
+    Ticks stay on a fixed cadence however long the loop body took; if the
+    deadline has already passed the schedule restarts from now instead of
+    firing a burst of catch-up ticks.
+    """
+    delay = deadline_ns - time.monotonic_ns()
+    if delay > 0:
+        time.sleep(delay / 1_000_000_000)
+        return deadline_ns + interval_ns
+    return time.monotonic_ns() + interval_ns
+
+class _GlobalGPIOPoller:
+    """One epoll thread that waits on the sysfs value files of every controller.
+    
+    epoll is used directly rather than through selectors: sysfs GPIO files
+    signal edges with POLLPRI and always report readable, so they must be
+    registered for EPOLLPRI only, which selectors cannot express.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._epoll = None
+        self._handlers: Dict[int, Tuple['ButtonController', str]] = {}  # fd -> (controller, button_id)
+        self._thread = None
+        
+    def register(self, fd: int, controller: 'ButtonController', button_id: str) -> None:
+        """Watch ``fd`` and call ``controller._on_edge(fd, button_id)`` on each edge."""
+        with self._lock:
+            if self._epoll is None:
+                self._epoll = select.epoll()
+            self._handlers[fd] = (controller, button_id)
+            self._epoll.register(fd, select.EPOLLPRI | select.EPOLLERR)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='ButtonEdgePoller', daemon=True)
+                self._thread.start()
+                
+    def unregister(self, fd: int) -> None:
+        """Stop watching ``fd``; the caller closes it."""
+        with self._lock:
+            if self._handlers.pop(fd, None) is not None and self._epoll is not None:
+                try:
+                    self._epoll.unregister(fd)
+                except Exception:
+                    pass
+                    
+    def _run(self) -> None:
+        """Block until any registered value file changes and dispatch it."""
+        try:
+            while True:
+                for fd, _events in self._epoll.poll():
+                    handler = self._handlers.get(fd)
+                    if handler is not None:
+                        controller, button_id = handler
+                        controller._on_edge(fd, button_id)
+        except Exception as e:
+            logger.error(f"Button edge poller terminated with error: {e}")
+
+# Shared by every ButtonController so edge waits cost one thread in total
+_EDGE_POLLER = _GlobalGPIOPoller()
+
+class _ButtonRec:
+    """Configuration of one button; slotted to keep per-button lookups cheap."""
+    __slots__ = ('pin', 'pull_up', 'callback')
+    
+    def __init__(self, pin: int, pull_up: bool, callback: Optional[Callable[[str, int], None]]):
+        self.pin = pin
+        self.pull_up = pull_up
+        self.callback = callback
+
 class ButtonController:
     """Controls button inputs for task interaction."""
     
     def __init__(self):
-        self.buttons = {}  # button_id -> button config
+        self.buttons: Dict[str, _ButtonRec] = {}  # button_id -> button config
         self.callbacks = {}  # button_id -> callback function
+        self._pin_to_id: Dict[int, str] = {}  # GPIO channel -> button_id, for edge events
+        self._detect_pins = set()  # pins with GPIO edge detection registered
+        # One bound method shared by every pin's edge detection
+        self._event_callback = self._gpio_event_trampoline
         self._gpio_initialized = False
         # Polling configuration (optional fallback)
         self._polling_enabled = os.getenv('TASK_BUTTON_POLLING', '0') in ('1', 'true', 'True')
@@ -29,6 +114,19 @@ class ButtonController:
         self._poll_thread = None
         self._poll_thread_run = False
         self._last_states: Dict[str, bool] = {}
+        # Flat view of self.buttons for _poll_loop, rebuilt whenever buttons change:
+        # (((button_id, pin, pull_up_bit, callback, index), ...), bytearray of last states)
+        self._poll_snapshot: Tuple[Tuple[Tuple[str, int, int, Optional[Callable], int], ...], bytearray] = ((), bytearray())
+        # Same buttons as bitmasks for _gpiomem_poll_loop: (button_mask, pull_up_mask, pin -> records)
+        self._poll_masks: Tuple[int, int, Dict[int, Tuple]] = (0, 0, {})
+        # Edge-driven polling via sysfs: value-file fd -> (button_id, pin), watched by _EDGE_POLLER
+        self._edges_active = False
+        self._edge_fds: Dict[int, Tuple[str, int]] = {}
+        self._level_reader = None
+        try:
+            self._sysfs_base = int(os.getenv('TASK_BUTTON_SYSFS_BASE', '0'))
+        except Exception:
+            self._sysfs_base = 0
         
     def _ensure_gpio_setup(self):
         """Ensure GPIO is properly configured (call once)."""
@@ -54,20 +152,14 @@ class ButtonController:
             logger.info(f"Setup button '{button_id}' on GPIO{pin} with pull_{'up' if pull_up else 'down'}; "
                        f"initial state: {'LOW (pressed)' if initial_state == GPIO.LOW else 'HIGH (released)'}")
             
-            button_config = {
-                'pin': pin,
-                'pull_up': pull_up,
-                'callback': callback
-            }
-            self.buttons[button_id] = button_config
+            self.buttons[button_id] = _ButtonRec(pin, pull_up, callback)
+            self._pin_to_id[pin] = button_id
             
             if callback:
                 self.callbacks[button_id] = callback
                 # Try to setup GPIO event detection, but don't treat failure as fatal.
                 try:
-                    GPIO.add_event_detect(pin, GPIO.BOTH,
-                                        callback=lambda channel: self._handle_button_event(button_id, channel),
-                                        bouncetime=250)
+                    self._add_event_detect(pin)
                 except Exception as e:
                     # Some platforms or permission modes may not support edge detection.
                     # Keep the button registered and callback stored so the app can
@@ -77,6 +169,7 @@ class ButtonController:
                     self._polling_enabled = True
                     self._ensure_polling_started()
 
+            self._rebuild_poll_snapshot()
             # If polling fallback is enabled, ensure the poll thread is running
             if self._polling_enabled:
                 self._ensure_polling_started()
@@ -87,6 +180,19 @@ class ButtonController:
             logger.error(f"Failed to setup button '{button_id}' on GPIO{pin}: {e}")
             return False
             
+    def _add_event_detect(self, pin: int) -> None:
+        """Register edge detection for a pin, dispatching through the shared trampoline."""
+        if pin in self._detect_pins:
+            return
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._event_callback, bouncetime=250)
+        self._detect_pins.add(pin)
+        
+    def _gpio_event_trampoline(self, channel: int) -> None:
+        """GPIO edge callback: route the channel to the button configured on it."""
+        button_id = self._pin_to_id.get(channel)
+        if button_id is not None:
+            self._handle_button_event(button_id, channel)
+            
     def _handle_button_event(self, button_id: str, channel: int) -> None:
         """Internal GPIO event handler."""
         try:
@@ -94,9 +200,9 @@ class ButtonController:
                 return
                 
             button_config = self.buttons[button_id]
-            pin = button_config['pin']
-            pull_up = button_config['pull_up']
-            callback = button_config['callback']
+            pin = button_config.pin
+            pull_up = button_config.pull_up
+            callback = button_config.callback
             
             # Read current state
             current_state = GPIO.input(pin)
@@ -107,7 +213,7 @@ class ButtonController:
             
             # Only trigger callback on button press (not release)
             if is_pressed and callback:
-                logger.info(f"Button '{button_id}' pressed on GPIO{pin}")
+                logger.info("Button '%s' pressed on GPIO%s", button_id, pin)
                 callback(button_id, pin)
                 
         except Exception as e:
@@ -121,20 +227,14 @@ class ButtonController:
             
         try:
             self.callbacks[button_id] = callback
-            self.buttons[button_id]['callback'] = callback
+            self.buttons[button_id].callback = callback
+            self._rebuild_poll_snapshot()
             
-            # Update GPIO event detection; be tolerant if platform doesn't support it
-            pin = self.buttons[button_id]['pin']
-            try:
-                GPIO.remove_event_detect(pin)
-            except Exception:
-                # ignore if removal isn't supported
-                pass
-
+            # The trampoline reads the callback from the button record, so edge
+            # detection only needs registering if the pin does not have it yet
+            pin = self.buttons[button_id].pin
             try:
-                GPIO.add_event_detect(pin, GPIO.BOTH,
-                                    callback=lambda channel: self._handle_button_event(button_id, channel),
-                                    bouncetime=250)
+                self._add_event_detect(pin)
             except Exception as e:
                 logger.warning(f"GPIO.add_event_detect failed while updating callback for GPIO{pin}: {e} - callback will still be stored")
             
@@ -152,8 +252,8 @@ class ButtonController:
             
         try:
             button_config = self.buttons[button_id]
-            pin = button_config['pin']
-            pull_up = button_config['pull_up']
+            pin = button_config.pin
+            pull_up = button_config.pull_up
             
             current_state = GPIO.input(pin)
             return (current_state == GPIO.LOW) if pull_up else (current_state == GPIO.HIGH)
@@ -163,17 +263,43 @@ class ButtonController:
             return False
             
     def remove_button(self, button_id: str) -> bool:
-        """Remove a button and its GPIO event detection."""
-        if button_id not in self.buttons:
+        """Remove a button and its GPIO event detection.
+
+        Removing an unknown (or already removed) button is a no-op returning False.
+        """
+        removed = self._remove_button(button_id)
+        if removed:
+            self._rebuild_poll_snapshot()
+        return removed
+
+    def remove_buttons(self, button_ids: Iterable[str]) -> int:
+        """Remove several buttons, rebuilding the poll snapshot once.
+
+        Returns the number of buttons actually removed.
+        """
+        removed = 0
+        for button_id in button_ids:
+            removed += self._remove_button(button_id)
+        if removed:
+            self._rebuild_poll_snapshot()
+        return removed
+
+    def _remove_button(self, button_id: str) -> bool:
+        """Drop one button's state and event detection, leaving the poll snapshot stale."""
+        rec = self.buttons.get(button_id)
+        if rec is None:
             return False
             
         try:
-            pin = self.buttons[button_id]['pin']
+            pin = rec.pin
+            self._close_button_edge_files(button_id)
+            self._detect_pins.discard(pin)
             GPIO.remove_event_detect(pin)
             
             del self.buttons[button_id]
-            if button_id in self.callbacks:
-                del self.callbacks[button_id]
+            if self._pin_to_id.get(pin) == button_id:
+                del self._pin_to_id[pin]
+            self.callbacks.pop(button_id, None)
                 
             logger.info(f"Removed button '{button_id}'")
             return True
@@ -185,9 +311,9 @@ class ButtonController:
     def list_buttons(self) -> Dict[str, Any]:
         """Get list of all configured buttons."""
         return {btn_id: {
-            'pin': config['pin'],
-            'pull_up': config['pull_up'],
-            'has_callback': config['callback'] is not None,
+            'pin': config.pin,
+            'pull_up': config.pull_up,
+            'has_callback': config.callback is not None,
             'current_state': self.get_button_state(btn_id)
         } for btn_id, config in self.buttons.items()}
         
@@ -209,14 +335,28 @@ class ButtonController:
             
     def test_button(self, button_id: str) -> None:
         """Test a button by triggering its callback manually (for development)."""
-        if button_id in self.buttons and self.buttons[button_id]['callback']:
-            pin = self.buttons[button_id]['pin']
+        if button_id in self.buttons and self.buttons[button_id].callback:
+            pin = self.buttons[button_id].pin
             logger.info(f"Testing button '{button_id}' manually")
-            self.buttons[button_id]['callback'](button_id, pin)
+            self.buttons[button_id].callback(button_id, pin)
 
     # --- Polling fallback implementation ---------------------------------
     def _ensure_polling_started(self) -> None:
-        """Start polling thread if not already running."""
+        """Start polling if not already running."""
+        if self._edges_active:
+            # Buttons added after start still need their edge files registered
+            watched = set(self._edge_fds.values())
+            for btn_id, cfg in list(self.buttons.items()):
+                if (btn_id, cfg.pin) in watched:
+                    continue
+                # A button re-setup on another pin must stop watching the old one
+                self._close_button_edge_files(btn_id)
+                if not self._register_edge_file(btn_id, cfg.pin):
+                    logger.warning(f"No sysfs edge file for '{btn_id}'; restarting poller in sleep mode")
+                    self._stop_polling()
+                    self._start_poll_thread()
+                    return
+            return
         if self._poll_thread and self._poll_thread.is_alive():
             return
 
@@ -224,8 +364,8 @@ class ButtonController:
         try:
             for btn_id, cfg in list(self.buttons.items()):
                 try:
-                    pin = cfg['pin']
-                    pull_up = cfg.get('pull_up', True)
+                    pin = cfg.pin
+                    pull_up = cfg.pull_up
                     current_state_raw = GPIO.input(pin)
                     is_pressed = (current_state_raw == GPIO.LOW) if pull_up else (current_state_raw == GPIO.HIGH)
                     self._last_states[btn_id] = bool(is_pressed)
@@ -235,10 +375,85 @@ class ButtonController:
         except Exception:
             pass
 
+        self._rebuild_poll_snapshot()
+        self._start_poll_thread(try_edges=True)
+
+    def _start_poll_thread(self, try_edges: bool = False) -> None:
+        """Hand buttons to the shared edge poller if sysfs edges are usable, else start a sleep-poll thread."""
+        if try_edges and self._setup_edge_files():
+            self._edges_active = True
+            logger.info(f"Button polling started (sysfs edges, {len(self._edge_fds)} pins)")
+            return
+        target = self._poll_loop
+        if all(cfg.pin <= MAX_GPIOMEM_PIN for cfg in self.buttons.values()):
+            reader = open_level_reader()
+            if reader is not None:
+                self._level_reader = reader
+                target = self._gpiomem_poll_loop
         self._poll_thread_run = True
-        self._poll_thread = threading.Thread(target=self._poll_loop, name='ButtonPoller', daemon=True)
+        self._poll_thread = threading.Thread(target=target, name='ButtonPoller', daemon=True)
         self._poll_thread.start()
-        logger.info(f"Button polling started (interval={self._poll_interval}s)")
+        if target is self._gpiomem_poll_loop:
+            logger.info(f"Button polling started (gpiomem, interval={self._poll_interval}s)")
+        else:
+            logger.info(f"Button polling started (interval={self._poll_interval}s)")
+
+    def _setup_edge_files(self) -> bool:
+        """Register every button's sysfs value file with the edge poller. False if unavailable."""
+        if not REAL_GPIO or not hasattr(select, 'epoll') or not os.path.isdir(SYSFS_GPIO_ROOT):
+            return False
+        for btn_id, cfg in list(self.buttons.items()):
+            if not self._register_edge_file(btn_id, cfg.pin):
+                self._close_edge_files()
+                return False
+        return True
+
+    def _register_edge_file(self, button_id: str, pin: int) -> bool:
+        """Export the pin, enable edge events on it and hand its value fd to the edge poller."""
+        gpio_dir = os.path.join(SYSFS_GPIO_ROOT, f"gpio{pin + self._sysfs_base}")
+        try:
+            if not os.path.isdir(gpio_dir):
+                with open(os.path.join(SYSFS_GPIO_ROOT, 'export'), 'w') as f:
+                    f.write(str(pin + self._sysfs_base))
+            with open(os.path.join(gpio_dir, 'edge'), 'w') as f:
+                f.write('both')
+            fd = os.open(os.path.join(gpio_dir, 'value'), os.O_RDONLY | os.O_NONBLOCK)
+        except Exception as e:
+            logger.debug(f"sysfs edge setup failed for GPIO{pin}: {e}")
+            return False
+        try:
+            os.read(fd, 8)  # clear the initial pending event
+            self._edge_fds[fd] = (button_id, pin)
+            _EDGE_POLLER.register(fd, self, button_id)
+        except Exception as e:
+            logger.debug(f"epoll registration failed for GPIO{pin}: {e}")
+            self._edge_fds.pop(fd, None)
+            os.close(fd)
+            return False
+        return True
+
+    def _close_edge_files(self) -> None:
+        """Unregister and close all of this controller's sysfs value fds."""
+        for fd in list(self._edge_fds):
+            try:
+                _EDGE_POLLER.unregister(fd)
+                os.close(fd)
+            except Exception:
+                pass
+        self._edge_fds.clear()
+        self._edges_active = False
+
+    def _close_button_edge_files(self, button_id: str) -> None:
+        """Unregister and close the sysfs value fds watched for one button."""
+        for fd, (btn_id, _pin) in list(self._edge_fds.items()):
+            if btn_id != button_id:
+                continue
+            del self._edge_fds[fd]
+            try:
+                _EDGE_POLLER.unregister(fd)
+                os.close(fd)
+            except Exception:
+                pass
 
     def _stop_polling(self, join_timeout: float = 1.0) -> None:
         """Stop polling thread gracefully."""
@@ -250,37 +465,128 @@ class ButtonController:
             logger.warning(f"Error stopping poll thread: {e}")
         finally:
             self._poll_thread = None
+            self._close_edge_files()
+            if self._level_reader is not None:
+                self._level_reader.close()
+                self._level_reader = None
+
+    def _rebuild_poll_snapshot(self) -> None:
+        """Rebuild the flat button view used by _poll_loop from self.buttons."""
+        snap = tuple(
+            (btn_id, cfg.pin, 1 if cfg.pull_up else 0, cfg.callback, i)
+            for i, (btn_id, cfg) in enumerate(self.buttons.items())
+        )
+        states = bytearray(1 if self._last_states.get(btn_id, False) else 0 for btn_id, *_ in snap)
+        # Single assignment so the poll thread always sees a matching pair
+        self._poll_snapshot = (snap, states)
+        
+        button_mask = pull_up_mask = 0
+        by_pin: Dict[int, Tuple] = {}
+        for record in snap:
+            pin = record[1]
+            button_mask |= 1 << pin
+            if record[2]:
+                pull_up_mask |= 1 << pin
+            by_pin[pin] = by_pin.get(pin, ()) + (record,)
+        self._poll_masks = (button_mask, pull_up_mask, by_pin)
 
     def _poll_loop(self) -> None:
         """Background loop that polls button GPIO states and triggers callbacks."""
+        interval_ns = int(self._poll_interval * 1_000_000_000)
+        next_tick = time.monotonic_ns() + interval_ns
+        # Checked once: the hot loop only formats debug messages when they will be emitted
+        debug = logger.isEnabledFor(logging.DEBUG)
+        errors = 0
         try:
             while self._poll_thread_run:
-                for btn_id, cfg in list(self.buttons.items()):
+                snap, last_states = self._poll_snapshot
+                for btn_id, pin, pull_up, callback, i in snap:
                     try:
-                        pin = cfg['pin']
-                        pull_up = cfg.get('pull_up', True)
-                        callback = cfg.get('callback')
-
-                        current_state_raw = GPIO.input(pin)
-                        is_pressed = (current_state_raw == GPIO.LOW) if pull_up else (current_state_raw == GPIO.HIGH)
-
-                        last = self._last_states.get(btn_id, False)
+                        # Pull-up buttons read LOW (0) when pressed, pull-down read HIGH (1)
+                        is_pressed = GPIO.input(pin) ^ pull_up
+                        if is_pressed == last_states[i]:
+                            continue
+                        last_states[i] = is_pressed
+                        self._last_states[btn_id] = bool(is_pressed)
                         # Detect rising edge of press (released -> pressed)
-                        if is_pressed and not last:
-                            if callback:
-                                try:
-                                    logger.debug(f"Polling detected press for {btn_id} on GPIO{pin}")
-                                    callback(btn_id, pin)
-                                except Exception as cb_e:
-                                    logger.error(f"Error in button callback for '{btn_id}': {cb_e}")
-                            self._last_states[btn_id] = True
-                        elif not is_pressed and last:
-                            # released
-                            self._last_states[btn_id] = False
+                        if is_pressed and callback:
+                            try:
+                                if debug:
+                                    logger.debug("Polling detected press for %s on GPIO%s", btn_id, pin)
+                                callback(btn_id, pin)
+                            except Exception as cb_e:
+                                logger.error(f"Error in button callback for '{btn_id}': {cb_e}")
 
                     except Exception as inner_e:
-                        logger.debug(f"Error polling button '{btn_id}': {inner_e}")
+                        # A bad pin fails every tick; log the 1st, 2nd, 4th, 8th... error only
+                        errors += 1
+                        if debug and errors & (errors - 1) == 0:
+                            logger.debug("Error polling button '%s' (%d errors): %s", btn_id, errors, inner_e)
+
+                next_tick = _sleep_until(next_tick, interval_ns)
+        except Exception as e:
+            logger.error(f"Button polling loop terminated with error: {e}")
 
-                time.sleep(self._poll_interval)
+    def _gpiomem_poll_loop(self) -> None:
+        """Poll loop that samples every button from a single GPIO level register read."""
+        reader = self._level_reader
+        masks = None
+        prev = 0
+        interval_ns = int(self._poll_interval * 1_000_000_000)
+        next_tick = time.monotonic_ns() + interval_ns
+        debug = logger.isEnabledFor(logging.DEBUG)
+        try:
+            while self._poll_thread_run:
+                if masks is not self._poll_masks:
+                    # Buttons changed: take the current state as the baseline
+                    masks = self._poll_masks
+                    button_mask, pull_up_mask, by_pin = masks
+                    prev = (reader.read_levels() ^ pull_up_mask) & button_mask
+                # Pull-up pins read 0 when pressed, so flipping them makes every set bit "pressed"
+                pressed = (reader.read_levels() ^ pull_up_mask) & button_mask
+                changed = pressed ^ prev
+                prev = pressed
+                while changed:
+                    bit = changed & -changed
+                    changed ^= bit
+                    is_pressed = bool(pressed & bit)
+                    for btn_id, pin, _pull_up, callback, _i in by_pin.get(bit.bit_length() - 1, ()):
+                        self._last_states[btn_id] = is_pressed
+                        # Detect rising edge of press (released -> pressed)
+                        if is_pressed and callback:
+                            try:
+                                if debug:
+                                    logger.debug("Polling detected press for %s on GPIO%s", btn_id, pin)
+                                callback(btn_id, pin)
+                            except Exception as cb_e:
+                                logger.error(f"Error in button callback for '{btn_id}': {cb_e}")
+                next_tick = _sleep_until(next_tick, interval_ns)
         except Exception as e:
-            logger.error(f"Button polling loop terminated with error: {e}")
\ No newline at end of file
+            logger.error(f"Button gpiomem polling loop terminated with error: {e}")
+
+    def _on_edge(self, fd: int, btn_id: str) -> None:
+        """Handle a value-file change reported by the shared edge poller."""
+        cfg = self.buttons.get(btn_id)
+        if cfg is None:
+            return
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            value = os.read(fd, 8).strip()
+            pin = cfg.pin
+            pull_up = cfg.pull_up
+            callback = cfg.callback
+            
+            is_pressed = (value == b'0') if pull_up else (value == b'1')
+            last = self._last_states.get(btn_id, False)
+            # Detect rising edge of press (released -> pressed)
+            if is_pressed and not last:
+                if callback:
+                    try:
+                        logger.debug("Edge detected press for %s on GPIO%s", btn_id, pin)
+                        callback(btn_id, pin)
+                    except Exception as cb_e:
+                        logger.error(f"Error in button callback for '{btn_id}': {cb_e}")
+            self._last_states[btn_id] = is_pressed
+            
+        except Exception as inner_e:
+            logger.debug("Error reading edge for button '%s': %s", btn_id, inner_e)
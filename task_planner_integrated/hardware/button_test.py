@@ -11,12 +11,15 @@ Environment:
   BTN_PIN  - BCM pin number (default 6)
   BTN_PULL - UP (default) or DOWN
 
-This script polls the button and prints presses/releases.
+This script polls the button and prints presses/releases. The task planner
+menu imports it and calls main() with its own managers; run directly, it
+builds its own.
 """
 
 import os
 import time
 from pathlib import Path
+from typing import Optional
 
 # Try to import project managers to integrate with LED/controller logic
 USE_PROJECT_INTEGRATION = True
@@ -28,8 +31,7 @@ except Exception:
 
 # Prefer the project's gpio_compat which may provide a mock for testing.
 try:
-    from hardware import gpio_compat as gpio_compat
-    GPIO = gpio_compat
+    from hardware.gpio_compat import GPIO
     USING_PROJECT_GPIO = True
 except Exception:
     try:
@@ -64,102 +66,130 @@ except Exception:
         GPIO = _MockGPIO()
         USING_PROJECT_GPIO = False
 
-buttonPin = int(os.getenv('BTN_PIN', '6'))  # BCM pin for button
-pull = os.getenv('BTN_PULL', 'UP').upper()  # UP or DOWN
-
-# Setup GPIO
-GPIO.setmode(GPIO.BCM)
-if pull == 'DOWN':
-    GPIO.setup(buttonPin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-else:
-    GPIO.setup(buttonPin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-
-print(f"Using BCM pin {buttonPin} with pull-{pull} (project gpio: {USING_PROJECT_GPIO})")
-try:
-    raw = GPIO.input(buttonPin)
-    print(f"Initial raw GPIO input: {raw} (0=LOW, 1=HIGH)")
-except Exception as e:
-    print(f"Warning: could not read initial GPIO input: {e}")
-
-last_pressed = None
-poll_interval = float(os.getenv('BTN_POLL', '0.05'))
-
-# If possible, set up TaskManager + HardwareManager so button presses update LEDs
-hardware_manager = None
-task_manager = None
-if USE_PROJECT_INTEGRATION:
+def main(task_manager: Optional["TaskManager"] = None,
+         hardware_manager: Optional["HardwareManager"] = None) -> None:
+    """Poll the button until Ctrl+C.
+
+    When the running app passes its managers in, they are reused: the app's
+    own button controller already cycles the task, so presses are only
+    reported here, and GPIO is left configured on exit.
+    """
+    owns_hardware = hardware_manager is None
+    buttonPin = int(os.getenv('BTN_PIN', '6'))  # BCM pin for button
+    pull = os.getenv('BTN_PULL', 'UP').upper()  # UP or DOWN
+
+    # Setup GPIO
+    GPIO.setmode(GPIO.BCM)
+    if pull == 'DOWN':
+        GPIO.setup(buttonPin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+    else:
+        GPIO.setup(buttonPin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+
+    print(f"Using BCM pin {buttonPin} with pull-{pull} (project gpio: {USING_PROJECT_GPIO})")
     try:
-        # Resolve project root and data dir
-        project_root = Path(__file__).resolve().parents[1]
-        data_dir = project_root / 'data'
-
-        task_manager = TaskManager(str(data_dir))
-        hardware_manager = HardwareManager(task_manager)
-
-        # Register groups for existing tasks if not already present. Use defaults
-        # if tasks file is empty — these defaults mirror main.py's configuration.
-        default_led_triplets = [(17, 27, 22), (23, 24, 25)]
-        default_button_pins = [5, 6]
-
-        for idx in range(min(len(default_led_triplets), len(default_button_pins))):
-            task_id = idx + 1
-            r, g, b = default_led_triplets[idx]
-            btn = default_button_pins[idx]
-            # Avoid re-registering if group already exists
-            if task_id not in hardware_manager.groups:
-                hardware_manager.register_task_group(task_id=task_id, button_pin=btn,
-                                                     r_pin=r, g_pin=g, b_pin=b,
-                                                     task_callback=None)
+        raw = GPIO.input(buttonPin)
+        print(f"Initial raw GPIO input: {raw} (0=LOW, 1=HIGH)")
     except Exception as e:
-        print(f"Warning: unable to integrate with project managers: {e}")
-        hardware_manager = None
-        task_manager = None
+        print(f"Warning: could not read initial GPIO input: {e}")
 
-try:
-    while True:
-        time.sleep(poll_interval)
+    last_pressed = None
+    poll_interval = float(os.getenv('BTN_POLL', '0.05'))
+
+    # If possible, set up TaskManager + HardwareManager so button presses update LEDs
+    if owns_hardware and USE_PROJECT_INTEGRATION:
         try:
-            val = GPIO.input(buttonPin)
+            # Resolve project root and data dir
+            project_root = Path(__file__).resolve().parents[1]
+            data_dir = project_root / 'data'
+
+            task_manager = TaskManager(str(data_dir))
+            hardware_manager = HardwareManager(task_manager)
+
+            # Register groups for existing tasks if not already present. Use defaults
+            # if tasks file is empty — these defaults mirror main.py's configuration.
+            default_led_triplets = [(17, 27, 22), (23, 24, 25)]
+            default_button_pins = [5, 6]
+
+            for idx in range(min(len(default_led_triplets), len(default_button_pins))):
+                task_id = idx + 1
+                r, g, b = default_led_triplets[idx]
+                btn = default_button_pins[idx]
+                # Avoid re-registering if group already exists
+                if task_id not in hardware_manager.groups:
+                    hardware_manager.register_task_group(task_id=task_id, button_pin=btn,
+                                                         r_pin=r, g_pin=g, b_pin=b,
+                                                         task_callback=None)
         except Exception as e:
-            print(f"GPIO read error: {e}")
-            continue
+            print(f"Warning: unable to integrate with project managers: {e}")
+            hardware_manager = None
+            task_manager = None
+
+    # Work out once what the loop needs: the raw level that means "pressed"
+    # (pull-up: LOW, pull-down: HIGH) and which task group owns the button pin.
+    pressed_value = GPIO.HIGH if pull == 'DOWN' else GPIO.LOW
+    pin_to_group = {}
+    if hardware_manager and task_manager:
+        for tid, group in hardware_manager.groups.items():
+            for btn in group.buttons:
+                pin_to_group.setdefault(btn.get('pin'), (tid, group))
+    button_group = pin_to_group.get(buttonPin)
+
+    gpio_input = GPIO.input
+    sleep = time.sleep
+    monotonic_ns = time.monotonic_ns
+
+    # Sample on a fixed cadence: sleep until the next absolute deadline so the
+    # time spent handling a press does not stretch the polling period.
+    interval_ns = int(poll_interval * 1_000_000_000)
+    next_tick = monotonic_ns() + interval_ns
 
-        # If using pull-up, pressed == LOW. If pull-down, pressed == HIGH.
-        if pull == 'DOWN':
-            pressed = (val == GPIO.HIGH)
-        else:
-            pressed = (val == GPIO.LOW)
-
-        if last_pressed is None:
-            # On first loop just record state (avoid noisy early prints)
-            last_pressed = pressed
-            continue
-
-        if pressed and not last_pressed:
-            print("Button Pressed")
-            # If we have a hardware manager, find the matching group and cycle its status
-            if hardware_manager and task_manager:
-                try:
-                    # Find group by button pin
-                    for tid, group in hardware_manager.groups.items():
-                        for btn in group.buttons:
-                            if btn.get('pin') == buttonPin:
-                                # Cycle task status in task manager and update LEDs
-                                new_status = task_manager.increment_completion(tid)
-                                hardware_manager.update_task_led(tid, new_status)
-                                print(f"Cycled Task {tid} -> status {new_status}")
-                                break
-                except Exception as e:
-                    print(f"Error updating task/LED on button press: {e}")
-
-        elif not pressed and last_pressed:
-            print("Button Released")
-        last_pressed = pressed
-except KeyboardInterrupt:
-    print('\nExiting and cleaning up GPIO...')
     try:
-        GPIO.cleanup()
-    except Exception:
-        pass
+        while True:
+            delay = next_tick - monotonic_ns()
+            if delay > 0:
+                sleep(delay / 1_000_000_000)
+                next_tick += interval_ns
+            else:
+                next_tick = monotonic_ns() + interval_ns
+            try:
+                pressed = gpio_input(buttonPin) == pressed_value
+            except Exception as e:
+                print(f"GPIO read error: {e}")
+                continue
+
+            if last_pressed is None:
+                # On first loop just record state (avoid noisy early prints)
+                last_pressed = pressed
+                continue
+
+            if pressed and not last_pressed:
+                print("Button Pressed")
+                # If the button belongs to a task group, cycle its status
+                if button_group and not owns_hardware:
+                    print(f"Task {button_group[0]} button (cycled by the running app)")
+                elif button_group:
+                    try:
+                        # Cycle task status in task manager and update LEDs
+                        tid, group = button_group
+                        new_status = task_manager.increment_completion(tid)
+                        hardware_manager.update_task_led(tid, new_status)
+                        print(f"Cycled Task {tid} -> status {new_status}")
+                    except Exception as e:
+                        print(f"Error updating task/LED on button press: {e}")
+
+            elif not pressed and last_pressed:
+                print("Button Released")
+            last_pressed = pressed
+    except KeyboardInterrupt:
+        if not owns_hardware:
+            print('\nButton test stopped.')
+            return
+        print('\nExiting and cleaning up GPIO...')
+        try:
+            GPIO.cleanup()
+        except Exception:
+            pass
 
 
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,20 @@ try:  # pragma: no cover - simple import guard
 except Exception:  # ModuleNotFoundError or other import failure
     REAL_GPIO = False
 
+    import array
+
+    # BCM pin numbers stay below this, so pin state fits in flat arrays
+    _MOCK_PIN_COUNT = 64
+
+    def _channel(pin):
+        """Return ``pin`` if it is a valid mock channel; raise ValueError like RPi.GPIO otherwise."""
+        if not isinstance(pin, int) or not 0 <= pin < _MOCK_PIN_COUNT:
+            raise ValueError(f"The channel sent is invalid on a Raspberry Pi: {pin!r}")
+        return pin
+
     class _MockGPIO:
+        __slots__ = ("_values", "_callbacks", "_warnings", "_mode")
+
         # Constants (symbolic only)
         BCM = "BCM"
         BOARD = "BOARD"
@@ -27,8 +40,9 @@ except Exception:  # ModuleNotFoundError or other import failure
         BOTH = "BOTH"
 
         def __init__(self):
-            self._pins = {}
-            self._callbacks = {}
+            # Pin levels indexed by pin number; default HIGH (unpressed for pull-up)
+            self._values = array.array("b", [self.HIGH] * _MOCK_PIN_COUNT)
+            self._callbacks = [None] * _MOCK_PIN_COUNT
             self._warnings = False
             self._mode = None
 
@@ -40,37 +54,41 @@ except Exception:  # ModuleNotFoundError or other import failure
             self._mode = mode
 
         def setup(self, pin, direction, pull_up_down=None, initial=None):
-            self._pins[pin] = {
-                "dir": direction,
-                "pud": pull_up_down,
-                "value": self.HIGH if initial is None else initial,
-            }
+            self._values[_channel(pin)] = self.HIGH if initial is None else initial
 
         def output(self, pin, value):
-            if pin in self._pins:
-                self._pins[pin]["value"] = value
+            # Like RPi.GPIO, accept a list/tuple of channels with one value
+            # each or a single value for all of them
+            if isinstance(pin, (list, tuple)):
+                if isinstance(value, (list, tuple)):
+                    for p, v in zip(pin, value):
+                        self._values[_channel(p)] = v
+                else:
+                    for p in pin:
+                        self._values[_channel(p)] = value
+            else:
+                self._values[_channel(pin)] = value
 
         def input(self, pin):
-            # Default HIGH (unpressed for pull-up) if unknown
-            return self._pins.get(pin, {}).get("value", self.HIGH)
+            return self._values[_channel(pin)]
 
         def add_event_detect(self, pin, edge, callback=None, bouncetime=200):
             if callback:
-                self._callbacks[pin] = callback
+                self._callbacks[_channel(pin)] = callback
 
         def remove_event_detect(self, pin):
-            self._callbacks.pop(pin, None)
+            self._callbacks[_channel(pin)] = None
 
         def trigger(self, pin, value=None):  # helper for tests
             if value is not None:
                 self.output(pin, value)
-            cb = self._callbacks.get(pin)
+            cb = self._callbacks[_channel(pin)]
             if cb:
                 cb(pin)
 
         def cleanup(self):
-            self._pins.clear()
-            self._callbacks.clear()
+            self._values = array.array("b", [self.HIGH] * _MOCK_PIN_COUNT)
+            self._callbacks = [None] * _MOCK_PIN_COUNT
 
     GPIO = _MockGPIO()
 
@@ -0,0 +1,71 @@
+"""Direct GPIO level reads through /dev/gpiomem.
+
+The button poller normally calls ``GPIO.input`` once per pin per tick. On a
+Raspberry Pi up to the 4, ``/dev/gpiomem`` exposes the GPIO register block to
+unprivileged users, and the GPLEV0 register holds the level of pins 0-31 in a
+single 32-bit word. Mapping it once lets the poller sample every button with
+one read and compare whole bitmasks.
+
+This is opt-in (TASK_BUTTON_GPIOMEM=1) and only used with real RPi.GPIO. The
+Pi 5 moved GPIO to the RP1 chip with a different register layout, so it is
+skipped there, as is any machine where the device cannot be opened.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+from typing import Optional
+
+from .gpio_compat import REAL_GPIO
+
+logger = logging.getLogger(__name__)
+
+GPIOMEM_PATH = "/dev/gpiomem"
+GPIOMEM_SIZE = 4096
+GPLEV0_OFFSET = 0x34  # pin level register for GPIO 0-31
+MAX_GPIOMEM_PIN = 31
+_MODEL_PATH = "/proc/device-tree/model"
+
+
+class GpioLevelReader:
+    """Read-only mapping of the BCM283x/BCM2711 GPIO level register."""
+
+    def __init__(self, path: str = GPIOMEM_PATH):
+        fd = os.open(path, os.O_RDONLY | os.O_SYNC)
+        try:
+            self._mem = mmap.mmap(fd, GPIOMEM_SIZE, mmap.MAP_SHARED, mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        self._unpack = struct.Struct("<I").unpack_from
+
+    def read_levels(self) -> int:
+        """Return the GPLEV0 word: bit N is the current level of GPIO N."""
+        return self._unpack(self._mem, GPLEV0_OFFSET)[0]
+
+    def close(self) -> None:
+        self._mem.close()
+
+
+def _is_pi5() -> bool:
+    try:
+        with open(_MODEL_PATH, "rb") as f:
+            return b"Raspberry Pi 5" in f.read()
+    except Exception:
+        return False
+
+
+def open_level_reader() -> Optional[GpioLevelReader]:
+    """Return a level reader if enabled and supported here, else None."""
+    if os.getenv("TASK_BUTTON_GPIOMEM", "0") not in ("1", "true", "True"):
+        return None
+    if not REAL_GPIO or _is_pi5():
+        return None
+    try:
+        return GpioLevelReader()
+    except Exception as e:
+        logger.warning(f"Cannot map {GPIOMEM_PATH}: {e} - using GPIO.input polling")
+        return None
+
+__all__ = ["GpioLevelReader", "open_level_reader", "MAX_GPIOMEM_PIN"]
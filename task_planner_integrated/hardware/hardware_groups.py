@@ -1,28 +1,58 @@
 """Hardware groups for task-button-LED integration."""
 
+import functools
 import logging
-from typing import Dict, Any, List, Optional, Callable
-from .led_controller import LEDController, STATUS_TO_COLOR
+import time
+from array import array
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Callable
+from .led_controller import LEDController, STATUS_TO_COLOR, STATUS_TO_LEVELS
 from .button_controller import ButtonController
 
 logger = logging.getLogger(__name__)
 
+# Repeat presses for one task closer together than this are dropped as bounce
+PRESS_COALESCE_S = 0.05
+
+_STATUS_NAMES = {0: "Not Started", 1: "In Progress", 2: "Completed"}
+
 class HardwareGroup:
     """Represents a group of task, button, and LED working together."""
+
+    __slots__ = ("task_id", "task_title", "_status", "led_ids", "r_pins", "g_pins", "b_pins",
+                 "channels", "buttons", "_info_cache")
     
     def __init__(self, task_id: int, task_title: str = ""):
         self.task_id = task_id
         self.task_title = task_title
-        self.status = 0
-        self.leds = []  # List of LED configs
+        self._status = 0
+        # LEDs stored column-wise: led_ids[i] uses r_pins[i], g_pins[i], b_pins[i]
+        self.led_ids: List[str] = []
+        self.r_pins = array('i')
+        self.g_pins = array('i')
+        self.b_pins = array('i')
+        # All red pins, then all green, then all blue: one list-form GPIO write per group
+        self.channels: List[int] = []
         self.buttons = []  # List of button configs
+        self._info_cache: Optional[Dict[str, Any]] = None
+
+    @property
+    def status(self) -> int:
+        return self._status
+
+    @status.setter
+    def status(self, value: int) -> None:
+        if value != self._status:
+            self._status = value
+            self._info_cache = None
         
-    def add_led(self, led_id: str, pins: Dict[str, int]):
+    def add_led(self, led_id: str, r_pin: int, g_pin: int, b_pin: int):
         """Add an LED to this group."""
-        self.leds.append({
-            'led_id': led_id,
-            'pins': pins
-        })
+        self.led_ids.append(led_id)
+        self.r_pins.append(r_pin)
+        self.g_pins.append(g_pin)
+        self.b_pins.append(b_pin)
+        self.channels = [*self.r_pins, *self.g_pins, *self.b_pins]
+        self._info_cache = None
         
     def add_button(self, button_id: str, pin: int):
         """Add a button to this group."""
@@ -30,18 +60,29 @@ class HardwareGroup:
             'button_id': button_id,
             'pin': pin
         })
+        self._info_cache = None
         
     def get_info(self) -> Dict[str, Any]:
-        """Get information about this group."""
-        return {
-            'task_id': self.task_id,
-            'task_title': self.task_title,
-            'status': self.status,
-            'leds': self.leds,
-            'buttons': self.buttons,
-            'led_count': len(self.leds),
-            'button_count': len(self.buttons)
-        }
+        """Get information about this group.
+
+        The dict is cached until an LED or button is added or the status
+        changes, so callers must treat it as read-only.
+        """
+        info = self._info_cache
+        if info is None:
+            info = self._info_cache = {
+                'task_id': self.task_id,
+                'task_title': self.task_title,
+                'status': self._status,
+                'leds': [
+                    {'led_id': led_id, 'pins': {'r': r, 'g': g, 'b': b}}
+                    for led_id, r, g, b in zip(self.led_ids, self.r_pins, self.g_pins, self.b_pins)
+                ],
+                'buttons': self.buttons,
+                'led_count': len(self.led_ids),
+                'button_count': len(self.buttons)
+            }
+        return info
 
 class HardwareManager:
     """Manages the integration between tasks, LEDs, and buttons."""
@@ -51,11 +92,17 @@ class HardwareManager:
         self.led_controller = LEDController()
         self.button_controller = ButtonController()
         self.groups = {}  # task_id -> HardwareGroup
+        self._last_press: Dict[int, float] = {}  # task_id -> monotonic time of last handled press
         
     def register_task_group(self, task_id: int, button_pin: int, 
                            r_pin: int, g_pin: int, b_pin: int,
-                           task_callback: Callable[[int], None] = None) -> bool:
-        """Register a complete task group with button and LED."""
+                           task_callback: Callable[[int], None] = None,
+                           defer_update: bool = False) -> bool:
+        """Register a complete task group with button and LED.
+
+        With ``defer_update`` the LED is left unset; call ``flush_all_leds``
+        once after registering every group.
+        """
         try:
             # Get task info
             task = self.task_manager.get_task(task_id) if self.task_manager else None
@@ -68,11 +115,11 @@ class HardwareManager:
             led_id = f"task_{task_id}_led"
             pins = self.led_controller.setup_rgb_led(led_id, r_pin, g_pin, b_pin)
             if pins:
-                group.add_led(led_id, pins)
+                group.add_led(led_id, *pins)
                 
             # Setup button with callback
             button_id = f"task_{task_id}_button"
-            button_callback = lambda btn_id, pin: self._handle_task_button_press(task_id, btn_id, pin, task_callback)
+            button_callback = functools.partial(self._handle_task_button_press, task_id, task_callback)
             
             if self.button_controller.setup_button(button_id, button_pin, callback=button_callback):
                 group.add_button(button_id, button_pin)
@@ -80,70 +127,87 @@ class HardwareManager:
             # Store group
             self.groups[task_id] = group
             
-            # Update LED to current task status
-            self.update_task_led(task_id)
+            # Update LED to current task status (reusing the task fetched above)
+            if not defer_update:
+                self.update_task_led(task_id, task.get('status', 0) if task else 0)
             
-            logger.info(f"Registered task group for task {task_id}: button GPIO{button_pin}, LED R{r_pin}G{g_pin}B{b_pin}")
+            logger.info("Registered task group for task %s: button GPIO%s, LED R%sG%sB%s", task_id, button_pin, r_pin, g_pin, b_pin)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to register task group for task {task_id}: {e}")
+            logger.error("Failed to register task group for task %s: %s", task_id, e)
             return False
             
-    def register_additional_led(self, task_id: int, r_pin: int, g_pin: int, b_pin: int) -> bool:
-        """Register an additional LED for an existing task (mirror LED)."""
+    def register_additional_led(self, task_id: int, r_pin: int, g_pin: int, b_pin: int,
+                                defer_update: bool = False) -> bool:
+        """Register an additional LED for an existing task (mirror LED).
+
+        ``defer_update`` works as in ``register_task_group``.
+        """
         try:
-            if task_id not in self.groups:
+            status = None  # fetched by update_task_led unless known here
+            group = self.groups.get(task_id)
+            if group is None:
                 # Create a minimal group for this task
                 task = self.task_manager.get_task(task_id) if self.task_manager else None
                 task_title = task.get('title', f'Task {task_id}') if task else f'Task {task_id}'
-                self.groups[task_id] = HardwareGroup(task_id, task_title)
-                
-            group = self.groups[task_id]
+                status = task.get('status', 0) if task else 0
+                group = self.groups[task_id] = HardwareGroup(task_id, task_title)
             
             # Setup additional LED
-            led_count = len(group.leds)
+            led_count = len(group.led_ids)
             led_id = f"task_{task_id}_led_{led_count + 1}"
             pins = self.led_controller.setup_rgb_led(led_id, r_pin, g_pin, b_pin)
             
             if pins:
-                group.add_led(led_id, pins)
-                self.update_task_led(task_id)  # Update all LEDs for this task
-                logger.info(f"Added additional LED for task {task_id}: R{r_pin}G{g_pin}B{b_pin}")
+                group.add_led(led_id, *pins)
+                if not defer_update:
+                    self.update_task_led(task_id, status)  # Update all LEDs for this task
+                logger.info("Added additional LED for task %s: R%sG%sB%s", task_id, r_pin, g_pin, b_pin)
                 return True
                 
         except Exception as e:
-            logger.error(f"Failed to add additional LED for task {task_id}: {e}")
+            logger.error("Failed to add additional LED for task %s: %s", task_id, e)
             
         return False
         
-    def _handle_task_button_press(self, task_id: int, button_id: str, pin: int, 
-                                 custom_callback: Callable[[int], None] = None) -> None:
-        """Handle button press for a task."""
+    def _handle_task_button_press(self, task_id: int, custom_callback: Optional[Callable[[int], None]],
+                                 button_id: str, pin: int) -> None:
+        """Handle button press for a task.
+
+        Bound with ``functools.partial(task_id, custom_callback)``; the button
+        controller supplies ``button_id`` and ``pin``. Presses arriving within
+        PRESS_COALESCE_S of the last handled press for the same task are
+        treated as contact bounce and dropped.
+        """
+        now = time.monotonic()
+        if now - self._last_press.get(task_id, -PRESS_COALESCE_S) < PRESS_COALESCE_S:
+            logger.debug("Ignoring bounce on task %s button (GPIO%s)", task_id, pin)
+            return
+        self._last_press[task_id] = now
         try:
-            logger.info(f"Task {task_id} button pressed (GPIO{pin})")
+            logger.info("Task %s button pressed (GPIO%s)", task_id, pin)
             
             # Update task status if task manager is available
             if self.task_manager:
                 new_status = self.task_manager.increment_completion(task_id)
                 if new_status is not None:
                     self.update_task_led(task_id, new_status)
-                    logger.info(f"Task {task_id} status updated to {new_status}")
+                    logger.info("Task %s status updated to %s", task_id, new_status)
                     
             # Call custom callback if provided
             if custom_callback:
                 custom_callback(task_id)
                 
         except Exception as e:
-            logger.error(f"Error handling button press for task {task_id}: {e}")
+            logger.error("Error handling button press for task %s: %s", task_id, e)
             
     def update_task_led(self, task_id: int, status: int = None) -> None:
         """Update LED(s) for a task based on its status."""
         try:
-            if task_id not in self.groups:
+            group = self.groups.get(task_id)
+            if group is None:
                 return
-                
-            group = self.groups[task_id]
             
             # Get status from task manager if not provided
             if status is None and self.task_manager:
@@ -152,32 +216,64 @@ class HardwareManager:
             elif status is None:
                 status = 0
                 
-            # Update group status
-            group.status = status
-            
-            # Get color for status
-            color = STATUS_TO_COLOR.get(status, 'red')
-            
-            # Update all LEDs in the group
-            for led_config in group.leds:
-                led_id = led_config['led_id']
-                self.led_controller.set_led_color(led_id, color)
-                
-            logger.debug(f"Updated LEDs for task {task_id} to {color} (status {status})")
+            self._update_group_led(group, status)
             
         except Exception as e:
-            logger.error(f"Error updating LED for task {task_id}: {e}")
+            logger.error("Error updating LED for task %s: %s", task_id, e)
+
+    def _update_group_led(self, group: HardwareGroup, status: int) -> None:
+        """Record a group's status and show it on all of the group's LEDs."""
+        group.status = status
+        if group.led_ids:
+            self.led_controller.set_leds_status(group.led_ids, group.channels, status)
+        logger.debug("Updated LEDs for task %s to status %s", group.task_id, status)
             
     def update_all_leds(self) -> None:
         """Update all LEDs to match current task statuses."""
-        for task_id in self.groups:
-            self.update_task_led(task_id)
+        self.update_task_leds(self.groups)
+        
+    def update_task_leds(self, task_ids: Iterable[int]) -> None:
+        """Show the current status of several tasks with one list-form GPIO write.
+
+        Ids without a hardware group are skipped.
+        """
+        # One task list snapshot for the whole refresh instead of a get_task per group
+        tasks = self.task_manager.get_all_tasks() if self.task_manager else []
+        task_count = len(tasks)
+        statuses = {}
+        for task_id in task_ids:
+            task = tasks[task_id - 1] if 1 <= task_id <= task_count else None
+            statuses[task_id] = task.get('status', 0) if task else 0
+        self.show_task_statuses(statuses)
+        
+    def show_task_statuses(self, statuses: Mapping[int, int]) -> None:
+        """Show the given task_id -> status values with one list-form GPIO write.
+
+        For callers that own a different TaskManager than this one. Ids
+        without a hardware group are skipped.
+        """
+        levels_by_led = {}
+        for task_id, status in statuses.items():
+            group = self.groups.get(task_id)
+            if group is None:
+                continue
+            group.status = status
+            levels = STATUS_TO_LEVELS[status] if 0 <= status < len(STATUS_TO_LEVELS) else STATUS_TO_LEVELS[0]
+            for led_id in group.led_ids:
+                levels_by_led[led_id] = levels
+        try:
+            self.led_controller.set_led_levels(levels_by_led)
+        except Exception as e:
+            logger.error("Error updating LEDs: %s", e)
+            
+    def flush_all_leds(self) -> None:
+        """Show current task statuses after registrations made with ``defer_update``."""
+        self.update_all_leds()
             
     def get_group_info(self, task_id: int) -> Optional[Dict[str, Any]]:
         """Get information about a specific task group."""
-        if task_id in self.groups:
-            return self.groups[task_id].get_info()
-        return None
+        group = self.groups.get(task_id)
+        return group.get_info() if group is not None else None
         
     def get_all_groups(self) -> Dict[int, Dict[str, Any]]:
         """Get information about all task groups."""
@@ -185,38 +281,41 @@ class HardwareManager:
         
     def remove_group(self, task_id: int) -> bool:
         """Remove a task group and clean up its hardware."""
-        if task_id not in self.groups:
+        group = self.groups.get(task_id)
+        if group is None:
             return False
             
         try:
-            group = self.groups[task_id]
-            
-            # Turn off LEDs
-            for led_config in group.leds:
-                led_id = led_config['led_id']
-                self.led_controller.led_off(led_id=led_id)
-                
-            # Remove buttons
-            for button_config in group.buttons:
-                button_id = button_config['button_id']
-                self.button_controller.remove_button(button_id)
+            self._teardown_group(group)
                 
             # Remove from groups
             del self.groups[task_id]
             
-            logger.info(f"Removed hardware group for task {task_id}")
+            logger.info("Removed hardware group for task %s", task_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error removing group for task {task_id}: {e}")
+            logger.error("Error removing group for task %s: %s", task_id, e)
             return False
+
+    def _teardown_group(self, group: HardwareGroup) -> None:
+        """Turn off a group's LEDs and release its buttons."""
+        self.led_controller.leds_off(group.led_ids)
+        self.button_controller.remove_buttons([b['button_id'] for b in group.buttons])
+
+        self._last_press.pop(group.task_id, None)
             
     def cleanup(self) -> None:
         """Clean up all hardware resources."""
         try:
-            # Turn off all LEDs
-            for task_id in list(self.groups.keys()):
-                self.remove_group(task_id)
+            # Turn off all LEDs; popitem avoids copying the keys up front
+            groups = self.groups
+            while groups:
+                task_id, group = groups.popitem()
+                try:
+                    self._teardown_group(group)
+                except Exception as e:
+                    logger.error("Error removing group for task %s: %s", task_id, e)
                 
             # Cleanup controllers
             self.led_controller.cleanup()
@@ -225,7 +324,7 @@ class HardwareManager:
             logger.info("Hardware manager cleanup completed")
             
         except Exception as e:
-            logger.error(f"Error during hardware cleanup: {e}")
+            logger.error("Error during hardware cleanup: %s", e)
             
     def print_status(self) -> None:
         """Print status of all hardware groups."""
@@ -236,16 +335,15 @@ class HardwareManager:
         print("\n=== HARDWARE STATUS ===")
         for task_id, group in self.groups.items():
             info = group.get_info()
-            status_name = ["Not Started", "In Progress", "Completed"][info['status']]
+            status_name = _STATUS_NAMES.get(info['status'], "Unknown")
             color = STATUS_TO_COLOR.get(info['status'], 'unknown')
             
             print(f"Task {task_id}: {info['task_title']}")
             print(f"  Status: {status_name} ({color})")
             print(f"  LEDs: {info['led_count']}, Buttons: {info['button_count']}")
             
-            for led in info['leds']:
-                pins = led['pins']
-                print(f"    LED {led['led_id']}: R{pins['r']} G{pins['g']} B{pins['b']}")
+            for led_id, r_pin, g_pin, b_pin in zip(group.led_ids, group.r_pins, group.g_pins, group.b_pins):
+                print(f"    LED {led_id}: R{r_pin} G{g_pin} B{b_pin}")
                 
             for button in info['buttons']:
                 print(f"    Button {button['button_id']}: GPIO{button['pin']}")
@@ -1,17 +1,48 @@
 """LED controller for RGB status indication."""
 
-from typing import Dict, Callable
+from typing import Dict, Callable, Iterable, List, Mapping, Optional, Tuple
 import logging
 from .gpio_compat import GPIO
 
 logger = logging.getLogger(__name__)
 
+# (R, G, B) pin levels per color name. The LEDs are common-anode, so driving a
+# channel LOW lights it. Levels are resolved once here rather than per write,
+# and each tuple is passed straight to GPIO.output's list form.
+_HIGH, _LOW = GPIO.HIGH, GPIO.LOW
+# Bound once so the write path is a global load rather than an attribute fetch
+_gpio_output = GPIO.output
+_COLOR_BITS: Dict[str, Tuple[int, int, int]] = {
+    'off': (_HIGH, _HIGH, _HIGH),
+    'red': (_LOW, _HIGH, _HIGH),
+    'yellow': (_LOW, _LOW, _HIGH),
+    'green': (_HIGH, _LOW, _HIGH),
+    'blue': (_HIGH, _HIGH, _LOW),
+    'purple': (_LOW, _HIGH, _LOW),
+}
+# Task status -> levels, skipping the color name; unknown statuses show red
+_STATUS_TO_BITS: Dict[int, Tuple[int, int, int]] = {
+    0: _COLOR_BITS['red'],
+    1: _COLOR_BITS['yellow'],
+    2: _COLOR_BITS['green'],
+}
+_DEFAULT_STATUS_BITS = _COLOR_BITS['red']
+
+# Public level tuples for callers that resolve colors themselves and hand
+# them to set_led_levels: STATUS_TO_LEVELS is indexed by task status
+STATUS_TO_LEVELS: Tuple[Tuple[int, int, int], ...] = (
+    _COLOR_BITS['red'], _COLOR_BITS['yellow'], _COLOR_BITS['green'])
+LEVELS_YELLOW = _COLOR_BITS['yellow']
+LEVELS_OFF = _COLOR_BITS['off']
+
 class LEDController:
     """Controls RGB LEDs for task status indication."""
     
     def __init__(self):
-        self.leds = {}  # pin_id -> LED config
+        self.leds: Dict[str, Tuple[int, int, int]] = {}  # led_id -> (r_pin, g_pin, b_pin)
         self._gpio_initialized = False
+        # Last levels written per LED, so unchanged colors skip the GPIO writes
+        self._last_levels: Dict[str, Optional[Tuple[int, int, int]]] = {}
         
     def _ensure_gpio_setup(self):
         """Ensure GPIO is properly configured (call once)."""
@@ -22,141 +53,162 @@ class LEDController:
                 self._gpio_initialized = True
                 logger.info("GPIO initialized in BCM mode for LED controller")
             except Exception as e:
-                logger.warning(f"GPIO already configured or error: {e}")
+                logger.warning("GPIO already configured or error: %s", e)
         
-    def setup_rgb_led(self, led_id: str, r_pin: int, g_pin: int, b_pin: int) -> Dict[str, int]:
-        """Setup an RGB LED with given pins (common-anode)."""
+    def setup_rgb_led(self, led_id: str, r_pin: int, g_pin: int, b_pin: int) -> Tuple[int, ...]:
+        """Setup an RGB LED with given pins (common-anode).
+
+        Returns the ``(r_pin, g_pin, b_pin)`` tuple, or an empty tuple on failure.
+        """
         self._ensure_gpio_setup()
         try:
-            GPIO.setup(r_pin, GPIO.OUT, initial=GPIO.HIGH)
-            GPIO.setup(g_pin, GPIO.OUT, initial=GPIO.HIGH)
-            GPIO.setup(b_pin, GPIO.OUT, initial=GPIO.HIGH)
+            GPIO.setup(r_pin, GPIO.OUT, initial=_HIGH)
+            GPIO.setup(g_pin, GPIO.OUT, initial=_HIGH)
+            GPIO.setup(b_pin, GPIO.OUT, initial=_HIGH)
             
-            pins = {'r': r_pin, 'g': g_pin, 'b': b_pin}
+            pins = (r_pin, g_pin, b_pin)
             self.leds[led_id] = pins
+            self._last_levels[led_id] = None
             
-            logger.info(f"Setup RGB LED '{led_id}' on pins R{r_pin} G{g_pin} B{b_pin}")
+            logger.info("Setup RGB LED '%s' on pins R%s G%s B%s", led_id, r_pin, g_pin, b_pin)
             return pins
             
         except Exception as e:
-            logger.error(f"Failed to setup LED '{led_id}': {e}")
-            return {}
+            logger.error("Failed to setup LED '%s': %s", led_id, e)
+            return ()
             
+    def _set_color(self, color: str, led_id: str = None, r_pin: int = None,
+                   g_pin: int = None, b_pin: int = None) -> None:
+        """Set a color on a registered LED, or on raw pins if no LED id matches."""
+        if led_id and led_id in self.leds:
+            self.set_led_color(led_id, color)
+        elif r_pin is not None and g_pin is not None and b_pin is not None:
+            _gpio_output((r_pin, g_pin, b_pin), _COLOR_BITS[color])
+
     def led_off(self, led_id: str = None, r_pin: int = None, g_pin: int = None, b_pin: int = None) -> None:
         """Turn off LED (all colors high for common-anode)."""
-        try:
-            if led_id and led_id in self.leds:
-                pins = self.leds[led_id]
-                GPIO.output(pins['r'], GPIO.HIGH)
-                GPIO.output(pins['g'], GPIO.HIGH)
-                GPIO.output(pins['b'], GPIO.HIGH)
-            elif r_pin is not None and g_pin is not None and b_pin is not None:
-                GPIO.output(r_pin, GPIO.HIGH)
-                GPIO.output(g_pin, GPIO.HIGH)
-                GPIO.output(b_pin, GPIO.HIGH)
-        except Exception as e:
-            logger.error(f"Error turning off LED: {e}")
+        self._set_color('off', led_id, r_pin, g_pin, b_pin)
+
+    def leds_off(self, led_ids: Iterable[str]) -> None:
+        """Turn off several registered LEDs with one list-form GPIO write."""
+        off = _COLOR_BITS['off']
+        last_levels = self._last_levels
+        leds = self.leds
+        ids = [led_id for led_id in led_ids if led_id in leds and last_levels.get(led_id) != off]
+        if not ids:
+            return
+        channels = []
+        for led_id in ids:
+            channels.extend(leds[led_id])
+            last_levels[led_id] = None
+        _gpio_output(channels, _HIGH)
+        for led_id in ids:
+            last_levels[led_id] = off
 
     def led_red(self, led_id: str = None, r_pin: int = None, g_pin: int = None, b_pin: int = None) -> None:
         """Set LED to red."""
-        try:
-            if led_id and led_id in self.leds:
-                pins = self.leds[led_id]
-                GPIO.output(pins['r'], GPIO.LOW)
-                GPIO.output(pins['g'], GPIO.HIGH)
-                GPIO.output(pins['b'], GPIO.HIGH)
-            elif r_pin is not None and g_pin is not None and b_pin is not None:
-                GPIO.output(r_pin, GPIO.LOW)
-                GPIO.output(g_pin, GPIO.HIGH)
-                GPIO.output(b_pin, GPIO.HIGH)
-        except Exception as e:
-            logger.error(f"Error setting LED to red: {e}")
+        self._set_color('red', led_id, r_pin, g_pin, b_pin)
 
     def led_yellow(self, led_id: str = None, r_pin: int = None, g_pin: int = None, b_pin: int = None) -> None:
         """Set LED to yellow."""
-        try:
-            if led_id and led_id in self.leds:
-                pins = self.leds[led_id]
-                GPIO.output(pins['r'], GPIO.LOW)
-                GPIO.output(pins['g'], GPIO.LOW)
-                GPIO.output(pins['b'], GPIO.HIGH)
-            elif r_pin is not None and g_pin is not None and b_pin is not None:
-                GPIO.output(r_pin, GPIO.LOW)
-                GPIO.output(g_pin, GPIO.LOW)
-                GPIO.output(b_pin, GPIO.HIGH)
-        except Exception as e:
-            logger.error(f"Error setting LED to yellow: {e}")
+        self._set_color('yellow', led_id, r_pin, g_pin, b_pin)
 
     def led_green(self, led_id: str = None, r_pin: int = None, g_pin: int = None, b_pin: int = None) -> None:
         """Set LED to green."""
-        try:
-            if led_id and led_id in self.leds:
-                pins = self.leds[led_id]
-                GPIO.output(pins['r'], GPIO.HIGH)
-                GPIO.output(pins['g'], GPIO.LOW)
-                GPIO.output(pins['b'], GPIO.HIGH)
-            elif r_pin is not None and g_pin is not None and b_pin is not None:
-                GPIO.output(r_pin, GPIO.HIGH)
-                GPIO.output(g_pin, GPIO.LOW)
-                GPIO.output(b_pin, GPIO.HIGH)
-        except Exception as e:
-            logger.error(f"Error setting LED to green: {e}")
-            
+        self._set_color('green', led_id, r_pin, g_pin, b_pin)
+
     def led_blue(self, led_id: str = None, r_pin: int = None, g_pin: int = None, b_pin: int = None) -> None:
         """Set LED to blue."""
-        try:
-            if led_id and led_id in self.leds:
-                pins = self.leds[led_id]
-                GPIO.output(pins['r'], GPIO.HIGH)
-                GPIO.output(pins['g'], GPIO.HIGH)
-                GPIO.output(pins['b'], GPIO.LOW)
-            elif r_pin is not None and g_pin is not None and b_pin is not None:
-                GPIO.output(r_pin, GPIO.HIGH)
-                GPIO.output(g_pin, GPIO.HIGH)
-                GPIO.output(b_pin, GPIO.LOW)
-        except Exception as e:
-            logger.error(f"Error setting LED to blue: {e}")
+        self._set_color('blue', led_id, r_pin, g_pin, b_pin)
 
     def led_purple(self, led_id: str = None, r_pin: int = None, g_pin: int = None, b_pin: int = None) -> None:
         """Set LED to purple."""
-        try:
-            if led_id and led_id in self.leds:
-                pins = self.leds[led_id]
-                GPIO.output(pins['r'], GPIO.LOW)
-                GPIO.output(pins['g'], GPIO.HIGH)
-                GPIO.output(pins['b'], GPIO.LOW)
-            elif r_pin is not None and g_pin is not None and b_pin is not None:
-                GPIO.output(r_pin, GPIO.LOW)
-                GPIO.output(g_pin, GPIO.HIGH)
-                GPIO.output(b_pin, GPIO.LOW)
-        except Exception as e:
-            logger.error(f"Error setting LED to purple: {e}")
+        self._set_color('purple', led_id, r_pin, g_pin, b_pin)
 
     def set_led_color(self, led_id: str, color: str) -> None:
-        """Set LED to a specific color by name."""
-        color_map = {
-            'off': self.led_off,
-            'red': self.led_red,
-            'yellow': self.led_yellow,
-            'green': self.led_green,
-            'blue': self.led_blue,
-            'purple': self.led_purple
-        }
-        
-        if color.lower() in color_map:
-            color_map[color.lower()](led_id=led_id)
-        else:
-            logger.warning(f"Unknown color: {color}")
+        """Set LED to a specific color by name.
+
+        ``color`` must be one of the lowercase names in ``_COLOR_BITS`` (as
+        used by ``STATUS_TO_COLOR``). GPIO errors propagate to the caller;
+        pins are validated once in ``setup_rgb_led`` rather than on every write.
+        """
+        levels = _COLOR_BITS.get(color)
+        if levels is None:
+            logger.warning("Unknown color: %s", color)
+            return
+        self._write_levels(led_id, levels)
+
+    def set_led_levels(self, levels_by_led: Mapping[str, Tuple[int, int, int]]) -> None:
+        """Set several LEDs to (R, G, B) pin levels with one list-form GPIO write.
+
+        Take the levels from STATUS_TO_LEVELS / LEVELS_* rather than building
+        them, so no color-name lookup is needed. Unknown LED ids are skipped,
+        as are LEDs already at the requested levels; if nothing changes no
+        GPIO call is made.
+        """
+        leds = self.leds
+        last_levels = self._last_levels
+        changed = [(led_id, levels) for led_id, levels in levels_by_led.items()
+                   if led_id in leds and last_levels.get(led_id) != levels]
+        if not changed:
+            return
+        channels = []
+        values = []
+        for led_id, levels in changed:
+            channels.extend(leds[led_id])
+            values.extend(levels)
+            last_levels[led_id] = None
+        _gpio_output(channels, values)
+        for led_id, levels in changed:
+            last_levels[led_id] = levels
+
+    def set_led_status(self, led_id: str, status: int) -> None:
+        """Set LED to the color for a task status (0/1/2), without a color-name lookup."""
+        self._write_levels(led_id, _STATUS_TO_BITS.get(status, _DEFAULT_STATUS_BITS))
+
+    def set_leds_status(self, led_ids: List[str], channels: List[int], status: int) -> None:
+        """Show a task status on several LEDs with one list-form GPIO write.
+
+        ``channels`` holds every LED's red pin, then every green pin, then
+        every blue pin, in ``led_ids`` order.
+        """
+        levels = _STATUS_TO_BITS.get(status, _DEFAULT_STATUS_BITS)
+        last_levels = self._last_levels
+        if all(last_levels.get(led_id) == levels for led_id in led_ids):
+            return
+        for led_id in led_ids:
+            last_levels[led_id] = None
+        n = len(led_ids)
+        r, g, b = levels
+        _gpio_output(channels, [r] * n + [g] * n + [b] * n)
+        for led_id in led_ids:
+            last_levels[led_id] = levels
+
+    def _write_levels(self, led_id: str, levels: Tuple[int, int, int]) -> None:
+        """Write levels to a registered LED unless they are already showing."""
+        pins = self.leds.get(led_id)
+        if pins is None:
+            logger.debug("No LED registered as '%s'", led_id)
+            return
+        last_levels = self._last_levels
+        if last_levels.get(led_id) == levels:
+            return
+        # Cleared first so a write that raises part-way is not cached
+        last_levels[led_id] = None
+        # List form: all three channels in a single call into RPi.GPIO
+        _gpio_output(pins, levels)
+        last_levels[led_id] = levels
             
     def cleanup(self) -> None:
         """Turn off all LEDs and cleanup GPIO."""
         try:
             for led_id in self.leds:
                 self.led_off(led_id=led_id)
+            self._last_levels.clear()
             GPIO.cleanup()
             logger.info("LED controller cleanup completed")
         except Exception as e:
-            logger.error(f"Error during LED cleanup: {e}")
+            logger.error("Error during LED cleanup: %s", e)
 
 # Status to LED color mappings
 STATUS_TO_LED_FUNC = {
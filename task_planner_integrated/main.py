@@ -1,22 +1,60 @@
 """Main task planner application with integrated hardware and NFC support."""
 
+import io
 import logging
+import os
+import queue
+import selectors
 import sys
+import threading
 from pathlib import Path
 from time import sleep
-from typing import Optional, Dict, List, Tuple
+from typing import Callable, Optional, Dict, List, Tuple
 
 # Add current directory to path
 sys.path.append(str(Path(__file__).parent))
 
-from core.task_manager import TaskManager
-from core.nfc_manager import NFCManager
-from hardware.hardware_groups import HardwareManager
+# TaskManager, NFCManager and HardwareManager are imported in TaskPlannerApp.__init__
+# so `main.py --ledtest` only loads the GPIO layer
 from hardware.gpio_compat import GPIO, REAL_GPIO
-from hardware.led_controller import STATUS_TO_COLOR
+from hardware.led_controller import LEVELS_OFF, LEVELS_YELLOW, STATUS_TO_LEVELS
 
 logger = logging.getLogger(__name__)
 
+# Subtask saves requested within this long of each other are written once
+SAVE_COALESCE_S = 0.1
+
+# Static menu text, each written to stdout in one call per redraw
+_MAIN_MENU = (
+    "\n📋 Options:\n"
+    "1. Add Task\n"
+    "2. Remove Task\n"
+    "3. Sort Tasks\n"
+    "4. NFC Management\n"
+    "5. Hardware Status\n"
+    "6. Start Web Server\n"
+    "7. Exit\n"
+)
+_MAIN_MENU_BACK = _MAIN_MENU + "0. Back to main tasks\n"
+_NFC_MENU = (
+    "\n📱 NFC Management:\n"
+    "1. Show mappings\n"
+    "2. Add mapping\n"
+    "3. Remove mapping\n"
+    "4. Show recent pings\n"
+    "5. Clear all mappings\n"
+    "6. Back to main menu\n"
+)
+_HARDWARE_MENU = (
+    "\n⚙️ Hardware Management:\n"
+    "1. Show hardware status\n"
+    "2. Test LED colors\n"
+    "3. Sync all LEDs\n"
+    "4. Test button (simulation)\n"
+    "5. Run hardware button test script\n"
+    "6. Back to main menu\n"
+)
+
 class TaskPlannerApp:
     """Main application class for the integrated task planner."""
     
@@ -29,6 +67,9 @@ class TaskPlannerApp:
             self.data_dir = str((base / data_dir).resolve())
         else:
             self.data_dir = data_dir
+        from core.task_manager import TaskManager
+        from core.nfc_manager import NFCManager
+        from hardware.hardware_groups import HardwareManager
         self.task_manager = TaskManager(self.data_dir)
         self.nfc_manager = NFCManager(self.data_dir)
         self.hardware_manager = HardwareManager(self.task_manager)
@@ -43,9 +84,64 @@ class TaskPlannerApp:
             5,  # Button 1 -> Task 1
             6,  # Button 2 -> Task 2
         ]
+
+        # Lookups derived once from the lists above; task ids are 1-based
+        self.pin_to_task: Dict[int, int] = {pin: i for i, pin in enumerate(self.BUTTON_PINS, 1)}
+        self.task_to_triplet: Dict[int, Tuple[int, int, int]] = dict(enumerate(self.LED_PIN_TRIPLETS, 1))
         
         # Navigation state
         self.current_parent: Optional[int] = None
+        # Task dict for current_parent; set with it, dropped when tasks are edited
+        self._parent_cache: Optional[Dict] = None
+
+        # Subtask-view LED layout, fixed by setup_hardware for sync_leds_for_view:
+        # LED ids of the back indicator, and (0-based subtask index, LED ids) per
+        # subtask slot
+        self._back_led_ids: List[str] = []
+        self._subtask_led_slots: Tuple[Tuple[int, List[str]], ...] = ()
+        # View and statuses the LEDs were last synced for
+        self._last_view_key: Optional[tuple] = None
+        # Hardware group state last printed by the console loop
+        self._last_hw_status_key: Optional[tuple] = None
+
+        # Button presses are handed to the console thread: the button thread
+        # queues the task id and writes a byte to the self-pipe so the menu
+        # wakes, handles it, and redraws. Only used while the menu is waiting
+        # on a selector; otherwise presses are handled on the button thread.
+        self._button_events: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        self._ui_owns_events = False
+        self._wake_r, self._wake_w = os.pipe()
+
+        # Background task-file writer that compacts the subtask-change journal;
+        # the queue carries True (save) or None (save and stop)
+        self._save_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._save_thread: Optional[threading.Thread] = None
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+        # Menu choice -> handler; exit and "back" are handled by the loops
+        self._main_actions: Dict[str, Callable[[], None]] = {
+            "1": self._add_task_interactive,
+            "2": self._remove_task_interactive,
+            "3": self._sort_tasks_interactive,
+            "4": self._nfc_management_menu,
+            "5": self._hardware_status_menu,
+            "6": self._start_web_server,
+        }
+        self._nfc_actions: Dict[str, Callable[[], None]] = {
+            "1": self._nfc_show_mappings,
+            "2": self._nfc_add_mapping,
+            "3": self._nfc_remove_mapping,
+            "4": self._nfc_show_pings,
+            "5": self._nfc_clear_mappings,
+        }
+        self._hardware_actions: Dict[str, Callable[[], None]] = {
+            "1": self.hardware_manager.print_status,
+            "2": self._test_led_colors,
+            "3": self._sync_all_leds,
+            "4": self._test_button_simulation,
+            "5": self._run_button_test_script,
+        }
         
         logger.info(f"Task Planner App initialized (REAL_GPIO={REAL_GPIO})")
         
@@ -58,10 +154,12 @@ class TaskPlannerApp:
             logger.warning(f"GPIO setup warning: {e}")
             
         # Register task groups (button + LED combinations)
-        for idx in range(min(len(self.LED_PIN_TRIPLETS), len(self.BUTTON_PINS))):
-            task_id = idx + 1
-            button_pin = self.BUTTON_PINS[idx]
-            r_pin, g_pin, b_pin = self.LED_PIN_TRIPLETS[idx]
+        task_to_triplet = self.task_to_triplet
+        for button_pin, task_id in self.pin_to_task.items():
+            triplet = task_to_triplet.get(task_id)
+            if triplet is None:
+                continue
+            r_pin, g_pin, b_pin = triplet
             
             success = self.hardware_manager.register_task_group(
                 task_id=task_id,
@@ -69,7 +167,8 @@ class TaskPlannerApp:
                 r_pin=r_pin,
                 g_pin=g_pin,
                 b_pin=b_pin,
-                task_callback=self._handle_task_interaction
+                task_callback=self._on_button_interaction,
+                defer_update=True
             )
             
             if success:
@@ -78,20 +177,114 @@ class TaskPlannerApp:
                 logger.error(f"Failed to setup hardware for Task {task_id}")
                 
         # Register additional mirror LEDs if we have more LED triplets than buttons
-        for idx in range(len(self.BUTTON_PINS), len(self.LED_PIN_TRIPLETS)):
-            task_id = idx + 1
-            r_pin, g_pin, b_pin = self.LED_PIN_TRIPLETS[idx]
+        for task_id, (r_pin, g_pin, b_pin) in task_to_triplet.items():
+            if task_id <= len(self.BUTTON_PINS):
+                continue
             
             success = self.hardware_manager.register_additional_led(
                 task_id=task_id,
                 r_pin=r_pin,
                 g_pin=g_pin,
-                b_pin=b_pin
+                b_pin=b_pin,
+                defer_update=True
             )
             
             if success:
                 logger.info(f"Setup additional LED for Task {task_id}: R{r_pin}G{g_pin}B{b_pin}")
                 
+        # Resolve the subtask-view layout once for this pin configuration. Group
+        # LED id lists are shared, not copied, so later mirror LEDs show up too
+        led_ids_by_task = {tid: grp.led_ids for tid, grp in self.hardware_manager.groups.items()}
+        self._back_led_ids = led_ids_by_task.get(1, [])
+        self._subtask_led_slots = tuple(
+            (task_id - 2, led_ids_by_task[task_id])
+            for task_id in range(2, len(self.LED_PIN_TRIPLETS) + 1)
+            if task_id in led_ids_by_task
+        )
+        self._last_view_key = None
+
+        # Set every registered LED to its task's status in one pass
+        self.hardware_manager.flush_all_leds()
+                
+    def _on_button_interaction(self, task_id: int) -> None:
+        """Button-thread callback: pass the press to the console loop and wake it."""
+        if not self._ui_owns_events:
+            self._handle_task_interaction(task_id)
+            return
+        self._button_events.put(task_id)
+        try:
+            os.write(self._wake_w, b'x')
+        except (BlockingIOError, OSError):
+            pass  # pipe already full (a wake is pending) or closed during cleanup
+
+    def _read_choice(self, prompt: str, sel: Optional[selectors.BaseSelector]) -> Optional[str]:
+        """Read a menu choice, or return None if a button event arrived first."""
+        if sel is None:
+            return input(prompt).strip()
+        print(prompt, end='', flush=True)
+        while True:
+            for key, _ in sel.select():
+                if key.fileobj == self._wake_r:
+                    try:
+                        while os.read(self._wake_r, 64):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    self._drain_button_events()
+                    print()
+                    return None
+                line = sys.stdin.readline()
+                if not line:
+                    raise EOFError
+                return line.strip()
+
+    def _drain_button_events(self) -> None:
+        """Handle queued button presses on the console thread."""
+        events = self._button_events
+        while True:
+            try:
+                task_id = events.get_nowait()
+            except queue.Empty:
+                return
+            self._handle_task_interaction(task_id)
+
+    def _request_save(self) -> None:
+        """Queue a task-file save; bursts of requests are written once."""
+        if self._save_thread is None:
+            self._save_thread = threading.Thread(target=self._save_worker, name='TaskSaver', daemon=True)
+            self._save_thread.start()
+        self._save_queue.put(True)
+
+    def _save_worker(self) -> None:
+        """Saver thread: wait for a request, absorb any that follow within SAVE_COALESCE_S, save once."""
+        save_queue = self._save_queue
+        while True:
+            item = save_queue.get()
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                try:
+                    item = save_queue.get(timeout=SAVE_COALESCE_S)
+                except queue.Empty:
+                    break
+            try:
+                self.task_manager.save_tasks()
+            except Exception as e:
+                logger.error(f"Error saving tasks: {e}")
+            if stop:
+                return
+
+    def _flush_saves(self, timeout: float = 5.0) -> None:
+        """Write any pending save now and stop the saver thread."""
+        thread = self._save_thread
+        if thread is None:
+            return
+        self._save_queue.put(None)
+        thread.join(timeout)
+        self._save_thread = None
+
     def _handle_task_interaction(self, task_id: int) -> None:
         """Handle task interaction from button press or other sources."""
         try:
@@ -101,6 +294,7 @@ class TaskPlannerApp:
                 if task and task.get('has_subtasks', False) and task.get('subtasks', []):
                     # Enter subtask view
                     self.current_parent = task_id
+                    self._parent_cache = task
                     logger.info(f"Entered subtask view for Task {task_id}: {task.get('title', '')}")
                     self.sync_leds_for_view()
                 else:
@@ -112,19 +306,23 @@ class TaskPlannerApp:
                     # Back to root view
                     logger.info("Returning to root task view")
                     self.current_parent = None
+                    self._parent_cache = None
                     self.sync_leds_for_view()
                 else:
                     # Increment subtask
                     sub_idx = task_id - 1
-                    parent_task = self.task_manager.get_task(self.current_parent)
+                    parent_task = self._parent_task()
                     if parent_task:
                         subtasks = parent_task.get('subtasks', [])
                         if 0 < sub_idx <= len(subtasks):
                             subtask = subtasks[sub_idx - 1]
                             current_status = subtask.get('status', 0)
                             new_status = (current_status + 1) % 3
-                            subtask['status'] = new_status
-                            self.task_manager.save_tasks()
+                            # Append the one changed field; rewrite tasks.json only
+                            # (off this thread) once the journal has grown large
+                            if self.task_manager.journal_update(
+                                    (self.current_parent, 'subtasks', sub_idx - 1, 'status'), new_status):
+                                self._request_save()
                             logger.info(f"Subtask {sub_idx} of Task {self.current_parent} status -> {new_status}")
                             self.sync_leds_for_view()
                             
@@ -132,104 +330,134 @@ class TaskPlannerApp:
             logger.error(f"Error handling task interaction for task {task_id}: {e}")
             
     def sync_leds_for_view(self) -> None:
-        """Sync LEDs to match current view (root tasks or subtasks)."""
+        """Sync LEDs to match current view (root tasks or subtasks).
+
+        Does nothing if the view and every task/subtask status shown are the
+        same as at the last sync.
+        """
         try:
+            key = self._view_key()
+            if key == self._last_view_key:
+                return
+            self._last_view_key = key
+
             if self.current_parent is None:
                 # Root view: each LED shows its corresponding task status
                 self.hardware_manager.update_all_leds()
             else:
                 # Subtask view: LED 1 = back (yellow), others show subtask status
-                parent_task = self.task_manager.get_task(self.current_parent)
+                parent_task = self._parent_task()
                 if parent_task:
                     subtasks = parent_task.get('subtasks', [])
                     
+                    # Slots are resolved once; skip groups removed since then
+                    groups = self.hardware_manager.groups
+                    
                     # LED 1: back indicator (yellow)
-                    if 1 in self.hardware_manager.groups:
-                        group = self.hardware_manager.groups[1]
-                        for led_config in group.leds:
-                            led_id = led_config['led_id']
-                            self.hardware_manager.led_controller.set_led_color(led_id, 'yellow')
-                            
-                    # Subsequent LEDs: subtask statuses
-                    for idx in range(2, len(self.LED_PIN_TRIPLETS) + 1):
-                        sub_idx = idx - 1  # 1-based for subtasks
-                        if idx in self.hardware_manager.groups:
-                            group = self.hardware_manager.groups[idx]
+                    updates: Dict[str, Tuple[int, int, int]] = (
+                        dict.fromkeys(self._back_led_ids, LEVELS_YELLOW) if 1 in groups else {})
                             
-                            if 0 < sub_idx <= len(subtasks):
-                                subtask = subtasks[sub_idx - 1]
-                                status = subtask.get('status', 0)
-                                color = STATUS_TO_COLOR.get(status, 'red')
-                                
-                                for led_config in group.leds:
-                                    led_id = led_config['led_id']
-                                    self.hardware_manager.led_controller.set_led_color(led_id, color)
-                            else:
-                                # No subtask: turn off
-                                for led_config in group.leds:
-                                    led_id = led_config['led_id']
-                                    self.hardware_manager.led_controller.led_off(led_id=led_id)
+                    # Subsequent LEDs: subtask statuses, resolved straight to pin levels
+                    status_levels = STATUS_TO_LEVELS
+                    n_statuses = len(status_levels)
+                    n_subtasks = len(subtasks)
+                    for sub_i, led_ids in self._subtask_led_slots:
+                        if sub_i + 2 not in groups:
+                            continue
+                        if sub_i < n_subtasks:
+                            status = subtasks[sub_i].get('status', 0)
+                            # Unknown statuses show red, as STATUS_TO_COLOR's default did
+                            levels = status_levels[status] if 0 <= status < n_statuses else status_levels[0]
+                        else:
+                            # No subtask: turn off
+                            levels = LEVELS_OFF
+                        for led_id in led_ids:
+                            updates[led_id] = levels
+
+                    # One GPIO write for every LED whose color changed
+                    self.hardware_manager.led_controller.set_led_levels(updates)
                                     
         except Exception as e:
             logger.error(f"Error syncing LEDs for view: {e}")
             
+    def _parent_task(self) -> Optional[Dict]:
+        """Task dict for the subtask view's parent, cached between task edits."""
+        parent = self._parent_cache
+        # ids follow list position, so a sort or removal elsewhere shows up as an id mismatch
+        if parent is None or parent.get('id') != self.current_parent:
+            parent = None
+            if self.current_parent is not None:
+                parent = self.task_manager.get_task(self.current_parent)
+            self._parent_cache = parent
+        return parent
+
+    def _view_key(self) -> tuple:
+        """Cheap fingerprint of what sync_leds_for_view would display."""
+        statuses = tuple(t.get('status', 0) for t in self.task_manager.tasks)
+        if self.current_parent is None:
+            return (None, statuses)
+        parent = self._parent_task()
+        subtasks = parent.get('subtasks', []) if parent else []
+        return (self.current_parent, statuses, tuple(st.get('status', 0) for st in subtasks))
+            
     def run_console_interface(self) -> None:
         """Run the console-based interface."""
         print(f"\n🎯 Task Planner - Integrated Management System")
         print(f"Real GPIO: {REAL_GPIO}")
         print(f"Hardware Groups: {len(self.hardware_manager.groups)}")
         print(f"Tasks: {self.task_manager.get_task_count()}")
-        print(f"NFC Mappings: {len(self.nfc_manager.get_all_mappings())}")
+        print(f"NFC Mappings: {len(self.nfc_manager.get_all_mappings_readonly())}")
+        
+        # Wait on stdin and the wake pipe together so button presses redraw the
+        # view immediately; fall back to plain input() where stdin can't be selected.
+        # Only a terminal is selected: it hands over one line per read, whereas
+        # pipes and files are read in chunks, leaving later lines in sys.stdin's
+        # buffer where the selector cannot see them.
+        sel: Optional[selectors.BaseSelector] = None
+        try:
+            if sys.stdin.isatty():
+                sel = selectors.DefaultSelector()
+                sel.register(sys.stdin, selectors.EVENT_READ)
+                sel.register(self._wake_r, selectors.EVENT_READ)
+        except (ValueError, OSError, io.UnsupportedOperation):
+            if sel is not None:
+                sel.close()
+            sel = None
+        self._ui_owns_events = sel is not None
         
         try:
             while True:
                 # Display current view
                 if self.current_parent is None:
                     self.task_manager.view_tasks()
-                    # Show hardware status
-                    self.hardware_manager.print_status()
+                    # Show hardware status only when a group changed since it was last
+                    # shown; option 5 -> 1 prints it on demand
+                    hw_key = tuple((tid, g.status, len(g.led_ids)) for tid, g in self.hardware_manager.groups.items())
+                    if hw_key != self._last_hw_status_key:
+                        self._last_hw_status_key = hw_key
+                        self.hardware_manager.print_status()
                 else:
                     self.task_manager.view_subtasks(self.current_parent)
                     
                 # Sync LEDs
                 self.sync_leds_for_view()
                 
-                print("\n📋 Options:")
-                print("1. Add Task")
-                print("2. Remove Task")
-                print("3. Sort Tasks")
-                print("4. NFC Management")
-                print("5. Hardware Status")
-                print("6. Start Web Server")
-                print("7. Exit")
-                
-                if self.current_parent is not None:
-                    print("0. Back to main tasks")
+                sys.stdout.write(_MAIN_MENU if self.current_parent is None else _MAIN_MENU_BACK)
                     
-                choice = input("\nChoose an option: ").strip()
+                choice = self._read_choice("\nChoose an option: ", sel)
+                if choice is None:
+                    # Hardware event: redraw view and menu
+                    continue
                 
-                if choice == "0" and self.current_parent is not None:
+                action = self._main_actions.get(choice)
+                if action is not None:
+                    action()
+                    
+                elif choice == "0" and self.current_parent is not None:
                     self.current_parent = None
+                    self._parent_cache = None
                     print("Returned to main task view")
                     
-                elif choice == "1":
-                    self._add_task_interactive()
-                    
-                elif choice == "2":
-                    self._remove_task_interactive()
-                    
-                elif choice == "3":
-                    self._sort_tasks_interactive()
-                    
-                elif choice == "4":
-                    self._nfc_management_menu()
-                    
-                elif choice == "5":
-                    self._hardware_status_menu()
-                    
-                elif choice == "6":
-                    self._start_web_server()
-                    
                 elif choice == "7":
                     print("Exiting Task Planner...")
                     break
@@ -237,11 +465,12 @@ class TaskPlannerApp:
                 else:
                     print("Invalid option. Please try again.")
                     
-                sleep(0.2)
-                
         except KeyboardInterrupt:
             print("\n\nInterrupted by user.")
         finally:
+            self._ui_owns_events = False
+            if sel is not None:
+                sel.close()
             self.cleanup()
             
     def _add_task_interactive(self) -> None:
@@ -251,6 +480,7 @@ class TaskPlannerApp:
             print("Task title cannot be empty.")
             return
             
+        self._parent_cache = None
         try:
             task_index = self.task_manager.add_task(title, interactive=True)
             if task_index == 0:
@@ -273,6 +503,7 @@ class TaskPlannerApp:
         """Interactive task removal."""
         try:
             task_id = int(input("Enter task ID to remove: "))
+            self._parent_cache = None
             if self.task_manager.remove_task(task_id):
                 self.hardware_manager.remove_group(task_id)
                 print(f"Task {task_id} removed.")
@@ -300,6 +531,7 @@ class TaskPlannerApp:
         }
         
         if choice in sort_map:
+            self._parent_cache = None
             try:
                 self.task_manager.sort_tasks(sort_map[choice])
                 self.hardware_manager.update_all_leds()
@@ -312,100 +544,79 @@ class TaskPlannerApp:
     def _nfc_management_menu(self) -> None:
         """NFC management submenu."""
         while True:
-            print("\n📱 NFC Management:")
-            print("1. Show mappings")
-            print("2. Add mapping")
-            print("3. Remove mapping")
-            print("4. Show recent pings")
-            print("5. Clear all mappings")
-            print("6. Back to main menu")
+            sys.stdout.write(_NFC_MENU)
             
             choice = input("Choose option: ").strip()
             
-            if choice == "1":
-                mappings = self.nfc_manager.get_all_mappings()
-                if mappings:
-                    print("\nNFC Mappings:")
-                    for tag_id, task_title in mappings.items():
-                        print(f"  {tag_id} → {task_title}")
-                else:
-                    print("No NFC mappings found.")
-                    
-            elif choice == "2":
-                tag_id = input("Enter NFC tag ID: ").strip()
-                task_title = input("Enter task title: ").strip()
-                if tag_id and task_title:
-                    # Check if task exists, create if not
-                    task_index = self.task_manager.find_task_by_title(task_title)
-                    if not task_index:
-                        task_index = self.task_manager.add_task(task_title)
-                        print(f"Created new task: {task_title}")
-                    self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                    print(f"Mapped {tag_id} to {task_title}")
-                    
-            elif choice == "3":
-                tag_id = input("Enter NFC tag ID to remove: ").strip()
-                if self.nfc_manager.remove_mapping(tag_id):
-                    print(f"Mapping for {tag_id} removed.")
-                else:
-                    print("Mapping not found.")
-                    
-            elif choice == "4":
-                pings = self.nfc_manager.get_recent_pings(10)
-                if pings:
-                    print("\nRecent NFC pings:")
-                    for ping in pings[-10:]:
-                        print(f"  {ping['timestamp']}: {ping['tag_id']} → {ping['action']}")
-                else:
-                    print("No recent pings found.")
-                    
-            elif choice == "5":
-                confirm = input("Clear ALL NFC mappings? (yes/no): ").strip().lower()
-                if confirm == "yes":
-                    count = self.nfc_manager.clear_all_mappings()
-                    print(f"Cleared {count} mappings.")
-                    
+            action = self._nfc_actions.get(choice)
+            if action is not None:
+                action()
+                
             elif choice == "6":
                 break
                 
             else:
                 print("Invalid option.")
                 
+    def _nfc_show_mappings(self) -> None:
+        """Print every NFC tag mapping."""
+        shown = 0
+        for tag_id, task_title in self.nfc_manager.iter_mappings():
+            if not shown:
+                print("\nNFC Mappings:")
+            print(f"  {tag_id} → {task_title}")
+            shown += 1
+        if not shown:
+            print("No NFC mappings found.")
+            
+    def _nfc_add_mapping(self) -> None:
+        """Map an NFC tag to a task, creating the task if needed."""
+        tag_id = input("Enter NFC tag ID: ").strip()
+        task_title = input("Enter task title: ").strip()
+        if tag_id and task_title:
+            # Check if task exists, create if not
+            task_index = self.task_manager.find_task_by_title(task_title)
+            if not task_index:
+                task_index = self.task_manager.add_task(task_title)
+                print(f"Created new task: {task_title}")
+            self.nfc_manager.map_tag_to_task(tag_id, task_title)
+            print(f"Mapped {tag_id} to {task_title}")
+            
+    def _nfc_remove_mapping(self) -> None:
+        """Remove the mapping for one NFC tag."""
+        tag_id = input("Enter NFC tag ID to remove: ").strip()
+        if self.nfc_manager.remove_mapping(tag_id):
+            print(f"Mapping for {tag_id} removed.")
+        else:
+            print("Mapping not found.")
+            
+    def _nfc_show_pings(self) -> None:
+        """Print the most recent NFC pings."""
+        pings = self.nfc_manager.get_recent_pings(10)
+        if pings:
+            print("\nRecent NFC pings:")
+            for ping in pings[-10:]:
+                print(f"  {ping['timestamp']}: {ping['tag_id']} → {ping['action']}")
+        else:
+            print("No recent pings found.")
+            
+    def _nfc_clear_mappings(self) -> None:
+        """Clear all NFC mappings after confirmation."""
+        confirm = input("Clear ALL NFC mappings? (yes/no): ").strip().lower()
+        if confirm == "yes":
+            count = self.nfc_manager.clear_all_mappings()
+            print(f"Cleared {count} mappings.")
+                
     def _hardware_status_menu(self) -> None:
         """Hardware status and control menu."""
         while True:
-            print("\n⚙️ Hardware Management:")
-            print("1. Show hardware status")
-            print("2. Test LED colors")
-            print("3. Sync all LEDs")
-            print("4. Test button (simulation)")
-            print("5. Run hardware button test script")
-            print("6. Back to main menu")
+            sys.stdout.write(_HARDWARE_MENU)
             
             choice = input("Choose option: ").strip()
             
-            if choice == "1":
-                self.hardware_manager.print_status()
-                
-            elif choice == "2":
-                self._test_led_colors()
-                
-            elif choice == "3":
-                self.hardware_manager.update_all_leds()
-                print("All LEDs synced with task statuses.")
-                
-            elif choice == "4":
-                self._test_button_simulation()
-                
-            elif choice == "5":
-                # Run the hardware/button_test.py script with the current Python interpreter
-                try:
-                    import subprocess, sys
-                    script_path = Path(__file__).resolve().parent / 'hardware' / 'button_test.py'
-                    print(f"Running hardware test: {script_path}")
-                    subprocess.run([sys.executable, str(script_path)], check=False)
-                except Exception as e:
-                    print(f"Failed to run hardware test: {e}")
+            action = self._hardware_actions.get(choice)
+            if action is not None:
+                action()
                 
             elif choice == "6":
                 break
@@ -413,6 +624,30 @@ class TaskPlannerApp:
             else:
                 print("Invalid option.")
                 
+    def _sync_all_leds(self) -> None:
+        """Push every task's status to its LEDs."""
+        self.hardware_manager.update_all_leds()
+        print("All LEDs synced with task statuses.")
+        
+    def _run_button_test_script(self) -> None:
+        """Run the hardware/button_test.py poller against this app's managers.
+
+        Started with ``--subprocess``, the script runs in its own interpreter
+        instead, with its own managers.
+        """
+        try:
+            if '--subprocess' in sys.argv:
+                import subprocess
+                script_path = Path(__file__).resolve().parent / 'hardware' / 'button_test.py'
+                print(f"Running hardware test: {script_path}")
+                subprocess.run([sys.executable, str(script_path)], check=False)
+            else:
+                from hardware import button_test
+                print("Running hardware button test (Ctrl+C to return)")
+                button_test.main(self.task_manager, self.hardware_manager)
+        except Exception as e:
+            print(f"Failed to run hardware test: {e}")
+                
     def _test_led_colors(self) -> None:
         """Test LED colors for all configured LEDs."""
         groups = self.hardware_manager.get_all_groups()
@@ -457,6 +692,7 @@ class TaskPlannerApp:
             
     def _start_web_server(self) -> None:
         """Start the web server."""
+        server = None
         try:
             from web.app import TaskPlannerServer
             print("\n🌐 Starting web server...")
@@ -472,12 +708,21 @@ class TaskPlannerApp:
             print("Flask not available. Install with: pip install flask")
         except Exception as e:
             print(f"Error starting web server: {e}")
+        finally:
+            # Stop the server's ping writer so each run's manager can be freed
+            if server is not None:
+                server.nfc_manager.close()
             
     def cleanup(self) -> None:
         """Clean up resources."""
         try:
+            self._flush_saves()
             self.hardware_manager.cleanup()
             print("Hardware cleanup completed.")
+            for fd in (self._wake_r, self._wake_w):
+                if fd >= 0:
+                    os.close(fd)
+            self._wake_r = self._wake_w = -1
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
@@ -6,61 +6,128 @@ Simulates NFC tag scans by sending HTTP requests to the Task Planner server.
 Useful for testing NFC integration without physical NFC tags.
 """
 
+import argparse
+import asyncio
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# orjson-backed when installed, stdlib json otherwise (same layer the server uses)
+from core.json_compat import loads, dumps, dumps_compact
+
+# Optional async client (pip install 'httpx[http2]'); HTTP/2 additionally needs h2
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    httpx = None
+    HAS_HTTPX = False
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 # Configuration
 SERVER_URL = "http://localhost:5002"
 AUTH_TOKEN = "taskplanner2025"
 
+def scan_body(tag_id, task_title=None, reader="simulator"):
+    """Encoded JSON body for a scan request; build once and reuse with scan_tag_raw."""
+    payload = {
+        "tag_id": tag_id,
+        "reader": reader
+    }
+    if task_title:
+        payload["task_title"] = task_title
+    return dumps_compact(payload)
+
+DEMO_TAGS = [
+    ("04:AA:BB:CC:DD:EE:01", "Water Plants"),
+    ("04:AA:BB:CC:DD:EE:02", "Check Mail"),
+    ("04:AA:BB:CC:DD:EE:03", "Take Medication")
+]
+# The demo's request bodies never change, so they are encoded once
+DEMO_BODIES = [scan_body(tag_id, task_title) for tag_id, task_title in DEMO_TAGS]
+
 class NFCSimulator:
     def __init__(self, server_url=SERVER_URL, auth_token=AUTH_TOKEN):
         self.server_url = server_url
         self.headers = {
             "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # Responses are small JSON bodies; skip gzip negotiation
+            "Accept-Encoding": "identity"
         }
+        # One pooled session so every call reuses the same keep-alive connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # pool_maxsize covers the concurrent quick-demo scans sharing this session
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # endpoint -> (ETag, parsed body) for conditional GETs
+        self._etag_cache = {}
+        
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self.session.close()
+        
+    def check_health(self, timeout=2):
+        """Fetch the server health summary (raises if the server is unreachable)."""
+        response = self.session.get(f"{self.server_url}/api/health", timeout=timeout)
+        return loads(response.content)
         
     def scan_tag(self, tag_id, task_title=None, reader="simulator"):
         """Simulate an NFC tag scan."""
-        endpoint = f"{self.server_url}/api/nfc/scan"
-        
-        payload = {
-            "tag_id": tag_id,
-            "reader": reader
-        }
+        return self.scan_tag_raw(scan_body(tag_id, task_title, reader))
         
-        if task_title:
-            payload["task_title"] = task_title
-            
+    def scan_tag_raw(self, body):
+        """Post a pre-encoded scan body (see scan_body), skipping JSON encoding."""
+        endpoint = f"{self.server_url}/api/nfc/scan"
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
-            return response.status_code, response.json()
+            response = self.session.post(endpoint, data=body)
+            return response.status_code, loads(response.content)
         except requests.exceptions.ConnectionError:
             return None, {"error": "Cannot connect to server. Is it running?"}
         except Exception as e:
             return None, {"error": str(e)}
             
-    def get_mappings(self):
-        """Get all NFC mappings."""
-        endpoint = f"{self.server_url}/api/nfc/mappings"
+    def _get_cached(self, endpoint):
+        """GET with If-None-Match; a 304 reuses the body parsed last time.
+
+        Only responses that carry an ETag are cached, so servers that do not
+        send one are simply fetched in full each time.
+        """
+        etag, cached = self._etag_cache.get(endpoint, (None, None))
         try:
-            response = requests.get(endpoint, headers=self.headers)
-            return response.status_code, response.json()
+            if etag:
+                response = self.session.get(endpoint, headers={"If-None-Match": etag})
+                if response.status_code == 304:
+                    return 200, cached
+            else:
+                response = self.session.get(endpoint)
+            data = loads(response.content)
+            new_etag = response.headers.get("ETag")
+            if response.status_code == 200 and new_etag:
+                self._etag_cache[endpoint] = (new_etag, data)
+            else:
+                self._etag_cache.pop(endpoint, None)
+            return response.status_code, data
         except Exception as e:
             return None, {"error": str(e)}
             
+    def get_mappings(self):
+        """Get all NFC mappings."""
+        return self._get_cached(f"{self.server_url}/api/nfc/mappings")
+            
     def get_pings(self, limit=10):
         """Get recent NFC pings."""
-        endpoint = f"{self.server_url}/api/nfc/pings?limit={limit}"
-        try:
-            response = requests.get(endpoint, headers=self.headers)
-            return response.status_code, response.json()
-        except Exception as e:
-            return None, {"error": str(e)}
+        return self._get_cached(f"{self.server_url}/api/nfc/pings?limit={limit}")
             
     def create_mapping(self, tag_id, task_title):
         """Create an NFC mapping without scanning."""
@@ -70,19 +137,97 @@ class NFCSimulator:
             "task_title": task_title
         }
         try:
-            response = requests.post(endpoint, headers=self.headers, json=payload)
-            return response.status_code, response.json()
+            response = self.session.post(endpoint, json=payload)
+            return response.status_code, loads(response.content)
         except Exception as e:
             return None, {"error": str(e)}
             
     def get_tasks(self):
         """Get all tasks."""
-        endpoint = f"{self.server_url}/api/tasks"
+        return self._get_cached(f"{self.server_url}/api/tasks")
+
+class AsyncNFCSimulator:
+    """Async counterpart of NFCSimulator for scripted bulk scans (requires httpx).
+
+    All calls share one httpx.AsyncClient; with h2 installed they are
+    multiplexed over a single HTTP/2 connection. Methods return the same
+    ``(status_code, data)`` pairs as NFCSimulator. At most
+    ``max_connections`` requests are in flight at once; the rest wait on a
+    semaphore rather than on the client's connection pool.
+    """
+    
+    def __init__(self, server_url=SERVER_URL, auth_token=AUTH_TOKEN, max_connections=100):
+        if not HAS_HTTPX:
+            raise RuntimeError("AsyncNFCSimulator requires httpx (pip install 'httpx[http2]')")
+        self.server_url = server_url
+        self.headers = {
+            "Authorization": f"Bearer {auth_token}",
+            "Content-Type": "application/json",
+            # Responses are small JSON bodies; skip gzip negotiation
+            "Accept-Encoding": "identity"
+        }
+        self.client = httpx.AsyncClient(
+            base_url=server_url,
+            headers=self.headers,
+            http2=HAS_HTTP2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=20),
+            timeout=30.0,
+        )
+        # Matches the pool size, so large scan_many batches never queue for a
+        # connection inside httpx (where the wait counts against the timeout)
+        self._sem = asyncio.Semaphore(max_connections)
+        
+    async def aclose(self):
+        """Close the client's connections."""
+        await self.client.aclose()
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+        
+    async def _request(self, method, path, **kwargs):
         try:
-            response = requests.get(endpoint, headers=self.headers)
-            return response.status_code, response.json()
+            async with self._sem:
+                response = await self.client.request(method, path, **kwargs)
+            return response.status_code, loads(response.content)
+        except httpx.ConnectError:
+            return None, {"error": "Cannot connect to server. Is it running?"}
         except Exception as e:
             return None, {"error": str(e)}
+        
+    async def scan_tag(self, tag_id, task_title=None, reader="simulator"):
+        """Simulate an NFC tag scan."""
+        return await self.scan_tag_raw(scan_body(tag_id, task_title, reader))
+        
+    async def scan_tag_raw(self, body):
+        """Post a pre-encoded scan body (see scan_body), skipping JSON encoding."""
+        return await self._request("POST", "/api/nfc/scan", content=body)
+        
+    async def scan_many(self, tags, reader="simulator"):
+        """Scan ``(tag_id, task_title)`` pairs concurrently; results keep input order."""
+        return await asyncio.gather(*(self.scan_tag(tag_id, task_title, reader) for tag_id, task_title in tags))
+        
+    async def get_mappings(self):
+        """Get all NFC mappings."""
+        return await self._request("GET", "/api/nfc/mappings")
+        
+    async def get_pings(self, limit=10):
+        """Get recent NFC pings."""
+        return await self._request("GET", "/api/nfc/pings", params={"limit": limit})
+        
+    async def create_mapping(self, tag_id, task_title):
+        """Create an NFC mapping without scanning."""
+        return await self._request("POST", "/api/nfc/mappings", json={"tag_id": tag_id, "task_title": task_title})
+        
+    async def get_tasks(self):
+        """Get all tasks."""
+        return await self._request("GET", "/api/tasks")
+
+async def _scan_bodies_async(bodies, server_url=SERVER_URL):
+    async with AsyncNFCSimulator(server_url) as simulator:
+        return await asyncio.gather(*(simulator.scan_tag_raw(body) for body in bodies))
 
 def print_response(status_code, data):
     """Pretty print API response."""
@@ -92,22 +237,121 @@ def print_response(status_code, data):
         
     status_icon = "✅" if 200 <= status_code < 300 else "❌"
     print(f"\n{status_icon} Status: {status_code}")
-    print(json.dumps(data, indent=2))
+    if sys.stdout.isatty():
+        print(dumps(data).decode("utf-8"))
+        return
+    # Redirected output is for scripts: one compact line, written as bytes
+    # when possible to skip the text layer's re-encode
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        print(dumps_compact(data).decode("utf-8"))
+        return
+    sys.stdout.flush()
+    out.write(dumps_compact(data) + b"\n")
+    out.flush()
+
+def run_quick_demo(simulator):
+    """Scan three demo tags, then rescan the first to show the status increment."""
+    print("\n🎬 Running Quick Demo...")
+    print("\nThis will simulate scanning 3 different NFC tags")
+    
+    demo_tags = DEMO_TAGS
+    
+    if HAS_HTTPX:
+        # One async client multiplexes all three scans
+        results = asyncio.run(_scan_bodies_async(DEMO_BODIES, simulator.server_url))
+        for (tag_id, task_title), result in zip(demo_tags, results):
+            print(f"\n{'─' * 70}")
+            print(f"📱 Scanned: {task_title} ({tag_id})")
+            print_response(*result)
+    else:
+        # Scan all tags at once; results print in completion order
+        with ThreadPoolExecutor(max_workers=len(demo_tags)) as executor:
+            futures = {executor.submit(simulator.scan_tag_raw, body): tag
+                       for tag, body in zip(demo_tags, DEMO_BODIES)}
+            for future in as_completed(futures):
+                tag_id, task_title = futures[future]
+                print(f"\n{'─' * 70}")
+                print(f"📱 Scanned: {task_title} ({tag_id})")
+                print_response(*future.result())
+    
+    print(f"\n{'─' * 70}")
+    print("✅ Demo complete!")
+    print("\nNow let's scan the first tag again to increment it...")
+    
+    tag_id, task_title = demo_tags[0]
+    # Sequential: the pings fetch has to see the rescan's ping
+    print(f"\n📱 Scanning again: {task_title}")
+    print_response(*simulator.scan_tag_raw(DEMO_BODIES[0]))
+    print("\n📋 Recent NFC pings:")
+    print_response(*simulator.get_pings(5))
+    
+    print("\n💡 Notice how the status changed from 0 → 1")
 
-def main():
-    """Main interactive demo."""
-    simulator = NFCSimulator()
+def build_parser():
+    """Command-line interface; with no subcommand the interactive menu runs."""
+    parser = argparse.ArgumentParser(description="Simulate NFC tag scans against the Task Planner server.")
+    parser.add_argument("--server", default=SERVER_URL, help=f"server base URL (default: {SERVER_URL})")
+    sub = parser.add_subparsers(dest="cmd")
+    
+    scan = sub.add_parser("scan", help="simulate one tag scan")
+    scan.add_argument("tag_id")
+    scan.add_argument("--title", help="task title to create/map if the tag is new")
+    scan.add_argument("--reader", default="simulator")
     
+    mapping = sub.add_parser("mapping", help="create a mapping without scanning")
+    mapping.add_argument("tag_id")
+    mapping.add_argument("title")
+    
+    sub.add_parser("mappings", help="list NFC mappings")
+    pings = sub.add_parser("pings", help="list recent NFC pings")
+    pings.add_argument("--limit", type=int, default=10)
+    sub.add_parser("tasks", help="list tasks")
+    sub.add_parser("demo", help="run the quick demo")
+    sub.add_parser("menu", help="interactive menu (default)")
+    return parser
+
+def run_command(simulator, args):
+    """Run one non-interactive subcommand; returns the process exit code."""
+    if args.cmd == "demo":
+        run_quick_demo(simulator)
+        return 0
+    if args.cmd == "scan":
+        status, data = simulator.scan_tag(args.tag_id, args.title, args.reader)
+    elif args.cmd == "mapping":
+        status, data = simulator.create_mapping(args.tag_id, args.title)
+    elif args.cmd == "mappings":
+        status, data = simulator.get_mappings()
+    elif args.cmd == "pings":
+        status, data = simulator.get_pings(args.limit)
+    else:
+        status, data = simulator.get_tasks()
+    print_response(status, data)
+    return 0 if status is not None and 200 <= status < 300 else 1
+
+def main(argv=None):
+    """Entry point: run a subcommand, or the interactive menu by default."""
+    args = build_parser().parse_args(argv)
+    simulator = NFCSimulator(server_url=args.server)
+    try:
+        if args.cmd in (None, "menu"):
+            interactive_menu(simulator)
+        else:
+            sys.exit(run_command(simulator, args))
+    finally:
+        simulator.close()
+
+def interactive_menu(simulator):
+    """Interactive menu loop."""
     print("=" * 70)
     print("NFC TAG SCAN SIMULATOR")
     print("=" * 70)
-    print(f"\nServer: {SERVER_URL}")
+    print(f"\nServer: {simulator.server_url}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Check if server is running
     try:
-        response = requests.get(f"{SERVER_URL}/api/health", timeout=2)
-        health = response.json()
+        health = simulator.check_health()
         print(f"\n✅ Server is running")
         print(f"   Tasks: {health.get('task_stats', {}).get('total_tasks', 0)}")
         print(f"   NFC Mappings: {health.get('nfc_stats', {}).get('total_mappings', 0)}")
@@ -183,33 +427,7 @@ def main():
             print_response(status, data)
             
         elif choice == "7":
-            print("\n🎬 Running Quick Demo...")
-            print("\nThis will simulate scanning 3 different NFC tags")
-            
-            demo_tags = [
-                ("04:AA:BB:CC:DD:EE:01", "Water Plants"),
-                ("04:AA:BB:CC:DD:EE:02", "Check Mail"),
-                ("04:AA:BB:CC:DD:EE:03", "Take Medication")
-            ]
-            
-            for tag_id, task_title in demo_tags:
-                print(f"\n{'─' * 70}")
-                print(f"📱 Scanning: {task_title} ({tag_id})")
-                status, data = simulator.scan_tag(tag_id, task_title)
-                print_response(status, data)
-                time.sleep(1)
-            
-            print(f"\n{'─' * 70}")
-            print("✅ Demo complete!")
-            print("\nNow let's scan the first tag again to increment it...")
-            time.sleep(2)
-            
-            tag_id, task_title = demo_tags[0]
-            print(f"\n📱 Scanning again: {task_title}")
-            status, data = simulator.scan_tag(tag_id, task_title)
-            print_response(status, data)
-            
-            print("\n💡 Notice how the status changed from 0 → 1")
+            run_quick_demo(simulator)
             
         elif choice == "8":
             print("\n👋 Goodbye!")
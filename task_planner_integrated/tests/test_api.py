@@ -1,5 +1,7 @@
 """Simple script to test NFC API functionality."""
 
+import atexit
+import re
 import requests
 import json
 import sys
@@ -10,13 +12,29 @@ BASE_URL = "http://localhost:5002/api"
 AUTH_TOKEN = "taskplanner2025"
 HEADERS = {
     "Authorization": f"Bearer {AUTH_TOKEN}",
-    "Content-Type": "application/json"
+    "Content-Type": "application/json",
+    # Responses are small JSON bodies; skip gzip negotiation
+    "Accept-Encoding": "identity"
 }
+# One keep-alive connection for the whole run instead of a handshake per request
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+# Every test talks to the one server host: a single pool keeps one socket warm
+# from the health check through cleanup
+_ADAPTER = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=0)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+atexit.register(SESSION.close)
+
+# Cleanup filters, compiled once: task titles created by these tests, and
+# tag ids containing "test" in any case
+_TEST_TITLE_RE = re.compile(r"Test|API")
+_TEST_TAG_RE = re.compile(r"test", re.I)
 
 def test_server_health():
     """Test if server is responding."""
     try:
-        response = requests.get(f"{BASE_URL}/health", headers=HEADERS, timeout=5)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print("✅ Server is healthy!")
@@ -46,14 +64,14 @@ def test_task_operations():
         "due_date": "2025-12-31"
     }
     
-    response = requests.post(f"{BASE_URL}/tasks", headers=HEADERS, json=task_data)
+    response = SESSION.post(f"{BASE_URL}/tasks", json=task_data)
     if response.status_code == 201:
         result = response.json()
         task_id = result['task_index']
         print(f"✅ Created task {task_id}: {result['title']}")
         
         # Update task status
-        response = requests.put(f"{BASE_URL}/tasks/{task_id}/status", headers=HEADERS)
+        response = SESSION.put(f"{BASE_URL}/tasks/{task_id}/status")
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Updated task status to: {result['status_name']}")
@@ -76,7 +94,7 @@ def test_nfc_operations():
         "reader": "api_test"
     }
     
-    response = requests.post(f"{BASE_URL}/nfc/scan", headers=HEADERS, json=nfc_data)
+    response = SESSION.post(f"{BASE_URL}/nfc/scan", json=nfc_data)
     if response.status_code == 201:
         result = response.json()
         print(f"✅ NFC scan created task: {result['status']}")
@@ -87,7 +105,7 @@ def test_nfc_operations():
             "reader": "api_test"
         }
         
-        response = requests.post(f"{BASE_URL}/nfc/scan", headers=HEADERS, json=nfc_data2)
+        response = SESSION.post(f"{BASE_URL}/nfc/scan", json=nfc_data2)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ NFC increment: {result['status_name']}")
@@ -102,7 +120,7 @@ def test_nfc_mappings():
     print("\n🏷️ Testing NFC mappings...")
     
     # Get all mappings
-    response = requests.get(f"{BASE_URL}/nfc/mappings", headers=HEADERS)
+    response = SESSION.get(f"{BASE_URL}/nfc/mappings")
     if response.status_code == 200:
         mappings = response.json()['mappings']
         print(f"✅ Retrieved {len(mappings)} NFC mappings")
@@ -116,24 +134,28 @@ def cleanup_test_data():
     """Clean up test data."""
     print("\n🧹 Cleaning up test data...")
     
-    # Get all tasks and remove test ones
-    response = requests.get(f"{BASE_URL}/tasks", headers=HEADERS)
+    # Get all tasks and remove test ones in a single request
+    response = SESSION.get(f"{BASE_URL}/tasks")
     if response.status_code == 200:
         tasks = response.json()['tasks']
-        for task in tasks:
-            if 'Test' in task['title'] or 'API' in task['title']:
-                response = requests.delete(f"{BASE_URL}/tasks/{task['id']}", headers=HEADERS)
-                if response.status_code == 200:
-                    print(f"✅ Deleted test task: {task['title']}")
+        test_tasks = {task['id']: task['title'] for task in tasks
+                      if _TEST_TITLE_RE.search(task['title'])}
+        if test_tasks:
+            response = SESSION.post(f"{BASE_URL}/tasks/bulk_delete", json={"ids": list(test_tasks)})
+            if response.status_code == 200:
+                for task_id in response.json()['task_ids']:
+                    print(f"✅ Deleted test task: {test_tasks[task_id]}")
                     
-    # Remove test NFC mappings
-    response = requests.get(f"{BASE_URL}/nfc/mappings", headers=HEADERS)
+    # Remove test NFC mappings in a single request
+    response = SESSION.get(f"{BASE_URL}/nfc/mappings")
     if response.status_code == 200:
         mappings = response.json()['mappings']
-        for tag_id, task_title in mappings.items():
-            if 'test' in tag_id.lower() or 'Test' in task_title:
-                response = requests.delete(f"{BASE_URL}/nfc/mappings/{tag_id}", headers=HEADERS)
-                if response.status_code == 200:
+        test_tags = [tag_id for tag_id, task_title in mappings.items()
+                     if _TEST_TAG_RE.search(tag_id) or _TEST_TITLE_RE.search(str(task_title))]
+        if test_tags:
+            response = SESSION.post(f"{BASE_URL}/nfc/mappings/bulk_delete", json={"tag_ids": test_tags})
+            if response.status_code == 200:
+                for tag_id in response.json()['tag_ids']:
                     print(f"✅ Deleted test mapping: {tag_id}")
 
 def main():
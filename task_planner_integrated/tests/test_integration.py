@@ -1,28 +1,56 @@
 """Test the integrated task planner functionality."""
 
+import copy
+import json
+import os
 import sys
-from pathlib import Path
 import tempfile
 import shutil
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Put the project root first so it wins over any installed package of the same name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.task_manager import TaskManager
 from core.nfc_manager import NFCManager
 from hardware.hardware_groups import HardwareManager
 
+# Keep test data in RAM where tmpfs is available; the managers write JSON on most calls
+_TMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+# Pre-populated tasks built once per module; tests copy the list instead of re-adding
+_BASE_DIR = None
+_PRIORITY_TASKS = []
+
+def setUpModule():
+    global _BASE_DIR, _PRIORITY_TASKS
+    _BASE_DIR = tempfile.mkdtemp(dir=_TMP_ROOT)
+    base = TaskManager(_BASE_DIR)
+    base.add_tasks([("Low Priority", 1), ("High Priority", 10), ("Medium Priority", 5)])
+    _PRIORITY_TASKS = base.tasks
+
+def tearDownModule():
+    shutil.rmtree(_BASE_DIR)
+
 class TestTaskManager(unittest.TestCase):
     """Test the core task management functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        cls.task_manager = TaskManager(cls.temp_dir)
+        
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+        
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.task_manager = TaskManager(self.temp_dir)
+        # One manager is shared by the class; each test's changes are rolled back
+        self._saved_tasks = copy.deepcopy(self.task_manager.tasks)
         
     def tearDown(self):
-        shutil.rmtree(self.temp_dir)
+        self.task_manager.replace_tasks(self._saved_tasks)
         
     def test_add_task(self):
         """Test adding a basic task."""
@@ -65,6 +93,29 @@ class TestTaskManager(unittest.TestCase):
         index = self.task_manager.find_task_by_title("Nonexistent Task")
         self.assertIsNone(index)
         
+    def test_find_task_by_title_after_remove(self):
+        """Test the title index follows removals and renumbering."""
+        self.task_manager.add_tasks([("Task A", 0), ("Task B", 0), ("Task C", 0), ("Task D", 0)])
+        self.assertEqual(self.task_manager.find_task_by_title("Task D"), 4)
+        
+        self.task_manager.remove_task(1)
+        self.assertIsNone(self.task_manager.find_task_by_title("Task A"))
+        self.assertEqual(self.task_manager.find_task_by_title("Task D"), 3)
+        
+        self.assertEqual(self.task_manager.remove_tasks([1, 2, 9]), [1, 2])
+        self.assertIsNone(self.task_manager.find_task_by_title("Task B"))
+        self.assertEqual(self.task_manager.find_task_by_title("task d"), 1)
+        
+    def test_find_task_by_title_after_rename(self):
+        """Test the title index finds a task renamed in place."""
+        self.task_manager.add_task("Task A")
+        self.assertIsNone(self.task_manager.find_task_by_title("Task B"))
+        
+        self.task_manager.get_task(1)["title"] = "Task B"
+        self.task_manager.save_tasks()
+        self.assertEqual(self.task_manager.find_task_by_title("Task B"), 1)
+        self.assertIsNone(self.task_manager.find_task_by_title("Task A"))
+        
     def test_remove_task(self):
         """Test removing tasks."""
         self.task_manager.add_task("Task 1")
@@ -84,29 +135,46 @@ class TestTaskManager(unittest.TestCase):
         self.assertEqual(task1['title'], "Task 1")
         self.assertEqual(task2['title'], "Task 3")  # Task 3 moved to position 2
         
+    def test_load_normalizes_nested_subtasks(self):
+        """Test subtasks below a well-formed subtask are normalized on load."""
+        data_dir = tempfile.mkdtemp(dir=self.temp_dir)
+        child = dict(self.task_manager._normalize_task("Child"), subtasks=["Grandchild"])
+        with open(os.path.join(data_dir, "tasks.json"), "w") as f:
+            json.dump([{"title": "Parent", "subtasks": [child]}], f)
+        
+        manager = TaskManager(data_dir)
+        grandchild = manager.get_task(1)["subtasks"][0]["subtasks"][0]
+        self.assertEqual(grandchild["title"], "Grandchild")
+        self.assertEqual(grandchild["status"], 0)
+        with patch("builtins.print"):
+            manager.view_tasks()
+        
     def test_sort_tasks(self):
         """Test task sorting."""
-        self.task_manager.add_task("Low Priority", priority=1)
-        self.task_manager.add_task("High Priority", priority=10)
-        self.task_manager.add_task("Medium Priority", priority=5)
+        self.task_manager.replace_tasks(copy.deepcopy(_PRIORITY_TASKS))
         
         self.task_manager.sort_tasks("priority")
         
         # Check order (high to low priority)
-        tasks = self.task_manager.get_all_tasks()
-        self.assertEqual(tasks[0]['title'], "High Priority")
-        self.assertEqual(tasks[1]['title'], "Medium Priority")
-        self.assertEqual(tasks[2]['title'], "Low Priority")
+        titles = [task['title'] for task in self.task_manager.get_all_tasks()]
+        self.assertEqual(titles, ["High Priority", "Medium Priority", "Low Priority"])
 
 class TestNFCManager(unittest.TestCase):
     """Test the NFC management functionality."""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.nfc_manager = NFCManager(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        cls.nfc_manager = NFCManager(cls.temp_dir)
+        
+    @classmethod
+    def tearDownClass(cls):
+        cls.nfc_manager.close()
+        shutil.rmtree(cls.temp_dir)
         
     def tearDown(self):
-        shutil.rmtree(self.temp_dir)
+        # Shared manager: drop the mappings each test made (only test_log_ping logs pings)
+        self.nfc_manager.clear_all_mappings()
         
     def test_map_tag_to_task(self):
         """Test mapping NFC tags to tasks."""
@@ -167,21 +235,27 @@ class TestNFCManager(unittest.TestCase):
 class TestHardwareManager(unittest.TestCase):
     """Test the hardware management functionality."""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.task_manager = TaskManager(self.temp_dir)
-        self.hardware_manager = HardwareManager(self.task_manager)
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
+        cls.task_manager = TaskManager(cls.temp_dir)
+        cls.hardware_manager = HardwareManager(cls.task_manager)
         
-        # Add some test tasks
-        self.task_manager.add_task("Task 1")
-        self.task_manager.add_task("Task 2")
+        # Add some test tasks; the tests only read them
+        cls.task_manager.add_task("Task 1")
+        cls.task_manager.add_task("Task 2")
+        
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+        cls.hardware_manager.cleanup()
         
     def tearDown(self):
-        shutil.rmtree(self.temp_dir)
-        self.hardware_manager.cleanup()
+        # Release the groups (LEDs and buttons) this test registered
+        for task_id in list(self.hardware_manager.groups):
+            self.hardware_manager.remove_group(task_id)
         
-    @patch('hardware.hardware_groups.GPIO')
-    def test_register_task_group(self, mock_gpio):
+    def test_register_task_group(self):
         """Test registering a task group with LED and button."""
         success = self.hardware_manager.register_task_group(
             task_id=1,
@@ -200,8 +274,7 @@ class TestHardwareManager(unittest.TestCase):
         self.assertEqual(group_info['led_count'], 1)
         self.assertEqual(group_info['button_count'], 1)
         
-    @patch('hardware.hardware_groups.GPIO')
-    def test_register_additional_led(self, mock_gpio):
+    def test_register_additional_led(self):
         """Test registering additional LEDs for a task."""
         # First register a basic group
         self.hardware_manager.register_task_group(
@@ -227,13 +300,12 @@ class TestHardwareManager(unittest.TestCase):
         
     def test_get_all_groups(self):
         """Test getting information about all groups."""
-        with patch('hardware.hardware_groups.GPIO'):
-            self.hardware_manager.register_task_group(
-                task_id=1, button_pin=5, r_pin=17, g_pin=27, b_pin=22
-            )
-            self.hardware_manager.register_task_group(
-                task_id=2, button_pin=6, r_pin=23, g_pin=24, b_pin=25
-            )
+        self.hardware_manager.register_task_group(
+            task_id=1, button_pin=5, r_pin=17, g_pin=27, b_pin=22
+        )
+        self.hardware_manager.register_task_group(
+            task_id=2, button_pin=6, r_pin=23, g_pin=24, b_pin=25
+        )
         
         groups = self.hardware_manager.get_all_groups()
         self.assertEqual(len(groups), 2)
@@ -244,7 +316,7 @@ class TestIntegration(unittest.TestCase):
     """Test integration between components."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp(dir=_TMP_ROOT)
         self.task_manager = TaskManager(self.temp_dir)
         self.nfc_manager = NFCManager(self.temp_dir)
         self.hardware_manager = HardwareManager(self.task_manager)
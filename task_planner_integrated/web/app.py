@@ -1,46 +1,226 @@
 """Flask web server for task management with NFC integration and hardware control."""
 
+import hmac
 import logging
 import os
-from flask import Flask, request, jsonify, render_template, abort
-from datetime import datetime
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from flask import Flask, request, jsonify, render_template, abort, g
+from flask.views import MethodView
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from core.task_manager import TaskManager
+from core.task_manager import TaskManager, STATUS_NAMES
 from core.nfc_manager import NFCManager
+from core.json_compat import HAS_ORJSON
+from core.timestamps import now_iso
+
+# Optional production server: gunicorn with gevent workers (TASK_WSGI_SERVER=gunicorn)
+try:
+    from gunicorn.app.base import BaseApplication
+    HAS_GUNICORN = True
+except ImportError:
+    BaseApplication = object
+    HAS_GUNICORN = False
+try:
+    import gevent  # noqa: F401 - required by gunicorn's gevent worker class
+    HAS_GEVENT = True
+except ImportError:
+    HAS_GEVENT = False
 
 logger = logging.getLogger(__name__)
 
+_BEARER_PREFIX = b"Bearer "
+
+# (JSON payload, HTTP status) returned by the scan handlers
+ScanResult = Tuple[Dict[str, Any], int]
+
+# Status code -> name, looked up inline instead of via TaskManager.get_status_name
+_STATUS_NAME_BY_CODE: Dict[int, str] = dict(enumerate(STATUS_NAMES))
+
+# Key layout of the repeat-scan response, the most frequent payload. Filling
+# a copy is a little cheaper than building the literal.
+_SCAN_INCREMENT_TEMPLATE: Dict[str, Any] = dict.fromkeys(
+    ("status", "tag_id", "task_title", "task_index", "new_status", "status_name"))
+
+# Stats are observational, so polled endpoints may serve them slightly stale
+HEALTH_STATS_TTL = 1.0
+STATS_TTL = 3.0
+
+if HAS_ORJSON:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    
+    # Hardware group listings are keyed by int task id
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    
+    class _OrjsonProvider(DefaultJSONProvider):
+        """Routes jsonify and request.get_json through orjson.
+
+        Types orjson does not know fall back to Flask's default encoder.
+        """
+        
+        def dumps(self, obj, **kwargs):
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+            
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+            
+        def response(self, *args, **kwargs):
+            # Encoded straight to bytes; the default provider builds a str first
+            obj = self._prepare_response_obj(args, kwargs)
+            option = _ORJSON_OPTIONS
+            # Same key order and indentation as Flask's default provider
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if (self.compact is None and self._app.debug) or self.compact is False:
+                option |= orjson.OPT_INDENT_2
+            return self._app.response_class(
+                orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype)
+
+class _GunicornApplication(BaseApplication):
+    """Serves a Flask app through gunicorn, building it in the worker.
+
+    ``app_factory`` runs in the worker process after the fork, so the
+    managers, their writer threads and their data are the worker's own
+    (and a respawned worker reloads them from disk).
+    """
+    
+    def __init__(self, app_factory, options):
+        self.app_factory = app_factory
+        self.options = options
+        super().__init__()
+        
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+            
+    def load(self):
+        return self.app_factory()
+
+def _parse_task_id(identifier: str) -> Optional[int]:
+    """Return the task id for an all-ASCII-digit scan identifier, else None."""
+    # Most tag UIDs fail one of the O(1) checks or stop int() at their first separator
+    if not (identifier.isascii() and identifier[:1].isdigit()):
+        return None
+    try:
+        task_id = int(identifier)
+    except ValueError:
+        return None
+    # int() also takes "1_000" and surrounding whitespace; those stay tag ids
+    return task_id if identifier.isdigit() else None
+
+class NFCScanView(MethodView):
+    """NFC tag scans: POST a JSON body, or GET with the identifier in the URL."""
+    
+    # One instance serves every request; it only holds the server reference
+    init_every_request = False
+    
+    def __init__(self, server):
+        self.server = server
+        
+    def post(self):
+        """Handle NFC tag scan, one scan at a time."""
+        server = self.server
+        if not server._check_nfc_auth():
+            abort(401)
+            
+        data = request.get_json(cache=False)
+        if not data or not data.get("tag_id"):
+            return jsonify({"error": "Missing tag_id"}), 400
+            
+        with server._scan_lock:
+            payload, code = server._dispatch_scan(data["tag_id"], data.get("task_title"),
+                                                  data.get("reader", "api"))
+        return jsonify(payload), code
+        
+    def get(self, identifier):
+        """Handle NFC tag scan via URL path (GET).
+
+        Supports either a tag UID or a numeric task ID in the URL.
+        Example: /api/nfc/scan/04:AA:BB:CC or /api/nfc/scan/3
+        Optional query params: task_title, reader
+        """
+        server = self.server
+        if not server._check_nfc_auth():
+            abort(401)
+
+        # Pull optional params from querystring
+        task_title = request.args.get('task_title')
+        reader = request.args.get('reader', 'api')
+
+        task_id = _parse_task_id(identifier)
+        with server._scan_lock:
+            if task_id is not None:
+                # A numeric identifier is a direct task id
+                payload, code = server._scan_task_id(task_id, identifier, task_title, reader)
+            else:
+                payload, code = server._dispatch_scan(identifier, task_title, reader)
+        return jsonify(payload), code
+
 class TaskPlannerServer:
     """Flask server for comprehensive task management."""
     
     def __init__(self, data_dir: str = "data", hardware_manager=None):
         self.app = Flask(__name__, template_folder='../templates')
+        # Accept "/api/tasks/" as well as "/api/tasks" without a redirect
+        self.app.url_map.strict_slashes = False
+        if HAS_ORJSON:
+            self.app.json = _OrjsonProvider(self.app)
         self.task_manager = TaskManager(data_dir)
         self.nfc_manager = NFCManager(data_dir)
         self.hardware_manager = hardware_manager
+        # The dev server is threaded; scans read-modify-write tasks and mappings
+        self._scan_lock = threading.Lock()
+        # (tag state, task state) -> handler for _dispatch_scan
+        self._scan_handlers: Dict[Tuple[str, str], Callable[..., ScanResult]] = {
+            ("mapped", "exists"): self._scan_increment,
+            ("mapped", "missing_with_title"): self._scan_remap,
+            ("mapped", "missing"): self._scan_mapped_task_missing,
+            ("new", "exists"): self._scan_map_and_increment,
+            ("new", "missing_with_title"): self._scan_create,
+            ("new", "no_title"): self._scan_record_empty,
+        }
+        # name -> (expires_at, value) for _cached_stats
+        self._stats_cache = {}
+        self._stats_lock = threading.Lock()
+        # Distinguishes this process's ETags from those of an earlier run,
+        # whose version counters also started at zero
+        self._etag_prefix = secrets.token_hex(4)
+        # Full LED refreshes run on one background thread; while one is
+        # pending, further requests for it are absorbed
+        self._led_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LEDRefresh")
+        self._led_refresh_pending = False
+        self._led_refresh_lock = threading.Lock()
         
         # Configuration
         self.auth_token = os.getenv("TASK_AUTH_TOKEN", "taskplanner2025")
+        self._auth_token_bytes = self.auth_token.encode()
         # Allow NFC endpoints to be public (no auth) if env var set to 1
         self.nfc_public = os.getenv("TASK_NFC_PUBLIC", "1") in ("1", "true", "True")
         
         # Setup routes
         self._setup_routes()
+        self.app.teardown_request(self._flush_leds)
         
         logger.info("Task Planner Server initialized")
         
     def _check_auth(self) -> bool:
         """Check if request has valid authentication."""
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            token = auth_header[7:]  # Remove "Bearer " prefix
-            return token == self.auth_token
-        return False
+        auth_header = request.headers.get("Authorization", "").encode()
+        if not auth_header.startswith(_BEARER_PREFIX):
+            return False
+        # Constant-time compare so response timing does not leak the token
+        return hmac.compare_digest(auth_header[len(_BEARER_PREFIX):], self._auth_token_bytes)
 
         
     def _check_nfc_auth(self) -> bool:
@@ -49,6 +229,214 @@ class TaskPlannerServer:
             return True
         return self._check_auth()
         
+    def _resolve_tag(self, tag_id: str) -> Tuple[Optional[str], Optional[int]]:
+        """Return ``(mapped_title, task_index)`` for a scanned tag.
+
+        Both lookups are in-memory indexes, so scans never touch the disk
+        here. The title is None for unmapped tags; the index is None when
+        the mapped task no longer exists.
+        """
+        task_obj = self.nfc_manager.get_task_for_tag(tag_id)
+        title = task_obj.get('title') if isinstance(task_obj, dict) else task_obj
+        if not title:
+            return title, None
+        return title, self.task_manager.find_task_by_title(title)
+        
+    def _dispatch_scan(self, tag_id: str, task_title: Optional[str], reader: str) -> ScanResult:
+        """Run one tag scan and return ``(payload, http_status)``.
+
+        The scan is classified once into a (tag state, task state) key and
+        handed to the matching entry in ``_scan_handlers``.
+        """
+        existing_task, task_index = self._resolve_tag(tag_id)
+        if existing_task:
+            key = ("mapped", "exists" if task_index else ("missing_with_title" if task_title else "missing"))
+            title = existing_task if task_index else task_title
+        elif task_title:
+            task_index = self.task_manager.find_task_by_title(task_title)
+            key = ("new", "exists" if task_index else "missing_with_title")
+            title = task_title
+        else:
+            key = ("new", "no_title")
+            title = ""
+        return self._scan_handlers[key](tag_id, title, task_index, reader)
+        
+    def _scan_increment(self, tag_id: str, title: str, task_index: Optional[int], reader: str,
+                        action: str = "task_incremented") -> ScanResult:
+        """Advance a task's status for a scan and report it."""
+        new_status = self.task_manager.update_task_status(task_index)
+        self._queue_led(task_index)
+        self.nfc_manager.log_ping(
+            tag_id=tag_id,
+            action=action,
+            task_title=title,
+            task_index=task_index,
+            new_status=new_status,
+            reader=reader
+        )
+        payload = _SCAN_INCREMENT_TEMPLATE.copy()
+        payload["status"] = action
+        payload["tag_id"] = tag_id
+        payload["task_title"] = title
+        payload["task_index"] = task_index
+        payload["new_status"] = new_status
+        payload["status_name"] = _STATUS_NAME_BY_CODE.get(new_status, "Unknown")
+        return payload, 200
+        
+    def _scan_map_and_increment(self, tag_id: str, title: str, task_index: Optional[int], reader: str) -> ScanResult:
+        """Map an unmapped tag to an existing task, then advance it."""
+        self.nfc_manager.map_tag_to_task(tag_id, title)
+        return self._scan_increment(tag_id, title, task_index, reader, action="task_mapped_and_incremented")
+        
+    def _scan_create(self, tag_id: str, title: str, task_index: Optional[int], reader: str,
+                     action: str = "task_created_and_mapped") -> ScanResult:
+        """Create a task for a scan and map the tag to it."""
+        task_index = self.task_manager.add_task(title)
+        self.nfc_manager.map_tag_to_task(tag_id, title)
+        self._queue_led(task_index)
+        self.nfc_manager.log_ping(
+            tag_id=tag_id,
+            action=action,
+            task_title=title,
+            task_index=task_index,
+            reader=reader
+        )
+        return {
+            "status": action,
+            "tag_id": tag_id,
+            "task_title": title,
+            "task_index": task_index
+        }, 201
+        
+    def _scan_remap(self, tag_id: str, title: str, task_index: Optional[int], reader: str) -> ScanResult:
+        """Recreate a mapped task that no longer exists."""
+        payload, code = self._scan_create(tag_id, title, task_index, reader, action="task_created_remapped")
+        payload["message"] = "Mapped task no longer exists, created new task"
+        return payload, code
+        
+    def _scan_mapped_task_missing(self, tag_id: str, title: str, task_index: Optional[int], reader: str) -> ScanResult:
+        return {
+            "error": "mapped_task_missing",
+            "message": "Tag was mapped to a task that no longer exists. Provide task_title to create new task."
+        }, 400
+        
+    def _scan_record_empty(self, tag_id: str, title: str, task_index: Optional[int], reader: str) -> ScanResult:
+        """Record an unknown tag with an empty mapping for later assignment."""
+        self.nfc_manager.map_tag_to_task(tag_id, "")
+        self.nfc_manager.log_ping(
+            tag_id=tag_id,
+            action="mapping_created_empty",
+            task_title="",
+            reader=reader
+        )
+        return {
+            "status": "mapping_created_empty",
+            "tag_id": tag_id,
+            "message": "Tag recorded with empty mapping. Use mappings API to assign a task later."
+        }, 201
+        
+    def _scan_task_id(self, task_id: int, identifier: str, task_title: Optional[str], reader: str) -> ScanResult:
+        """Scan addressed by numeric task id rather than tag UID."""
+        new_status = self.task_manager.update_task_status(task_id)
+        if new_status is None:
+            # If task not found and task_title provided, create it and map
+            # the numeric identifier (as string) to it
+            if task_title:
+                return self._scan_create(identifier, task_title, None, reader)
+            return {"error": "Task not found"}, 404
+
+        # Update hardware
+        self._queue_led(task_id)
+
+        # Log ping (use identifier as tag_id)
+        self.nfc_manager.log_ping(
+            tag_id=identifier,
+            action="task_incremented",
+            task_index=task_id,
+            new_status=new_status,
+            reader=reader
+        )
+        return {
+            "status": "task_incremented",
+            "task_index": task_id,
+            "new_status": new_status,
+            "status_name": _STATUS_NAME_BY_CODE.get(new_status, "Unknown")
+        }, 200
+        
+    def _queue_led(self, task_id: int) -> None:
+        """Mark a task's LEDs for refresh when the current request ends."""
+        if self.hardware_manager:
+            g.setdefault("led_task_ids", set()).add(task_id)
+            
+    def _flush_leds(self, exc=None) -> None:
+        """Write every LED queued during the request with one GPIO call.
+
+        Statuses are read at flush time under the scan lock, so whichever
+        request flushes last shows the latest status.
+        """
+        task_ids = g.pop("led_task_ids", None)
+        if task_ids:
+            with self._scan_lock:
+                self._show_leds(task_ids)
+                
+    def _show_leds(self, task_ids) -> None:
+        """Show this server's statuses for ``task_ids``; caller holds _scan_lock.
+
+        The hardware manager may hold a different TaskManager (e.g. the
+        console's), so statuses are taken from ours, not re-read there.
+        """
+        tasks = self.task_manager.tasks
+        self.hardware_manager.show_task_statuses({
+            task_id: tasks[task_id - 1].get('status', 0) if 1 <= task_id <= len(tasks) else 0
+            for task_id in task_ids})
+                
+    def _conditional_json(self, etag: str, build: Callable[[], Dict[str, Any]]):
+        """Answer 304 if the client holds ``etag``, else jsonify ``build()`` tagged with it.
+
+        Callers derive the tag from a manager version counter read before
+        building, so a change made mid-build only causes an extra refetch.
+        """
+        etag = f"{self._etag_prefix}-{etag}"
+        if request.if_none_match.contains_weak(etag):
+            response = self.app.response_class(status=304)
+        else:
+            response = jsonify(build())
+        response.set_etag(etag, weak=True)
+        return response
+        
+    def _refresh_all_leds_later(self) -> None:
+        """Schedule a refresh of every LED on the LED thread unless one is already pending."""
+        with self._led_refresh_lock:
+            if self._led_refresh_pending:
+                return
+            self._led_refresh_pending = True
+        self._led_executor.submit(self._refresh_all_leds)
+        
+    def _refresh_all_leds(self) -> None:
+        with self._led_refresh_lock:
+            # Cleared before reading statuses, so a change from here on schedules another pass
+            self._led_refresh_pending = False
+        try:
+            with self._scan_lock:
+                self._show_leds(self.hardware_manager.groups)
+        except Exception as e:
+            logger.error(f"Background LED refresh failed: {e}")
+            
+    def _cached_stats(self, name: str, ttl: float, compute):
+        """Return ``compute()``, reusing the last result for ``ttl`` seconds.
+
+        Concurrent callers on a miss wait for one computation instead of
+        each walking the task list.
+        """
+        with self._stats_lock:
+            entry = self._stats_cache.get(name)
+            now = time.monotonic()
+            if entry is not None and now < entry[0]:
+                return entry[1]
+            value = compute()
+            self._stats_cache[name] = (now + ttl, value)
+            return value
+            
     def _setup_routes(self):
         """Setup Flask routes."""
         
@@ -60,12 +448,12 @@ class TaskPlannerServer:
         @self.app.route("/api/health", methods=["GET"])
         def health():
             """Health check endpoint."""
-            stats = self.task_manager.get_task_stats()
-            nfc_stats = self.nfc_manager.get_mapping_stats()
+            stats, nfc_stats = self._cached_stats("health", HEALTH_STATS_TTL, lambda: (
+                self.task_manager.get_task_stats(), self.nfc_manager.get_mapping_stats()))
             
             return jsonify({
                 "status": "healthy",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "task_stats": stats,
                 "nfc_stats": nfc_stats,
                 "hardware_enabled": self.hardware_manager is not None
@@ -81,22 +469,26 @@ class TaskPlannerServer:
             status = request.args.get('status', type=int)
             include_subtasks = request.args.get('include_subtasks', 'true').lower() == 'true'
             
-            tasks = self.task_manager.get_all_tasks()
-            
-            # Filter by status if specified
-            if status is not None:
-                tasks = [t for t in tasks if t.get('status') == status]
-                
-            # Remove subtasks if not requested
-            if not include_subtasks:
-                for task in tasks:
-                    task.pop('subtasks', None)
+            def build():
+                # Filter by status if specified
+                if status is not None:
+                    tasks = self.task_manager.get_tasks_by_status(status)
+                else:
+                    tasks = self.task_manager.get_all_tasks()
                     
-            return jsonify({
-                "tasks": tasks,
-                "total_count": self.task_manager.get_task_count(),
-                "filtered_count": len(tasks)
-            })
+                # Remove subtasks if not requested, on copies: the dicts
+                # belong to the task manager
+                if not include_subtasks:
+                    tasks = [{k: v for k, v in task.items() if k != 'subtasks'} for task in tasks]
+                        
+                return {
+                    "tasks": tasks,
+                    "total_count": self.task_manager.get_task_count(),
+                    "filtered_count": len(tasks)
+                }
+                
+            etag = f"t{self.task_manager.version}-{status}-{int(include_subtasks)}"
+            return self._conditional_json(etag, build)
             
         @self.app.route("/api/tasks", methods=["POST"])
         def create_task():
@@ -104,7 +496,7 @@ class TaskPlannerServer:
             if not self._check_auth():
                 abort(401)
                 
-            data = request.get_json()
+            data = request.get_json(cache=False)
             if not data or not data.get("title"):
                 return jsonify({"error": "Missing task title"}), 400
                 
@@ -116,8 +508,7 @@ class TaskPlannerServer:
             )
             
             # Update hardware if available
-            if self.hardware_manager:
-                self.hardware_manager.update_task_led(task_index)
+            self._queue_led(task_index)
             
             return jsonify({
                 "status": "created",
@@ -151,6 +542,26 @@ class TaskPlannerServer:
             else:
                 return jsonify({"error": "Task not found"}), 404
                 
+        @self.app.route("/api/tasks/bulk_delete", methods=["POST"])
+        def bulk_delete_tasks():
+            """Delete several tasks in one request: JSON {"ids": [<task_id>, ...]}.
+
+            Ids are positions before the delete; unknown ids are skipped.
+            """
+            if not self._check_auth():
+                abort(401)
+                
+            data = request.get_json(silent=True, cache=False) or {}
+            ids = data.get("ids")
+            if not isinstance(ids, list):
+                return jsonify({"error": "Missing ids list"}), 400
+                
+            removed = self.task_manager.remove_tasks(ids)
+            if self.hardware_manager:
+                for task_id in removed:
+                    self.hardware_manager.remove_group(task_id)
+            return jsonify({"status": "deleted", "task_ids": removed, "count": len(removed)})
+                
         @self.app.route("/api/tasks/<int:task_id>/status", methods=["PUT"])
         def update_task_status(task_id):
             """Update task status.
@@ -162,26 +573,26 @@ class TaskPlannerServer:
                 abort(401)
 
             # Allow empty body without causing a 400 from get_json
-            data = request.get_json(silent=True) or {}
+            data = request.get_json(silent=True, cache=False) or {}
             # Only treat explicit status if key present; else cycle
             status = data.get("status") if "status" in data else None
 
+            task = self.task_manager.get_task(task_id)
+            old_status = task.get("status") if task else None
             new_status = self.task_manager.update_task_status(task_id, status)
             if new_status is None:
                 return jsonify({"error": "Task not found"}), 404
 
-            # Update hardware if available
-            if self.hardware_manager:
-                try:
-                    self.hardware_manager.update_task_led(task_id, new_status)
-                except Exception as e:
-                    logger.warning(f"Hardware LED update failed for task {task_id}: {e}")
+            # Re-setting the current status: nothing to show on the LEDs
+            changed = new_status != old_status
+            if changed:
+                self._queue_led(task_id)
 
             return jsonify({
-                "status": "updated",
+                "status": "updated" if changed else "unchanged",
                 "task_id": task_id,
                 "new_status": new_status,
-                "status_name": self.task_manager.get_status_name(new_status)
+                "status_name": _STATUS_NAME_BY_CODE.get(new_status, "Unknown")
             })
                 
         @self.app.route("/api/tasks/sort", methods=["POST"])
@@ -190,14 +601,14 @@ class TaskPlannerServer:
             if not self._check_auth():
                 abort(401)
                 
-            data = request.get_json()
+            data = request.get_json(cache=False)
             sort_by = data.get("sort_by", "priority") if data else "priority"
             
             try:
                 self.task_manager.sort_tasks(sort_by)
-                # Update all hardware after sorting
+                # Update all hardware after sorting, without holding up the response
                 if self.hardware_manager:
-                    self.hardware_manager.update_all_leds()
+                    self._refresh_all_leds_later()
                 return jsonify({"status": "sorted", "sort_by": sort_by})
             except ValueError as e:
                 return jsonify({"error": str(e)}), 400
@@ -208,7 +619,7 @@ class TaskPlannerServer:
             if not self._check_auth():
                 abort(401)
                 
-            stats = self.task_manager.get_task_stats()
+            stats = self._cached_stats("tasks", STATS_TTL, self.task_manager.get_task_stats)
             return jsonify({"stats": stats})
             
         # NFC endpoints
@@ -218,335 +629,15 @@ class TaskPlannerServer:
             if not self._check_nfc_auth():
                 abort(401)
                 
-            mappings = self.nfc_manager.get_all_mappings()
-            return jsonify({"mappings": mappings})
-            
-        @self.app.route("/api/nfc/scan", methods=["POST"])
-        def nfc_scan():
-            """Handle NFC tag scan."""
-            if not self._check_nfc_auth():
-                abort(401)
-                
-            data = request.get_json()
-            if not data or not data.get("tag_id"):
-                return jsonify({"error": "Missing tag_id"}), 400
-                
-            tag_id = data["tag_id"]
-            task_title = data.get("task_title")
-            reader = data.get("reader", "api")
-            
-            # Check if tag is already mapped
-            existing_task_obj = self.nfc_manager.get_task_for_tag(tag_id)
-            existing_task = existing_task_obj.get('title') if isinstance(existing_task_obj, dict) else existing_task_obj
+            return self._conditional_json(
+                f"m{self.nfc_manager.mappings_version}",
+                lambda: {"mappings": dict(self.nfc_manager.get_all_mappings_readonly())})
             
-            if existing_task:
-                # Tag is mapped, find and increment the task
-                task_index = self.task_manager.find_task_by_title(existing_task)
-                
-                if task_index:
-                    # Task exists, increment it
-                    new_status = self.task_manager.update_task_status(task_index)
-                    
-                    # Update hardware
-                    if self.hardware_manager:
-                        self.hardware_manager.update_task_led(task_index, new_status)
-                    
-                    # Log the ping
-                    self.nfc_manager.log_ping(
-                        tag_id=tag_id,
-                        action="task_incremented",
-                        task_title=existing_task,
-                        task_index=task_index,
-                        new_status=new_status,
-                        reader=reader
-                    )
-                    
-                    return jsonify({
-                        "status": "task_incremented",
-                        "tag_id": tag_id,
-                        "task_title": existing_task,
-                        "task_index": task_index,
-                        "new_status": new_status,
-                        "status_name": self.task_manager.get_status_name(new_status)
-                    })
-                else:
-                    # Mapped task no longer exists
-                    if task_title:
-                        # Create new task with provided title
-                        task_index = self.task_manager.add_task(task_title)
-                        self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                        
-                        # Update hardware
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index)
-                        
-                        self.nfc_manager.log_ping(
-                            tag_id=tag_id,
-                            action="task_created_remapped",
-                            task_title=task_title,
-                            task_index=task_index,
-                            reader=reader
-                        )
-                        
-                        return jsonify({
-                            "status": "task_created_remapped",
-                            "tag_id": tag_id,
-                            "task_title": task_title,
-                            "task_index": task_index,
-                            "message": "Mapped task no longer exists, created new task"
-                        }), 201
-                    else:
-                        return jsonify({
-                            "error": "mapped_task_missing",
-                            "message": "Tag was mapped to a task that no longer exists. Provide task_title to create new task."
-                        }), 400
-            else:
-                # Tag not mapped yet
-                if task_title:
-                    # Check if task already exists
-                    task_index = self.task_manager.find_task_by_title(task_title)
-                    
-                    if task_index:
-                        # Task exists, map tag to it and increment
-                        self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                        new_status = self.task_manager.update_task_status(task_index)
-                        
-                        # Update hardware
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index, new_status)
-                        
-                        self.nfc_manager.log_ping(
-                            tag_id=tag_id,
-                            action="task_mapped_and_incremented",
-                            task_title=task_title,
-                            task_index=task_index,
-                            new_status=new_status,
-                            reader=reader
-                        )
-                        
-                        return jsonify({
-                            "status": "task_mapped_and_incremented",
-                            "tag_id": tag_id,
-                            "task_title": task_title,
-                            "task_index": task_index,
-                            "new_status": new_status,
-                            "status_name": self.task_manager.get_status_name(new_status)
-                        })
-                    else:
-                        # Task doesn't exist, create it and map tag
-                        task_index = self.task_manager.add_task(task_title)
-                        self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                        
-                        # Update hardware
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index)
-                        
-                        self.nfc_manager.log_ping(
-                            tag_id=tag_id,
-                            action="task_created_and_mapped",
-                            task_title=task_title,
-                            task_index=task_index,
-                            reader=reader
-                        )
-                        
-                        return jsonify({
-                            "status": "task_created_and_mapped",
-                            "tag_id": tag_id,
-                            "task_title": task_title,
-                            "task_index": task_index
-                        }), 201
-                else:
-                    # Create an empty mapping so the tag is recorded for later mapping
-                    self.nfc_manager.map_tag_to_task(tag_id, "")
-                    self.nfc_manager.log_ping(
-                        tag_id=tag_id,
-                        action="mapping_created_empty",
-                        task_title="",
-                        reader=reader
-                    )
-                    return jsonify({
-                        "status": "mapping_created_empty",
-                        "tag_id": tag_id,
-                        "message": "Tag recorded with empty mapping. Use mappings API to assign a task later."
-                    }), 201
-
-        @self.app.route("/api/nfc/scan/<path:identifier>", methods=["GET"])
-        def nfc_scan_get(identifier):
-            """Handle NFC tag scan via URL path (GET).
-
-            Supports either a tag UID or a numeric task ID in the URL.
-            Example: /api/nfc/scan/04:AA:BB:CC or /api/nfc/scan/3
-            Optional query params: task_title, reader
-            """
-            if not self._check_nfc_auth():
-                abort(401)
-
-            # Pull optional params from querystring
-            task_title = request.args.get('task_title')
-            reader = request.args.get('reader', 'api')
-
-            # If identifier is numeric, treat it as a direct task id
-            if identifier.isdigit():
-                task_id = int(identifier)
-                # Try to update the task status
-                new_status = self.task_manager.update_task_status(task_id)
-                if new_status is None:
-                    # If task not found and task_title provided, create it
-                    if task_title:
-                        task_index = self.task_manager.add_task(task_title)
-                        # Map the numeric identifier (as string) to the created task
-                        self.nfc_manager.map_tag_to_task(identifier, task_title)
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index)
-                        self.nfc_manager.log_ping(
-                            tag_id=identifier,
-                            action="task_created_and_mapped",
-                            task_title=task_title,
-                            task_index=task_index,
-                            reader=reader
-                        )
-                        return jsonify({
-                            "status": "task_created_and_mapped",
-                            "tag_id": identifier,
-                            "task_title": task_title,
-                            "task_index": task_index
-                        }), 201
-                    return jsonify({"error": "Task not found"}), 404
-
-                # Update hardware
-                if self.hardware_manager:
-                    try:
-                        self.hardware_manager.update_task_led(task_id, new_status)
-                    except Exception as e:
-                        logger.warning(f"Hardware LED update failed for task {task_id}: {e}")
-
-                # Log ping (use identifier as tag_id)
-                self.nfc_manager.log_ping(
-                    tag_id=identifier,
-                    action="task_incremented",
-                    task_index=task_id,
-                    new_status=new_status,
-                    reader=reader
-                )
-
-                return jsonify({
-                    "status": "task_incremented",
-                    "task_index": task_id,
-                    "new_status": new_status,
-                    "status_name": self.task_manager.get_status_name(new_status)
-                })
-
-            # Otherwise treat identifier as a tag UID
-            tag_id = identifier
-            existing_task_obj = self.nfc_manager.get_task_for_tag(tag_id)
-            existing_task = existing_task_obj.get('title') if isinstance(existing_task_obj, dict) else existing_task_obj
-
-            if existing_task:
-                task_index = self.task_manager.find_task_by_title(existing_task)
-                if task_index:
-                    new_status = self.task_manager.update_task_status(task_index)
-                    if self.hardware_manager:
-                        self.hardware_manager.update_task_led(task_index, new_status)
-                    self.nfc_manager.log_ping(
-                        tag_id=tag_id,
-                        action="task_incremented",
-                        task_title=existing_task,
-                        task_index=task_index,
-                        new_status=new_status,
-                        reader=reader
-                    )
-                    return jsonify({
-                        "status": "task_incremented",
-                        "tag_id": tag_id,
-                        "task_title": existing_task,
-                        "task_index": task_index,
-                        "new_status": new_status,
-                        "status_name": self.task_manager.get_status_name(new_status)
-                    })
-                else:
-                    # Mapped task missing - try to create if title provided
-                    if task_title:
-                        task_index = self.task_manager.add_task(task_title)
-                        self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index)
-                        self.nfc_manager.log_ping(
-                            tag_id=tag_id,
-                            action="task_created_remapped",
-                            task_title=task_title,
-                            task_index=task_index,
-                            reader=reader
-                        )
-                        return jsonify({
-                            "status": "task_created_remapped",
-                            "tag_id": tag_id,
-                            "task_title": task_title,
-                            "task_index": task_index
-                        }), 201
-                    return jsonify({
-                        "error": "mapped_task_missing",
-                        "message": "Tag is mapped but the task no longer exists. Provide task_title to recreate."
-                    }), 400
-            else:
-                # Tag not mapped
-                if task_title:
-                    # Check if task exists by title
-                    task_index = self.task_manager.find_task_by_title(task_title)
-                    if task_index:
-                        # Map and increment
-                        self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                        new_status = self.task_manager.update_task_status(task_index)
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index, new_status)
-                        self.nfc_manager.log_ping(
-                            tag_id=tag_id,
-                            action="task_mapped_and_incremented",
-                            task_title=task_title,
-                            task_index=task_index,
-                            new_status=new_status,
-                            reader=reader
-                        )
-                        return jsonify({
-                            "status": "task_mapped_and_incremented",
-                            "tag_id": tag_id,
-                            "task_title": task_title,
-                            "task_index": task_index,
-                            "new_status": new_status,
-                            "status_name": self.task_manager.get_status_name(new_status)
-                        })
-                    else:
-                        # Create and map
-                        task_index = self.task_manager.add_task(task_title)
-                        self.nfc_manager.map_tag_to_task(tag_id, task_title)
-                        if self.hardware_manager:
-                            self.hardware_manager.update_task_led(task_index)
-                        self.nfc_manager.log_ping(
-                            tag_id=tag_id,
-                            action="task_created_and_mapped",
-                            task_title=task_title,
-                            task_index=task_index,
-                            reader=reader
-                        )
-                        return jsonify({
-                            "status": "task_created_and_mapped",
-                            "tag_id": tag_id,
-                            "task_title": task_title,
-                            "task_index": task_index
-                        }), 201
-                else:
-                    # Create an empty mapping for later assignment
-                    self.nfc_manager.map_tag_to_task(tag_id, "")
-                    self.nfc_manager.log_ping(
-                        tag_id=tag_id,
-                        action="mapping_created_empty",
-                        task_title="",
-                        reader=reader
-                    )
-                    return jsonify({
-                        "status": "mapping_created_empty",
-                        "tag_id": tag_id,
-                        "message": "Tag recorded with empty mapping. Use mappings API to assign a task later."
-                    }), 201
+        # Scans are the hot path: one class-based view, instantiated once
+        scan_view = NFCScanView.as_view("nfc_scan", self)
+        self.app.add_url_rule("/api/nfc/scan", view_func=scan_view, methods=["POST"])
+        self.app.add_url_rule("/api/nfc/scan/<path:identifier>", endpoint="nfc_scan_get",
+                              view_func=scan_view, methods=["GET"])
 
         @self.app.route("/api/nfc/scan/debug/<path:identifier>", methods=["GET"])
         def nfc_scan_debug(identifier):
@@ -561,7 +652,7 @@ class TaskPlannerServer:
             if not self._check_nfc_auth():
                 abort(401)
                 
-            data = request.get_json()
+            data = request.get_json(cache=False)
             if not data or not data.get("tag_id") or not data.get("task_title"):
                 return jsonify({"error": "Missing tag_id or task_title"}), 400
                 
@@ -594,6 +685,23 @@ class TaskPlannerServer:
             else:
                 return jsonify({"error": "Mapping not found"}), 404
                 
+        @self.app.route("/api/nfc/mappings/bulk_delete", methods=["POST"])
+        def bulk_delete_nfc_mappings():
+            """Delete several NFC mappings in one request: JSON {"tag_ids": [...]}."""
+            if not self._check_nfc_auth():
+                abort(401)
+                
+            data = request.get_json(silent=True, cache=False) or {}
+            tag_ids = data.get("tag_ids")
+            if not isinstance(tag_ids, list):
+                return jsonify({"error": "Missing tag_ids list"}), 400
+                
+            # One mappings-file write for the whole batch
+            with self.nfc_manager.batched():
+                removed = [tag_id for tag_id in tag_ids
+                           if isinstance(tag_id, str) and self.nfc_manager.remove_mapping(tag_id)]
+            return jsonify({"status": "mappings_deleted", "tag_ids": removed, "count": len(removed)})
+                
         @self.app.route("/api/nfc/pings", methods=["GET"])
         def get_nfc_pings():
             """Get recent NFC ping history."""
@@ -601,8 +709,19 @@ class TaskPlannerServer:
                 abort(401)
                 
             limit = request.args.get('limit', 50, type=int)
-            pings = self.nfc_manager.get_recent_pings(limit)
-            return jsonify({"pings": pings, "count": len(pings)})
+            # Pollers pass the last_id of their previous response to get only newer pings
+            since_id = request.args.get('since_id', type=int)
+            
+            def build():
+                if since_id is None:
+                    # Read first: a ping arriving mid-fetch is sent twice, never skipped
+                    last_id = self.nfc_manager.last_ping_id
+                    pings = self.nfc_manager.get_recent_pings(limit)
+                else:
+                    pings, last_id = self.nfc_manager.get_pings_since(since_id, limit)
+                return {"pings": pings, "count": len(pings), "last_id": last_id}
+                
+            return self._conditional_json(f"p{self.nfc_manager.pings_version}-{limit}-{since_id}", build)
             
         @self.app.route("/api/nfc/stats", methods=["GET"])
         def get_nfc_stats():
@@ -610,7 +729,7 @@ class TaskPlannerServer:
             if not self._check_nfc_auth():
                 abort(401)
                 
-            stats = self.nfc_manager.get_mapping_stats()
+            stats = self._cached_stats("nfc", STATS_TTL, self.nfc_manager.get_mapping_stats)
             return jsonify({"stats": stats})
             
         # Hardware endpoints (if hardware manager is available)
@@ -630,13 +749,30 @@ class TaskPlannerServer:
                 if not self._check_auth():
                     abort(401)
                     
-                self.hardware_manager.update_all_leds()
+                with self._scan_lock:
+                    self._show_leds(self.hardware_manager.groups)
                 return jsonify({"status": "synced"})
                 
     def run(self, host="0.0.0.0", port=5002, debug=False):
-        """Run the Flask server."""
+        """Run the server."""
         logger.info(f"Starting Task Planner Server on {host}:{port}")
-        self.app.run(host=host, port=port, debug=debug)
+        self.app.run(host=host, port=port, debug=debug, threaded=True)
+
+def run_gunicorn(data_dir: str = "data", host="0.0.0.0", port=5002) -> None:
+    """Serve the app through gunicorn with a gevent worker (standalone use only).
+
+    A single worker: tasks and mappings live in one process, so concurrency
+    comes from gevent rather than forks. The worker builds its
+    own server after the fork, since threads do not survive one; no hardware
+    manager is attached. gunicorn exits the process when it stops.
+    """
+    logger.info(f"Starting Task Planner Server on {host}:{port} (gunicorn/gevent)")
+    _GunicornApplication(lambda: TaskPlannerServer(data_dir).app, {
+        'bind': f"{host}:{port}",
+        'worker_class': 'gevent',
+        'workers': 1,
+        'worker_connections': 1000,
+    }).run()
 
 if __name__ == "__main__":
     # Setup logging
@@ -645,6 +781,15 @@ if __name__ == "__main__":
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Create and run server
-    server = TaskPlannerServer()
-    server.run(debug=True)
\ No newline at end of file
+    # TASK_WSGI_SERVER=gunicorn serves through gunicorn/gevent when installed
+    use_gunicorn = os.getenv("TASK_WSGI_SERVER") == "gunicorn"
+    if use_gunicorn and not (HAS_GUNICORN and HAS_GEVENT):
+        logger.warning("gunicorn/gevent not installed; using the Flask server")
+        use_gunicorn = False
+    
+    if use_gunicorn:
+        run_gunicorn()
+    else:
+        # Create and run server
+        server = TaskPlannerServer()
+        server.run(debug=True)
\ No newline at end of file